@@ -1,42 +1,106 @@
-from graph_utils import Graph
-from collections import deque, defaultdict
+from graph_utils import Graph, bfs_levels, multi_source_levels, load_options, load_graph, read_ids
 import sys
 
-def bfs(graph: Graph, start):
-    """Perform BFS and return vertices organized by levels"""
-    visited = set()
-    queue = deque([(start, 0)]) # (vertex, level)
-    levels = defaultdict(list) # level -> [vertices]
+def bfs(graph: Graph, start, max_depth=None, targets=None):
+    """
+    Perform BFS and return vertices organized by levels.
+    Runs the level-synchronous engine of graph_core.bfs over dense vertex
+    indices (top-down and bottom-up steps, flat visited array); each level
+    comes out in ascending vertex order and is translated back to vertex
+    ids only in the returned dict. See bfs_iter() for max_depth and targets.
+    """
+    return dict(bfs_iter(graph, start, max_depth, targets))
 
-    visited.add(start)
+def bfs_iter(graph: Graph, start, max_depth=None, targets=None):
+    """
+    Generator mode of bfs(): yields (level, vertices) as soon as each level
+    is complete, so the caller can stop early. Stops after level max_depth
+    (everything within k hops), or once every vertex of targets is reached.
+    """
+    ids = graph.ids
+    dense_targets = ids.to_indices(targets) if targets is not None else None
+    for level, vertices in bfs_levels(graph.csr, ids.index(start), graph.reverse_csr,
+                                      max_depth=max_depth, targets=dense_targets):
+        yield level, ids.to_ids(vertices)
 
-    while queue:
-        vertex, level = queue.popleft()
-        levels[level].append(vertex)
+def multi_bfs(graph: Graph, starts, batch=64, max_depth=None, targets=None):
+    """
+    Perform BFS from every vertex in starts, sharing each traversal among
+    batch sources (bit-parallel MS-BFS). Yields (start, levels) in the order
+    of starts, a batch at a time, with levels as returned by bfs(). Each
+    start stops where bfs_iter() would for max_depth and targets.
+    """
+    ids = graph.ids
+    dense_targets = ids.to_indices(targets) if targets is not None else None
+    for s, levels in multi_source_levels(graph.csr, ids.to_indices(starts), batch, max_depth, dense_targets):
+        yield ids.id(s), {level: ids.to_ids(vertices) for level, vertices in enumerate(levels)}
 
-        # Add neighbours to queue
-        neighbors_tuples = sorted(graph.adjacency_list.get(vertex, []))
-        #print(f'Debbug: {neighbors_tuples}')
-        for neighbor_vertex, _ in neighbors_tuples:
-            if neighbor_vertex not in visited:
-                visited.add(neighbor_vertex)
-                queue.append([neighbor_vertex, level+1])
-    
-    #print(levels)
+def print_levels(levels):
+    """Prints each (level, vertices) pair as soon as it arrives"""
+    for level, vertices in levels:
+        vertices_str = ','.join(map(str, sorted(vertices)))
+        print(f"{level}: {vertices_str}", flush=True)
 
-    return levels
+def bfs_options(argv):
+    """
+    Removes the search options from argv (in place) and returns them as
+    keyword arguments for bfs_iter():
+        --max-depth K   only the vertices within K hops
+        --targets T,U   stop once every listed vertex is reached
+    """
+    options = {}
+    i = 1
+    while i < len(argv):
+        if argv[i] in ('--max-depth', '--targets'):
+            if i + 1 >= len(argv):
+                print(f"Erro: {argv[i]} espera um valor")
+                sys.exit(2)
+            name, value = argv[i], argv[i + 1]
+            del argv[i:i + 2]
+            try:
+                if name == '--max-depth':
+                    options['max_depth'] = int(value)
+                else:
+                    options['targets'] = [int(v) for v in value.split(',') if v]
+            except ValueError:
+                print(f"Erro: {name} espera inteiros, recebeu {value!r}")
+                sys.exit(2)
+        else:
+            i += 1
+    return options
 
 def main():
+    opcoes = load_options(sys.argv)
+    busca = bfs_options(sys.argv)
     file_path = sys.argv[1]
+
+    if sys.argv[2] == '--sources':
+        # Several start vertices: one BFS each, run 64 at a time by multi_bfs
+        starts = read_ids(sys.argv[3])
+        g = Graph()
+        load_graph(g, file_path, labels=False, **opcoes)
+        for vertex in starts + busca.get('targets', []):
+            if vertex not in g.ids:
+                print(f"Erro: O vértice {vertex} não existe no grafo.")
+                return
+        for k, (start_vertex, levels) in enumerate(multi_bfs(g, starts, **busca)):
+            if k:
+                print()
+            print(f"Origem {start_vertex}:")
+            print_levels(sorted(levels.items()))
+        return
+
     start_vertex = int(sys.argv[2])
 
     g = Graph()
-    g.ler(file_path)
+    load_graph(g, file_path, labels=False, **opcoes)
+
+    for vertex in [start_vertex] + busca.get('targets', []):
+        if vertex not in g.ids:
+            print(f"Erro: O vértice {vertex} não existe no grafo.")
+            return
 
-    levels = bfs(graph=g, start=start_vertex)  
-    for level in sorted(levels.keys()):
-        vertices_str = ','.join(map(str, sorted(levels[level])))
-        print(f"{level}: {vertices_str}")
+    print_levels(bfs_iter(g, start_vertex, **busca))
 
 if __name__ == "__main__":
     main()
@@ -44,3 +108,7 @@ if __name__ == "__main__":
     # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/ContemCicloEuleriano.net 1
     # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/ContemCicloEuleriano2.net 1
     # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/SemCicloEuleriano.net 1
+    # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/fln_pequena.net --sources EX1/origens.txt
+    # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/fln_pequena.net --sources EX1/origens.txt --max-depth 1
+    # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/fln_pequena.net 1 --max-depth 2
+    # COMANDO PARA TESTAR: python EX1/A1_2.py EX1/fln_pequena.net 1 --targets 6,8
@@ -1,126 +1,88 @@
 import sys
-from collections import defaultdict
-from graph_utils import Graph
+from graph_utils import Graph, DirectedGraph, euler_tour, eulerian_start, load_options, load_graph
 
-def buscar_subciclo(graph, start_v, edge_counter):
+# Vértices escritos por chamada de write() ao transmitir o ciclo
+TAMANHO_BLOCO = 4096
+
+def hierholzer(graph, caminho=False):
     """
-    Busca um subciclo e anexa outros encontrados.
+    O algoritmo de Hierholzer, iterativo e em O(m).
+    Retorna um iterador sobre os vértices do ciclo euleriano (ou, com
+    caminho=True, de um caminho euleriano, que pode ser um ciclo), que
+    são gerados à medida que ficam prontos, ou None se não houver.
     """
-    ciclo = [start_v]
-    t = start_v
-
-    # Encontra o primeiro subciclo
-    current_v = start_v
-    while True:
-        next_v = -1
-        for neighbor in graph.vizinhos(current_v):
-            # Normaliza a aresta (u,v) para u <= v para consistência no contador
-            u, v = sorted((current_v, neighbor))
-            if edge_counter[(u, v)] > 0:
-                next_v = neighbor
-                break
-        
-        if next_v == -1:
-            return False, None  # Não há arestas não visitadas, falha
+    inicio = eulerian_start(graph.csr, graph.reverse_csr, graph.directed, caminho)
+    if inicio is None:
+        return None
 
-        # Seleciona e visita a aresta
-        u, v = sorted((current_v, next_v))
-        edge_counter[(u, v)] -= 1
-        
-        # Adiciona o vértice ao ciclo e avança
-        current_v = next_v
-        ciclo.append(current_v)
+    start_v, fechado = inicio
+    if start_v < 0:  # Grafo sem arestas
+        return iter([])
 
-        # Condição de parada do laço
-        if current_v == t:
-            break
+    tour = euler_tour(graph.csr, start_v, graph.directed, fechado)
+    return map(graph.ids.id, tour)
 
-    # Procura por vértices no ciclo com arestas não visitadas
-    # e anexa os novos subciclos encontrados
-    i = 0
-    while i < len(ciclo):
-        x = ciclo[i]
-        
-        # Verifica se o vértice x tem arestas adjacentes não visitadas
-        has_unvisited_edges = False
-        for neighbor in graph.vizinhos(x):
-            u, v = sorted((x, neighbor))
-            if edge_counter[(u, v)] > 0:
-                has_unvisited_edges = True
-                break
-        
-        if has_unvisited_edges:
-            # Chamada recursiva para encontrar o subciclo
-            success, sub_ciclo = buscar_subciclo(graph, x, edge_counter)
-            
-            if not success:
-                return False, None
-            
-            # Anexa o sub_ciclo no ciclo principal
-            ciclo = ciclo[:i] + sub_ciclo + ciclo[i+1:]
-        i += 1
-            
-    return True, ciclo
+def escrever_ciclo(ciclo, saida):
+    """Escreve os vértices separados por vírgula, em blocos, sem montar a lista inteira"""
+    bloco = []
+    primeiro = True
+    for v in ciclo:
+        bloco.append(v)
+        if len(bloco) == TAMANHO_BLOCO:
+            saida.write(("" if primeiro else ",") + ",".join(map(str, bloco)))
+            primeiro = False
+            bloco = []
+    saida.write(("" if primeiro or not bloco else ",") + ",".join(map(str, bloco)) + "\n")
 
-def hierholzer(graph):
+def opcoes_euler(argv):
     """
-    O algoritmo principal de Hierholzer.
+    Remove de argv (no lugar) as opções do ciclo euleriano:
+        --path          aceita também um caminho euleriano (dois vértices ímpares)
+        --directed      lê a seção *arcs e busca um circuito dirigido
+        --output ARQ    escreve o ciclo em ARQ em vez da saída padrão
     """
-    for v in graph.get_all_vertices():
-        if graph.grau(v) % 2 != 0:
-            return None
-
-    if graph.qtdArestas() == 0:
-        return []
-
-    # Cria e preenche o contador de arestas C
-    edge_counter = defaultdict(int)
-    for u in graph.get_all_vertices():
-        for v in graph.vizinhos(u):
-            # Adiciona a aresta apenas uma vez para o par (u,v) com u <= v
-            if u < v:
-                edge_counter[(u, v)] += 1
-    
-    # Seleciona um vértice inicial com grau > 0
-    start_v = -1
-    for v in graph.get_all_vertices():
-        if graph.grau(v) > 0:
-            start_v = v
-            break
-            
-    if start_v == -1: # Grafo sem arestas
-        return [graph.get_all_vertices()[0]] if graph.qtdVertices() > 0 else []
-
-    # Buscar o ciclo
-    success, ciclo = buscar_subciclo(graph, start_v, edge_counter)
-    
-    if not success:
-        return None
-
-    # Verifica se todas as arestas foram usadas
-    for count in edge_counter.values():
-        if count > 0:
-            # Se sobrou alguma aresta, o grafo não era conectado
-            return None
-    
-    return ciclo
+    opcoes = {'caminho': False, 'dirigido': False, 'saida': None}
+    i = 1
+    while i < len(argv):
+        if argv[i] == '--path':
+            opcoes['caminho'] = True
+            del argv[i]
+        elif argv[i] == '--directed':
+            opcoes['dirigido'] = True
+            del argv[i]
+        elif argv[i] == '--output' and i + 1 < len(argv):
+            opcoes['saida'] = argv[i + 1]
+            del argv[i:i + 2]
+        else:
+            i += 1
+    return opcoes
 
 def main():
+    opcoes = load_options(sys.argv)
+    euler = opcoes_euler(sys.argv)
     file_path = sys.argv[1]
-    
-    g = Graph()
-    g.ler(file_path)
 
-    cycle = hierholzer(g)
+    g = DirectedGraph() if euler['dirigido'] else Graph()
+    load_graph(g, file_path, labels=False, **opcoes)
 
-    if cycle is not None:
-        print("1")
-        print(",".join(map(str, cycle)))
-    else:
+    cycle = hierholzer(g, euler['caminho'])
+
+    if cycle is None:
         print("0")
+        return
+
+    print("1")
+    if euler['saida'] is None:
+        escrever_ciclo(cycle, sys.stdout)
+    else:
+        with open(euler['saida'], 'w') as saida:
+            escrever_ciclo(cycle, saida)
 
 if __name__ == "__main__":
     main()
     # COMANDO PARA TESTAR: python EX1/A1_3.py EX1/ContemCicloEuleriano.net (TEM CICLO)
     # COMANDO PARA TESTAR: python EX1/A1_3.py EX1/ContemCicloEuleriano2.net (TEM CICLO)
-    # COMANDO PARA TESTAR: python EX1/A1_3.py EX1/SemCicloEuleriano.net (SEM CICLO)
\ No newline at end of file
+    # COMANDO PARA TESTAR: python EX1/A1_3.py EX1/SemCicloEuleriano.net (SEM CICLO)
+    # COMANDO PARA TESTAR: python EX1/A1_3.py EX1/SemCicloEuleriano.net --path (CAMINHO)
+    # COMANDO PARA TESTAR: python EX1/A1_3.py EX2/test_topo_cycle.net --directed (CIRCUITO DIRIGIDO)
+    # COMANDO PARA TESTAR: python EX1/A1_3.py EX2/test_scc.net --directed (SEM CIRCUITO)
@@ -1,78 +1,349 @@
 import sys
 import heapq
-from graph_utils import Graph
+import math
+from array import array
+from graph_utils import Graph, load_options, load_graph, parse_coordinates
+from graph_utils import QUEUES, choose_queue, make_queue
+from graph_utils import BUFFER_SIZE, write_parents, write_parents_jsonl, write_paths
 
-def dijkstra(graph, start_vertex):
+INF = float('inf')
+
+# Algoritmos do modo origem-destino (A1_4.py grafo.net s t)
+ALGORITMOS = ('bidirectional', 'astar', 'dijkstra')
+# Formatos da saída da árvore de caminhos mínimos (A1_4.py grafo.net s)
+FORMATOS = ('text', 'jsonl', 'binary')
+
+def dijkstra(graph, start_vertex, queue=None, stats=None):
     """
     Encontra o caminho mais curto de start_vertex para todos os outros vértices
     usando o algoritmo de Dijkstra.
+
+    Trabalha sobre os índices densos do grafo (0..n-1): start_vertex é um índice
+    e o retorno são vetores indexados por índice, com -1 como predecessor nulo.
+    Use graph.ids para traduzir de/para os ids do arquivo.
+
+    queue escolhe a fila de prioridade ('heapq', 'dial', 'radix' ou 'dary',
+    ver graph_core.heaps); por padrão ela é escolhida pelas estatísticas dos
+    pesos do grafo. Todas fixam os vértices na mesma ordem, então o resultado
+    não muda. Se stats for um dict, recebe as inserções, remoções e o tamanho
+    máximo da fila.
     """
-    # Fila de prioridade armazena tuplas de (distância, vértice)
-    pq = [(0, start_vertex)]
-    
-    # Dicionário para armazenar a menor distância encontrada até agora para cada vértice
-    distances = {v: float('inf') for v in graph.get_all_vertices()}
+    csr = graph.csr
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+    # Vetor com a menor distância encontrada até agora para cada vértice
+    distances = array('d', [float('inf')]) * csr.num_rows
     distances[start_vertex] = 0
-    
-    # Dicionário para reconstruir o caminho
-    predecessors = {v: None for v in graph.get_all_vertices()}
 
-    while pq:
-        current_dist, u = heapq.heappop(pq)
+    # Vetor para reconstruir o caminho
+    predecessors = array('i', [-1]) * csr.num_rows
 
-        # Se já encontramos um caminho mais curto, pulamos
-        if current_dist > distances[u]:
-            continue
+    # Fila de prioridade de vértices, ordenada pelas distâncias
+    weight_stats = graph.weight_stats
+    pq = make_queue(queue or choose_queue(weight_stats), distances, weight_stats)
+    push, pop = pq.push, pq.pop
+    push(start_vertex)
+
+    while (u := pop()) >= 0:
+        current_dist = distances[u]
+        for pos in range(offsets[u], offsets[u + 1]):
+            v = targets[pos]
+            distance_through_u = current_dist + weights[pos]
 
-        for v, weight in graph.adjacency_list[u]:
-            distance_through_u = distances[u] + weight
-            
             if distance_through_u < distances[v]:
                 distances[v] = distance_through_u
                 predecessors[v] = u
-                heapq.heappush(pq, (distances[v], v))
-                
+                push(v)
+
+    if stats is not None:
+        stats.update(pq.stats())
     return distances, predecessors
 
 def reconstruct_path(predecessors, start_vertex, end_vertex):
     """
-    Reconstrói o caminho a partir do dicionário de predecessores.
+    Reconstrói o caminho (em índices densos) a partir do vetor de predecessores.
     """
     path = []
     current = end_vertex
     # Retorna um caminho vazio se não houver caminho
-    if predecessors[current] is None and current != start_vertex:
+    if predecessors[current] == -1 and current != start_vertex:
         return []
-        
-    while current is not None:
+
+    while current != -1:
         path.append(current)
         current = predecessors[current]
     return path[::-1] # Retorna o caminho revertido (da origem ao destino)
 
+def astar(graph, start_vertex, end_vertex, heuristic=None):
+    """
+    Busca A* de start_vertex até end_vertex (índices densos), que para assim
+    que o destino é fixado. heuristic(v) deve ser admissível: nunca maior que
+    a distância de v até o destino. Se ela também for consistente (nunca maior
+    que peso(v, w) + heuristic(w)) cada vértice é fixado uma vez; senão um
+    vértice que ganhe um caminho mais curto é reaberto. Sem heurística é o
+    Dijkstra com parada antecipada, e fixa os vértices na mesma ordem de
+    dijkstra(). Retorna (distância, caminho, vértices fixados); se não houver
+    caminho, a distância é infinita e o caminho é vazio.
+    """
+    csr = graph.csr
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    if heuristic is None:
+        heuristic = lambda v: 0.0  # noqa: E731
+
+    distances = array('d', [INF]) * csr.num_rows
+    predecessors = array('i', [-1]) * csr.num_rows
+    distances[start_vertex] = 0
+    pq = [(heuristic(start_vertex), 0, start_vertex)]
+    settled = 0
+
+    while pq:
+        _, du, u = heapq.heappop(pq)
+        # Entrada antiga: u já foi alcançado por um caminho mais curto
+        if du > distances[u]:
+            continue
+        settled += 1
+        if u == end_vertex:
+            break
+
+        for pos in range(offsets[u], offsets[u + 1]):
+            v = targets[pos]
+            distance_through_u = du + weights[pos]
+            if distance_through_u < distances[v]:
+                distances[v] = distance_through_u
+                predecessors[v] = u
+                estimate = heuristic(v)
+                # Heurística infinita: v não alcança o destino
+                if estimate != INF:
+                    heapq.heappush(pq, (distance_through_u + estimate, distance_through_u, v))
+
+    if distances[end_vertex] == INF:
+        return INF, [], settled
+    return distances[end_vertex], reconstruct_path(predecessors, start_vertex, end_vertex), settled
+
+def bidirectional_dijkstra(graph, start_vertex, end_vertex):
+    """
+    Dijkstra bidirecional entre start_vertex e end_vertex (índices densos):
+    uma busca a partir da origem sobre graph.csr e outra a partir do destino
+    sobre graph.reverse_csr, sempre avançando a de fila menor. Para quando a
+    soma dos topos das duas filas alcança o melhor caminho já visto.
+    Retorna (distância, caminho, vértices fixados), como astar().
+    """
+    if start_vertex == end_vertex:
+        return 0.0, [start_vertex], 1
+
+    n = graph.qtdVertices()
+    lados = (graph.csr, graph.reverse_csr)
+    distances = (array('d', [INF]) * n, array('d', [INF]) * n)
+    predecessors = (array('i', [-1]) * n, array('i', [-1]) * n)
+    fixados = (bytearray(n), bytearray(n))
+    pqs = ([(0.0, start_vertex)], [(0.0, end_vertex)])
+    distances[0][start_vertex] = 0
+    distances[1][end_vertex] = 0
+
+    melhor, encontro = INF, -1  # melhor caminho visto e o vértice onde as buscas se tocam
+    settled = 0
+    while pqs[0] and pqs[1]:
+        if pqs[0][0][0] + pqs[1][0][0] >= melhor:
+            break
+        lado = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+        du, u = heapq.heappop(pqs[lado])
+        if fixados[lado][u]:
+            continue
+        fixados[lado][u] = 1
+        settled += 1
+
+        csr = lados[lado]
+        minhas, outras = distances[lado], distances[1 - lado]
+        for pos in range(csr.offsets[u], csr.offsets[u + 1]):
+            v = csr.targets[pos]
+            distance_through_u = du + csr.weights[pos]
+            if distance_through_u < minhas[v]:
+                minhas[v] = distance_through_u
+                predecessors[lado][v] = u
+                heapq.heappush(pqs[lado], (distance_through_u, v))
+            if distance_through_u + outras[v] < melhor:
+                melhor, encontro = distance_through_u + outras[v], v
+
+    if encontro < 0:
+        return INF, [], settled
+    # Origem -> encontro pela busca direta, encontro -> destino pela reversa
+    path = reconstruct_path(predecessors[0], start_vertex, encontro)
+    v = predecessors[1][encontro]
+    while v != -1:
+        path.append(v)
+        v = predecessors[1][v]
+    return path_distance(graph, path), path, settled
+
+def path_distance(graph, path):
+    """Soma os pesos do caminho da origem ao destino, na mesma ordem que dijkstra() soma"""
+    csr = graph.csr
+    total = 0
+    for u, v in zip(path, path[1:]):
+        total += min(csr.weights[pos] for pos in range(csr.offsets[u], csr.offsets[u + 1])
+                     if csr.targets[pos] == v)
+    return total
+
+def coordinate_heuristic(graph, end_vertex):
+    """
+    Heurística do A* a partir das coordenadas dos vértices no arquivo Pajek
+    ('id "rótulo" x y'; o grafo precisa ser lido com os rótulos): a distância
+    euclidiana até o destino, multiplicada pelo maior fator que não passa do
+    peso de nenhuma aresta, o que a mantém consistente.
+    Retorna None se algum vértice não tiver coordenadas.
+    """
+    coordenadas = [parse_coordinates(graph.vertices.label(i)) for i in range(graph.qtdVertices())]
+    if any(c is None for c in coordenadas):
+        return None
+    xs = array('d', [c[0] for c in coordenadas])
+    ys = array('d', [c[1] for c in coordenadas])
+
+    escala = INF
+    src, dst, wt = graph.edge_arrays
+    for u, v, w in zip(src, dst, wt):
+        comprimento = math.hypot(xs[u] - xs[v], ys[u] - ys[v])
+        if comprimento > 0:
+            escala = min(escala, w / comprimento)
+    if escala == INF or escala < 0:
+        escala = 0.0
+
+    tx, ty = xs[end_vertex], ys[end_vertex]
+    return lambda v: escala * math.hypot(xs[v] - tx, ys[v] - ty)
+
+def format_distance(dist, is_start):
+    """Mantém o formato original: a origem sai como 0 e as demais como float"""
+    return '0' if is_start else str(dist)
+
+def algoritmo_escolhido(argv):
+    """Remove --algorithm NOME de argv (no lugar) e retorna o nome (bidirectional por padrão)"""
+    algoritmo = 'bidirectional'
+    if '--algorithm' in argv:
+        i = argv.index('--algorithm')
+        algoritmo = argv[i + 1] if i + 1 < len(argv) else ''
+        del argv[i:i + 2]
+        if algoritmo not in ALGORITMOS:
+            print(f"Erro: --algorithm espera um de {', '.join(ALGORITMOS)}, recebeu {algoritmo!r}")
+            sys.exit(2)
+    return algoritmo
+
+def opcoes_fila(argv):
+    """
+    Remove de argv (no lugar) --queue NOME e --queue-stats. Retorna a fila
+    pedida (None: escolha automática) e se as estatísticas dela devem ser
+    impressas (em stderr, para não misturar com a saída).
+    """
+    fila = None
+    if '--queue' in argv:
+        i = argv.index('--queue')
+        fila = argv[i + 1] if i + 1 < len(argv) else ''
+        del argv[i:i + 2]
+        if fila not in QUEUES:
+            print(f"Erro: --queue espera um de {', '.join(QUEUES)}, recebeu {fila!r}")
+            sys.exit(2)
+    mostrar = '--queue-stats' in argv
+    if mostrar:
+        argv.remove('--queue-stats')
+    return fila, mostrar
+
+def opcoes_saida(argv):
+    """
+    Remove de argv (no lugar) --format NOME e --output ARQ e os retorna.
+    text (padrão) imprime um caminho por vértice; jsonl e binary gravam o
+    vetor de pais (binary só em arquivo, ver graph_core.spt).
+    """
+    formato, saida = 'text', None
+    for flag in ('--format', '--output'):
+        if flag in argv:
+            i = argv.index(flag)
+            valor = argv[i + 1] if i + 1 < len(argv) else ''
+            del argv[i:i + 2]
+            if flag == '--format':
+                formato = valor
+            else:
+                saida = valor
+    if formato not in FORMATOS:
+        print(f"Erro: --format espera um de {', '.join(FORMATOS)}, recebeu {formato!r}")
+        sys.exit(2)
+    if formato == 'binary' and not saida:
+        print("Erro: --format binary precisa de --output ARQ")
+        sys.exit(2)
+    return formato, saida
+
+def escrever_arvore(g, s, distances, predecessors, formato, saida):
+    """Escreve a árvore de caminhos mínimos no formato pedido, em saida ou na saída padrão"""
+    if formato == 'binary':
+        if not write_parents(saida, g.ids, distances, predecessors, s):
+            print(f"Erro: não foi possível gravar {saida}.")
+        return
+    escrever = write_paths if formato == 'text' else write_parents_jsonl
+    argumentos = (g.ids, distances, predecessors, s) if formato == 'text' else (g.ids, distances, predecessors)
+    if saida is None:
+        sys.stdout.flush()
+        escrever(sys.stdout.buffer, *argumentos)
+        sys.stdout.buffer.flush()
+        return
+    with open(saida, 'wb', buffering=BUFFER_SIZE) as arquivo:
+        escrever(arquivo, *argumentos)
+
+def consulta(g, start_vertex, end_vertex, algoritmo):
+    """Modo origem-destino: imprime o caminho de start_vertex até end_vertex e os vértices fixados"""
+    s, t = g.ids.index(start_vertex), g.ids.index(end_vertex)
+    if algoritmo == 'bidirectional':
+        dist, path, settled = bidirectional_dijkstra(g, s, t)
+    elif algoritmo == 'astar':
+        heuristic = coordinate_heuristic(g, t)
+        if heuristic is None:
+            print("Aviso: vértices sem coordenadas; A* segue sem heurística.")
+        dist, path, settled = astar(g, s, t, heuristic)
+    else:
+        dist, path, settled = astar(g, s, t)
+
+    if dist == INF:
+        print(f"Não há caminho de {start_vertex} até {end_vertex}.")
+    else:
+        path_str = ",".join(map(str, g.ids.to_ids(path)))
+        print(f"{end_vertex}: {path_str}; d={format_distance(dist, s == t)}")
+    print(f"Vértices fixados: {settled} de {g.qtdVertices()}")
+
 def main():
+    opcoes = load_options(sys.argv)
+    algoritmo = algoritmo_escolhido(sys.argv)
+    fila, mostrar_fila = opcoes_fila(sys.argv)
+    formato, saida = opcoes_saida(sys.argv)
     file_path = sys.argv[1]
     start_vertex = int(sys.argv[2])
+    end_vertex = int(sys.argv[3]) if len(sys.argv) > 3 else None
 
     g = Graph()
-    g.ler(file_path)
+    # Só o A* lê os rótulos, de onde vêm as coordenadas
+    load_graph(g, file_path, labels=algoritmo == 'astar' and end_vertex is not None, **opcoes)
 
-    if start_vertex not in g.vertices:
-        print(f"Erro: O vértice {start_vertex} não existe no grafo.")
-        return
+    for vertex in (start_vertex, end_vertex):
+        if vertex is not None and vertex not in g.ids:
+            print(f"Erro: O vértice {vertex} não existe no grafo.")
+            return
 
-    distances, predecessors = dijkstra(g, start_vertex)
+    if end_vertex is not None:
+        consulta(g, start_vertex, end_vertex, algoritmo)
+        return
 
-    # Ordena os vértices por índice para uma saída consistente
-    sorted_vertices = sorted(g.get_all_vertices())
+    s = g.ids.index(start_vertex)
+    stats = {}
+    try:
+        distances, predecessors = dijkstra(g, s, fila, stats)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    if mostrar_fila:
+        print(f"Fila: {stats['queue']}, inserções: {stats['pushes']}, remoções: {stats['pops']}, "
+              f"pico: {stats['peak']}", file=sys.stderr)
 
-    for v in sorted_vertices:
-        dist = distances[v]
-        # Só imprime se um caminho foi encontrado
-        if dist != float('inf'):
-            path = reconstruct_path(predecessors, start_vertex, v)
-            path_str = ",".join(map(str, path))
-            print(f"{v}: {path_str}; d={dist}")
+    # Índices densos seguem a ordem crescente dos ids, então a saída já sai ordenada
+    escrever_arvore(g, s, distances, predecessors, formato, saida)
 
 if __name__ == "__main__":
     main()
-    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1
\ No newline at end of file
+    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1
+    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1 --queue radix --queue-stats
+    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1 --format jsonl
+    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1 7
+    # COMANDO PARA TESTAR: python EX1/A1_4.py EX1/fln_pequena.net 1 7 --algorithm astar
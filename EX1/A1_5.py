@@ -1,53 +1,182 @@
 import sys
-from graph_utils import Graph
+from graph_utils import Graph, load_options, load_graph
+from graph_utils import TILE, DTYPES, floyd_warshall_blocked, floyd_warshall_python
+from graph_utils import APSP_METHODS, FLOYD_WARSHALL, all_pairs, check_diagonal, choose_method
+from graph_utils import matrix_file, read_rows
+from graph_core import apsp
+from A1_4 import dijkstra
 
-def floyd_warshall(graph):
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def floyd_warshall(graph, precisao='float64', predecessores=False, bloco=None, processos=None):
     """
     Calcula os caminhos mais curtos entre todos os pares de vértices
     usando o algoritmo de Floyd-Warshall.
+
+    Retorna a matriz dist indexada pelos índices densos do grafo, que seguem
+    a ordem crescente dos ids (graph.ids traduz). Com NumPy ela é um array
+    contíguo de precisao ('float64' ou 'float32') e cada passo k é uma única
+    operação vetorizada (ver graph_core.apsp); sem NumPy, uma lista de listas
+    calculada pelos três laços aninhados. Com predecessores=True (só com
+    NumPy) retorna (dist, pred), com pred[i][j] o vértice antes de j no
+    caminho mínimo de i até j.
+
+    Com bloco (o lado dos blocos) ou processos, roda a versão em blocos,
+    que divide a última fase de cada bloco de pivôs entre processos
+    processos (um por núcleo se None).
+    """
+    if np is None:
+        if predecessores:
+            raise RuntimeError("a matriz de predecessores precisa do NumPy")
+        return floyd_warshall_python(graph.csr)
+    if bloco is not None or processos is not None:
+        dist, pred = floyd_warshall_blocked(graph.csr, precisao, predecessores, bloco or TILE, processos)
+    else:
+        dist, pred = apsp.floyd_warshall(graph.csr, precisao, predecessores)
+    return (dist, pred) if predecessores else dist
+
+def todos_os_pares(graph, metodo=None, precisao='float64', bloco=None, processos=None):
     """
-    vertices = sorted(graph.get_all_vertices())
-    
-    # Inicializa o dicionário de distâncias
-    dist = {u: {v: float('inf') for v in vertices} for u in vertices}
-
-    # Define as distâncias iniciais com base nas arestas existentes
-    for u in vertices:
-        dist[u][u] = 0
-        for v_neighbor, weight in graph.adjacency_list[u]:
-            dist[u][v_neighbor] = weight
-
-    # Algoritmo principal com três laços aninhados
-    for k in vertices:
-        for i in vertices:
-            for j in vertices:
-                if dist[i][k] + dist[k][j] < dist[i][j]:
-                    dist[i][j] = dist[i][k] + dist[k][j]
-            
+    Matriz de distâncias entre todos os pares, pelo algoritmo metodo
+    ('dijkstra', 'johnson' ou 'floyd-warshall'). Com metodo None, escolhe o
+    de menor custo estimado pela densidade e pelo sinal dos pesos (ver
+    graph_core.apsp): um dijkstra() do A1_4 por origem em grafos esparsos,
+    Johnson se houver pesos negativos, Floyd-Warshall em grafos densos.
+    Levanta ValueError se houver ciclo negativo.
+    """
+    metodo = metodo or choose_method(graph.csr, graph.weight_stats)[0]
+    if metodo == FLOYD_WARSHALL:
+        dist = floyd_warshall(graph, precisao, bloco=bloco, processos=processos)
+        check_diagonal(dist)
+        return dist
+    dist, _ = all_pairs(graph, dijkstra, metodo, precisao, processes=processos)
     return dist
 
+def matriz_em_disco(graph, arquivo_matriz, arquivo, metodo, precisao='float64', bloco=None, processos=None):
+    """
+    Calcula a matriz de distâncias no arquivo arquivo_matriz, mapeado com
+    numpy.memmap, para grafos cuja matriz não cabe na memória (ver
+    graph_core.outofcore). Cada bloco de linhas pronto fica registrado no
+    arquivo, e uma execução interrompida retoma do último bloco completo.
+    Retorna um gerador das linhas, lidas do arquivo um bloco por vez.
+    """
+    def progresso(feitas, total):
+        if inicio and feitas:
+            print(f"Retomando {arquivo_matriz}: {feitas} de {total} linhas prontas", file=sys.stderr)
+        inicio.clear()
+
+    inicio = [True]
+    bloco = bloco or TILE
+    matrix_file(graph, arquivo_matriz, arquivo, dijkstra, metodo, precisao, bloco, processos, progresso)
+    return read_rows(arquivo_matriz, graph.qtdVertices(), precisao, bloco)
+
+def escrever_matriz(g, linhas, saida=sys.stdout):
+    """Escreve as linhas da matriz ('id:d1,d2,...') uma a uma, sem montar a saída inteira"""
+    for u, row in enumerate(linhas):
+        # tolist() converte a linha do NumPy em floats do Python
+        distances_str = ",".join(map(format_distance, row.tolist() if np is not None else row))
+        saida.write(f"{g.ids.id(u)}:{distances_str}\n")
+
+def format_distance(distance_val):
+    """Formata para inteiro se não houver parte decimal"""
+    if distance_val == float('inf'):
+        return 'inf'
+    return str(int(distance_val) if distance_val.is_integer() else distance_val)
+
+def opcao_precisao(argv):
+    """Remove --dtype NOME de argv (no lugar) e o retorna (float64 por padrão)"""
+    precisao = 'float64'
+    if '--dtype' in argv:
+        i = argv.index('--dtype')
+        precisao = argv[i + 1] if i + 1 < len(argv) else ''
+        del argv[i:i + 2]
+        if precisao not in DTYPES:
+            print(f"Erro: --dtype espera um de {', '.join(DTYPES)}, recebeu {precisao!r}")
+            sys.exit(2)
+    return precisao
+
+def opcao_metodo(argv):
+    """Remove --method NOME de argv (no lugar) e o retorna (None, a escolha automática, por padrão)"""
+    metodo = None
+    if '--method' in argv:
+        i = argv.index('--method')
+        metodo = argv[i + 1] if i + 1 < len(argv) else ''
+        del argv[i:i + 2]
+        if metodo == 'auto':
+            metodo = None
+        elif metodo not in APSP_METHODS:
+            print(f"Erro: --method espera auto ou um de {', '.join(APSP_METHODS)}, recebeu {metodo!r}")
+            sys.exit(2)
+    return metodo
+
+def opcao_arquivo(argv):
+    """Remove --out-of-core ARQ de argv (no lugar) e o retorna (None se ausente)"""
+    if '--out-of-core' not in argv:
+        return None
+    i = argv.index('--out-of-core')
+    arquivo = argv[i + 1] if i + 1 < len(argv) else ''
+    del argv[i:i + 2]
+    if not arquivo:
+        print("Erro: --out-of-core espera o caminho do arquivo da matriz")
+        sys.exit(2)
+    return arquivo
+
+def opcoes_blocos(argv):
+    """
+    Remove de argv (no lugar) e retorna (bloco, processos), None se ausentes:
+        --tile T         lado dos blocos do Floyd-Warshall em blocos (e linhas por
+                         bloco gravado com --out-of-core)
+        --processes N    processos da versão em blocos ou dos Dijkstras
+    """
+    valores = []
+    for flag in ('--tile', '--processes'):
+        valor = None
+        if flag in argv:
+            i = argv.index(flag)
+            texto = argv[i + 1] if i + 1 < len(argv) else ''
+            del argv[i:i + 2]
+            if not texto.isdigit() or int(texto) < 1:
+                print(f"Erro: {flag} espera um inteiro positivo, recebeu {texto!r}")
+                sys.exit(2)
+            valor = int(texto)
+        valores.append(valor)
+    return tuple(valores)
+
 def main():
+    opcoes = load_options(sys.argv)
+    precisao = opcao_precisao(sys.argv)
+    metodo = opcao_metodo(sys.argv)
+    arquivo_matriz = opcao_arquivo(sys.argv)
+    bloco, processos = opcoes_blocos(sys.argv)
     file_path = sys.argv[1]
     g = Graph()
-    g.ler(file_path)
-
-    all_distances = floyd_warshall(g)
-    sorted_vertices = sorted(g.get_all_vertices())
+    load_graph(g, file_path, labels=False, **opcoes)
 
-    for u in sorted_vertices:
-        # Constrói a string para a linha atual
-        distances_list = []
-        for v in sorted_vertices:
-            distance_val = all_distances[u][v]
-            # Formata para inteiro se não houver parte decimal
-            if distance_val == float('inf'):
-                distances_list.append('inf')
-            else:
-                distances_list.append(str(int(distance_val) if distance_val.is_integer() else distance_val))
+    escolhido, custos = choose_method(g.csr, g.weight_stats)
+    metodo = metodo or escolhido
+    estimativas = ", ".join(f"{nome} {segundos:.3g} s" for nome, segundos in custos.items())
+    print(f"Algoritmo: {metodo} (custo estimado: {estimativas})", file=sys.stderr)
+    if arquivo_matriz is not None and np is None:
+        print("Erro: --out-of-core precisa do NumPy")
+        return
+    try:
+        if arquivo_matriz is not None:
+            all_distances = matriz_em_disco(g, arquivo_matriz, file_path, metodo, precisao, bloco, processos)
+        else:
+            all_distances = todos_os_pares(g, metodo, precisao, bloco, processos)
+    except (ValueError, OSError) as e:
+        print(f"Erro: {e}")
+        return
 
-        distances_str = ",".join(distances_list)
-        print(f"{u}:{distances_str}")
+    escrever_matriz(g, all_distances)
 
 if __name__ == "__main__":
     main()
-    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net
\ No newline at end of file
+    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net
+    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net --dtype float32
+    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net --tile 64 --processes 2
+    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net --method johnson
+    # COMANDO PARA TESTAR: python EX1/A1_5.py EX1/fln_pequena.net --out-of-core /tmp/fln_pequena.apsp
@@ -0,0 +1,102 @@
+import sys
+import time
+from graph_utils import Graph, load_options, load_graph, query_pairs, APSPStore, store_path
+from graph_utils import APSP_METHODS, DTYPES
+from A1_4 import INF, dijkstra, format_distance
+
+def preparar(arquivo, opcoes, metodo=None, precisao='float64', processos=None, refazer=False):
+    """
+    Retorna a tabela de todos os pares do grafo de arquivo. Mapeia a gravada
+    em arquivo.apsp quando ela veio do mesmo arquivo, na mesma precisao e
+    pelo mesmo metodo (qualquer um se metodo é None), sem nem ler o grafo;
+    senão lê o grafo, calcula a tabela (informando em stderr) e a grava,
+    a menos que opcoes desligue o snapshot.
+    """
+    caminho = store_path(arquivo)
+    salvar = opcoes.get('snapshot', True)
+    if salvar and not refazer:
+        tabela = APSPStore.load(caminho, arquivo, False, metodo, precisao)
+        if tabela is not None:
+            return tabela
+
+    g = Graph()
+    load_graph(g, arquivo, labels=False, **opcoes)
+    inicio = time.perf_counter()
+    tabela = APSPStore.build(g, dijkstra, metodo, precisao, processos)
+    print(f"Tabela: {tabela.n} vértices ({tabela.method}) em {time.perf_counter() - inicio:.2f} s",
+          file=sys.stderr)
+    if salvar:
+        tabela.save(caminho, arquivo)
+    return tabela
+
+def opcoes_tabela(argv):
+    """
+    Remove as opções do programa de argv (no lugar) e as retorna:
+        --queries ARQ       lê os pares origem-destino de ARQ
+        --method NOME       dijkstra, johnson ou floyd-warshall (escolhido pelo grafo por padrão)
+        --dtype NOME        float64 (padrão) ou float32 para as distâncias
+        --processes N       processos do cálculo da tabela
+        --rebuild           ignora a tabela gravada e calcula de novo
+    """
+    opcoes = {'consultas': None, 'metodo': None, 'precisao': 'float64', 'processos': None, 'refazer': False}
+    for flag, chave in (('--queries', 'consultas'), ('--method', 'metodo'), ('--dtype', 'precisao'),
+                        ('--processes', 'processos')):
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print(f"Erro: {flag} espera um valor")
+                sys.exit(2)
+            opcoes[chave] = argv[i + 1]
+            del argv[i:i + 2]
+    if '--rebuild' in argv:
+        argv.remove('--rebuild')
+        opcoes['refazer'] = True
+    if opcoes['metodo'] == 'auto':
+        opcoes['metodo'] = None
+    if opcoes['metodo'] is not None and opcoes['metodo'] not in APSP_METHODS:
+        print(f"Erro: --method espera auto ou um de {', '.join(APSP_METHODS)}, recebeu {opcoes['metodo']!r}")
+        sys.exit(2)
+    if opcoes['precisao'] not in DTYPES:
+        print(f"Erro: --dtype espera um de {', '.join(DTYPES)}, recebeu {opcoes['precisao']!r}")
+        sys.exit(2)
+    if opcoes['processos'] is not None:
+        if not opcoes['processos'].isdigit() or int(opcoes['processos']) < 1:
+            print(f"Erro: --processes espera um inteiro positivo, recebeu {opcoes['processos']!r}")
+            sys.exit(2)
+        opcoes['processos'] = int(opcoes['processos'])
+    return opcoes
+
+def main():
+    opcoes = load_options(sys.argv)
+    extra = opcoes_tabela(sys.argv)
+    uso = ("Uso: python apsp_queries.py <arquivo.net> [s t ...] [--queries ARQ] "
+           "[--method auto|dijkstra|johnson|floyd-warshall] [--dtype float64|float32] "
+           "[--processes N] [--rebuild]")
+    pares = query_pairs(sys.argv, uso, extra['consultas'])
+    file_path = sys.argv[1]
+
+    try:
+        tabela = preparar(file_path, opcoes, extra['metodo'], extra['precisao'], extra['processos'],
+                          extra['refazer'])
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    ids = tabela.ids
+    for s, t in pares:
+        for vertex in (s, t):
+            if vertex not in ids:
+                print(f"Erro: O vértice {vertex} não existe no grafo.")
+                return
+
+    for s, t in pares:
+        i, j = ids.index(s), ids.index(t)
+        dist = tabela.dist(i, j)
+        if dist == INF:
+            print(f"Não há caminho de {s} até {t}.")
+        else:
+            print(f"{t}: {','.join(map(str, ids.to_ids(tabela.path(i, j))))}; d={format_distance(dist, s == t)}")
+
+if __name__ == "__main__":
+    main()
+    # COMANDO PARA TESTAR: python EX1/apsp_queries.py EX1/fln_pequena.net 1 7 3 9
+    # COMANDO PARA TESTAR: python EX1/apsp_queries.py EX1/fln_pequena.net 1 7 --method johnson --rebuild
@@ -0,0 +1,91 @@
+import math
+import sys
+import time
+from graph_utils import Graph, load_options, load_graph, query_pairs, ContractionHierarchy, hierarchy_path
+from A1_4 import INF, dijkstra, format_distance
+
+def preparar(graph, arquivo, salvar=True, refazer=False):
+    """
+    Retorna a hierarquia de contração do grafo lido de arquivo. Reaproveita a
+    salva em arquivo.ch quando ela foi gerada a partir do mesmo arquivo; senão
+    contrai o grafo (informando em stderr) e, com salvar, grava o resultado.
+    """
+    caminho = hierarchy_path(arquivo)
+    if salvar and not refazer:
+        hierarquia = ContractionHierarchy.load(caminho, arquivo, graph.directed)
+        if hierarquia is not None and len(hierarquia.rank) == graph.qtdVertices():
+            return hierarquia
+
+    inicio = time.perf_counter()
+    hierarquia = ContractionHierarchy.build(graph.csr, graph.directed)
+    print(f"Pré-processamento: {hierarquia.shortcuts} atalhos em {time.perf_counter() - inicio:.2f} s",
+          file=sys.stderr)
+    if salvar:
+        hierarquia.save(caminho, arquivo)
+    return hierarquia
+
+def caminho_mais_curto(graph, hierarquia, start_vertex, end_vertex):
+    """
+    Consulta origem-destino na hierarquia (ids do arquivo). Retorna
+    (distância, caminho em ids, vértices fixados), com distância infinita e
+    caminho vazio se não houver caminho.
+    """
+    ids = graph.ids
+    dist, path, settled = hierarquia.query(ids.index(start_vertex), ids.index(end_vertex))
+    return dist, ids.to_ids(path), settled
+
+def opcoes_ch(argv):
+    """
+    Remove as opções do programa de argv (no lugar) e as retorna:
+        --queries ARQ   lê os pares origem-destino de ARQ
+        --rebuild       ignora a hierarquia salva e contrai de novo
+        --verify        confere cada distância com o dijkstra() do A1_4
+    """
+    opcoes = {'consultas': None, 'refazer': False, 'conferir': False}
+    if '--queries' in argv:
+        i = argv.index('--queries')
+        if i + 1 >= len(argv):
+            print("Erro: --queries espera um arquivo")
+            sys.exit(2)
+        opcoes['consultas'] = argv[i + 1]
+        del argv[i:i + 2]
+    for flag, chave in (('--rebuild', 'refazer'), ('--verify', 'conferir')):
+        if flag in argv:
+            argv.remove(flag)
+            opcoes[chave] = True
+    return opcoes
+
+def main():
+    opcoes = load_options(sys.argv)
+    extra = opcoes_ch(sys.argv)
+    uso = ("Uso: python contraction_hierarchies.py <arquivo.net> [s t ...] [--queries ARQ] "
+           "[--rebuild] [--verify]")
+    pares = query_pairs(sys.argv, uso, extra['consultas'])
+    file_path = sys.argv[1]
+
+    g = Graph()
+    load_graph(g, file_path, labels=False, **opcoes)
+    for s, t in pares:
+        for vertex in (s, t):
+            if vertex not in g.ids:
+                print(f"Erro: O vértice {vertex} não existe no grafo.")
+                return
+
+    hierarquia = preparar(g, file_path, opcoes.get('snapshot', True), extra['refazer'])
+    for s, t in pares:
+        dist, path, _ = caminho_mais_curto(g, hierarquia, s, t)
+        if dist == INF:
+            print(f"Não há caminho de {s} até {t}.")
+        else:
+            print(f"{t}: {','.join(map(str, path))}; d={format_distance(dist, s == t)}")
+        if extra['conferir']:
+            distances, _ = dijkstra(g, g.ids.index(s))
+            esperado = distances[g.ids.index(t)]
+            # Caminhos de mesmo comprimento podem somar diferente no último bit
+            if not math.isclose(dist, esperado, rel_tol=1e-9):
+                print(f"Erro: distância de {s} até {t} difere do Dijkstra ({dist} != {esperado})")
+
+if __name__ == "__main__":
+    main()
+    # COMANDO PARA TESTAR: python EX1/contraction_hierarchies.py EX1/fln_pequena.net 1 7 3 9
+    # COMANDO PARA TESTAR: python EX1/contraction_hierarchies.py EX1/fln_pequena.net 1 7 --verify
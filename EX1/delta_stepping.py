@@ -0,0 +1,91 @@
+import sys
+import time
+from graph_utils import Graph, load_options, load_graph, delta_stepping
+from A1_4 import INF, dijkstra, escrever_arvore, opcoes_saida
+
+def conferir(g, s, distances, predecessors):
+    """
+    Compara com o dijkstra() do A1_4: as distâncias devem ser idênticas e
+    cada predecessor deve estar numa aresta justa (d[u] + w == d[v]).
+    Retorna a lista de mensagens de erro (vazia se tudo confere).
+    """
+    esperadas, _ = dijkstra(g, s)
+    csr = g.csr
+    erros = []
+    for v in range(g.qtdVertices()):
+        if distances[v] != esperadas[v]:
+            erros.append(f"distância até {g.ids.id(v)} difere do Dijkstra ({distances[v]} != {esperadas[v]})")
+            continue
+        u = predecessors[v]
+        if u < 0:
+            if v != s and distances[v] != INF:
+                erros.append(f"{g.ids.id(v)} é alcançável mas não tem predecessor")
+            continue
+        justa = any(csr.targets[pos] == v and distances[u] + csr.weights[pos] == distances[v]
+                    for pos in range(csr.offsets[u], csr.offsets[u + 1]))
+        if not justa:
+            erros.append(f"o predecessor {g.ids.id(u)} de {g.ids.id(v)} não está num caminho mínimo")
+    return erros
+
+def opcoes_delta(argv):
+    """
+    Remove as opções do programa de argv (no lugar) e as retorna:
+        --delta D       largura dos baldes (auto, o padrão, usa choose_delta)
+        --verify        confere o resultado com o dijkstra() do A1_4
+        --stats         imprime delta, baldes e fases em stderr
+    """
+    opcoes = {'delta': None, 'conferir': False, 'mostrar': False}
+    if '--delta' in argv:
+        i = argv.index('--delta')
+        valor = argv[i + 1] if i + 1 < len(argv) else ''
+        del argv[i:i + 2]
+        if valor != 'auto':
+            try:
+                opcoes['delta'] = float(valor)
+            except ValueError:
+                print(f"Erro: --delta espera um número ou auto, recebeu {valor!r}")
+                sys.exit(2)
+    for flag, chave in (('--verify', 'conferir'), ('--stats', 'mostrar')):
+        if flag in argv:
+            argv.remove(flag)
+            opcoes[chave] = True
+    return opcoes
+
+def main():
+    if len(sys.argv) < 3:
+        print("Uso: python delta_stepping.py <arquivo.net> <s> [--delta D|auto] [--verify] [--stats] "
+              "[--format text|jsonl|binary] [--output ARQ]")
+        sys.exit(2)
+    opcoes = load_options(sys.argv)
+    extra = opcoes_delta(sys.argv)
+    formato, saida = opcoes_saida(sys.argv)
+    file_path = sys.argv[1]
+    start_vertex = int(sys.argv[2])
+
+    g = Graph()
+    load_graph(g, file_path, labels=False, **opcoes)
+    if start_vertex not in g.ids:
+        print(f"Erro: O vértice {start_vertex} não existe no grafo.")
+        return
+
+    s = g.ids.index(start_vertex)
+    stats = {}
+    inicio = time.perf_counter()
+    try:
+        distances, predecessors = delta_stepping(g.csr, s, extra['delta'], g.weight_stats, stats=stats)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return
+    if extra['mostrar']:
+        print(f"Delta: {stats['delta']}, baldes: {stats['buckets']}, fases: {stats['phases']}, "
+              f"{time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+    if extra['conferir']:
+        for erro in conferir(g, s, distances, predecessors):
+            print(f"Erro: {erro}")
+
+    escrever_arvore(g, s, distances, predecessors, formato, saida)
+
+if __name__ == "__main__":
+    main()
+    # COMANDO PARA TESTAR: python EX1/delta_stepping.py EX1/fln_pequena.net 1 --verify
+    # COMANDO PARA TESTAR: python EX1/delta_stepping.py EX1/fln_pequena.net 1 --delta 1000 --stats
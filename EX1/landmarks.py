@@ -0,0 +1,261 @@
+import struct
+import sys
+import time
+from array import array
+from graph_utils import Graph, load_options, load_graph, query_pairs
+from graph_core.snapshot import BYTE_ORDER, map_arrays, source_stamp, stamp_matches, unmap_arrays, write_arrays
+from A1_4 import INF, astar, dijkstra, format_distance
+
+# Estratégias de escolha dos landmarks
+FARTHEST = 'farthest'
+DEGREE = 'degree'
+ESTRATEGIAS = (FARTHEST, DEGREE)
+LANDMARKS_PADRAO = 8
+
+# As tabelas ficam em float32: cada valor arredondado erra no máximo 2^-24 de si
+# mesmo, então os limites descontam (ou somam) 2^-23 dos valores usados
+ERRO_FLOAT32 = 2.0 ** -23
+
+MAGIC = b'GCALT001'
+# magic, ordem dos bytes, dirigido, estratégia, tamanho, mtime_ns e digest do .net, vértices,
+# landmarks pedidos e landmarks escolhidos (menos que os pedidos em grafos pequenos)
+HEADER = struct.Struct('=8sc?8sqq32sqqq')
+SECTIONS = (('landmarks', 'i'), ('from', 'f'), ('to', 'f'))
+
+class LandmarkOracle:
+    """
+    Oráculo de distâncias ALT (A*, landmarks e desigualdade triangular).
+    Para cada landmark L guarda, em float32, d(L, v) (from_rows) e d(v, L)
+    (to_rows, as mesmas linhas em grafos não dirigidos) para todo vértice
+    denso v. Os limites inferior e superior de d(s, t) custam O(k).
+    """
+    def __init__(self, landmarks, from_rows, to_rows, directed, strategy, k):
+        self.k = k  # landmarks pedidos
+        self.landmarks = landmarks
+        self.from_rows = from_rows
+        self.to_rows = to_rows
+        self.directed = directed
+        self.strategy = strategy
+        self._mapped = None  # mmap das tabelas, quando lidas do disco
+
+    @classmethod
+    def build(cls, graph, k=LANDMARKS_PADRAO, strategy=FARTHEST):
+        """Escolhe k landmarks e roda dijkstra() a partir de cada um (e no transposto, se dirigido)"""
+        if strategy == FARTHEST:
+            landmarks, distances = farthest_landmarks(graph, k)
+        elif strategy == DEGREE:
+            landmarks = degree_landmarks(graph, k)
+            distances = [dijkstra(graph, landmark)[0] for landmark in landmarks]
+        else:
+            raise ValueError(f"estratégia desconhecida {strategy!r}, esperava uma de {', '.join(ESTRATEGIAS)}")
+        from_rows = [array('f', row) for row in distances]
+        if graph.directed:
+            transposto = graph.transposto()
+            to_rows = [array('f', dijkstra(transposto, landmark)[0]) for landmark in landmarks]
+        else:
+            to_rows = from_rows
+        return cls(array('i', landmarks), from_rows, to_rows, graph.directed, strategy, k)
+
+    def lower_bound(self, s, t):
+        """Limite inferior de d(s, t) (índices densos); infinito se t é inalcançável a partir de s"""
+        return _lower_bound(self._rows_at(t), s)
+
+    def upper_bound(self, s, t):
+        """Limite superior de d(s, t): o menor d(s, L) + d(L, t); infinito se nenhum landmark liga os dois"""
+        best = INF
+        for to_row, from_row in zip(self.to_rows, self.from_rows):
+            a, b = to_row[s], from_row[t]
+            if a + b < best:
+                best = a + b
+        return best + ERRO_FLOAT32 * best if best != INF else INF
+
+    def heuristic(self, t):
+        """Heurística do A* para o destino t: o limite inferior até t, em O(k) por vértice"""
+        rows = self._rows_at(t)
+        return lambda v: _lower_bound(rows, v)
+
+    def _rows_at(self, t):
+        return ([(row, row[t]) for row in self.from_rows],
+                [(row, row[t]) for row in self.to_rows])
+
+    def save(self, path, arquivo):
+        """Grava as tabelas em path, carimbadas com o .net de origem. Retorna False se falhar."""
+        try:
+            size, mtime_ns, digest = source_stamp(arquivo)
+        except OSError:
+            return False
+        n = len(self.from_rows[0]) if self.from_rows else 0
+        data = {'landmarks': self.landmarks, 'from': _flatten(self.from_rows),
+                'to': _flatten(self.to_rows) if self.directed else array('f')}
+        header = HEADER.pack(MAGIC, BYTE_ORDER, self.directed, self.strategy.encode(),
+                             size, mtime_ns, digest, n, self.k, len(self.landmarks))
+        return write_arrays(path, header, SECTIONS, data)
+
+    @classmethod
+    def load(cls, path, arquivo, graph, k, strategy):
+        """
+        Mapeia as tabelas gravadas em path, ou retorna None se não existem,
+        vieram de outra versão do arquivo ou têm outro k ou estratégia.
+        """
+        def accept(fields):
+            _, _, directed, stored_strategy, size, mtime_ns, digest, n, requested, _ = fields
+            return (directed == graph.directed and stored_strategy.rstrip(b'\0') == strategy.encode()
+                    and n == graph.qtdVertices() and requested == k
+                    and stamp_matches(arquivo, size, mtime_ns, digest))
+
+        loaded = map_arrays(path, HEADER, SECTIONS, MAGIC, accept)
+        if loaded is None:
+            return None
+        (_, _, directed, _, _, _, _, n, _, count), arrays, mapped = loaded
+        if (len(arrays['landmarks']) != count or len(arrays['from']) != count * n
+                or len(arrays['to']) != (count * n if directed else 0)):
+            unmap_arrays(arrays, mapped)
+            return None
+        from_rows = [arrays['from'][i * n:(i + 1) * n] for i in range(count)]
+        to_rows = [arrays['to'][i * n:(i + 1) * n] for i in range(count)] if directed else from_rows
+        oracle = cls(arrays['landmarks'], from_rows, to_rows, directed, strategy, k)
+        oracle._mapped = mapped
+        return oracle
+
+def farthest_landmarks(graph, k):
+    """
+    Escolha pelo mais distante: o primeiro landmark é o vértice mais longe do
+    vértice 0, e cada um dos seguintes o mais longe de todos os já escolhidos
+    (vértices que nenhum deles alcança vêm antes, para cobrir as outras
+    componentes). Retorna os landmarks e as distâncias a partir de cada um.
+    """
+    n = graph.qtdVertices()
+    if n == 0:
+        return [], []
+    landmarks, distances = [], []
+    nearest = dijkstra(graph, 0)[0]  # distância ao landmark mais próximo (aqui, ao vértice 0)
+    while len(landmarks) < min(k, n):
+        candidate = max(range(n), key=nearest.__getitem__)
+        if landmarks and nearest[candidate] == 0:
+            break  # todos os vértices já são landmarks
+        row = dijkstra(graph, candidate)[0]
+        landmarks.append(candidate)
+        distances.append(row)
+        nearest = row if len(landmarks) == 1 else array('d', map(min, nearest, row))
+    return landmarks, distances
+
+def degree_landmarks(graph, k):
+    """Escolha por grau: os k vértices de maior grau (os de menor índice no empate)"""
+    offsets = graph.csr.offsets
+    order = sorted(range(graph.qtdVertices()), key=lambda v: offsets[v] - offsets[v + 1])
+    return order[:k]
+
+def landmarks_path(arquivo):
+    """Arquivo onde ficam as tabelas de landmarks de arquivo"""
+    return f"{arquivo}.alt"
+
+def _lower_bound(rows, v):
+    """max(d(L, t) - d(L, v), d(v, L) - d(t, L)) sobre os landmarks, descontado o erro do float32"""
+    forward, backward = rows
+    best = 0.0
+    for row, at_t in forward:
+        at_v = row[v]
+        if at_v == INF:
+            continue
+        if at_t == INF:
+            return INF  # L alcança v mas não t: v não alcança t
+        bound = at_t - at_v - ERRO_FLOAT32 * (at_t + at_v)
+        if bound > best:
+            best = bound
+    for row, at_t in backward:
+        if at_t == INF:
+            continue
+        at_v = row[v]
+        if at_v == INF:
+            return INF  # t alcança L mas v não: v não alcança t
+        bound = at_v - at_t - ERRO_FLOAT32 * (at_t + at_v)
+        if bound > best:
+            best = bound
+    return best
+
+def _flatten(rows):
+    flat = array('f')
+    for row in rows:
+        flat.extend(row)
+    return flat
+
+def opcoes_alt(argv):
+    """
+    Remove as opções do programa de argv (no lugar) e as retorna:
+        --landmarks K         número de landmarks (8 por padrão)
+        --strategy NOME       farthest (padrão) ou degree
+        --queries ARQ         lê os pares origem-destino de ARQ
+        --bounds              só imprime os limites inferior e superior, sem busca
+        --rebuild             ignora as tabelas gravadas e recalcula
+    """
+    opcoes = {'k': LANDMARKS_PADRAO, 'estrategia': FARTHEST, 'consultas': None, 'limites': False, 'refazer': False}
+    for flag, chave in (('--landmarks', 'k'), ('--strategy', 'estrategia'), ('--queries', 'consultas')):
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print(f"Erro: {flag} espera um valor")
+                sys.exit(2)
+            opcoes[chave] = argv[i + 1]
+            del argv[i:i + 2]
+    for flag, chave in (('--bounds', 'limites'), ('--rebuild', 'refazer')):
+        if flag in argv:
+            argv.remove(flag)
+            opcoes[chave] = True
+    try:
+        opcoes['k'] = int(opcoes['k'])
+    except ValueError:
+        print(f"Erro: --landmarks espera um inteiro, recebeu {opcoes['k']!r}")
+        sys.exit(2)
+    if opcoes['k'] < 1 or opcoes['estrategia'] not in ESTRATEGIAS:
+        print(f"Erro: --landmarks espera K >= 1 e --strategy um de {', '.join(ESTRATEGIAS)}")
+        sys.exit(2)
+    return opcoes
+
+def preparar(graph, arquivo, k, estrategia, salvar=True, refazer=False):
+    """Lê as tabelas gravadas de arquivo.alt, ou as calcula (informando em stderr) e grava"""
+    caminho = landmarks_path(arquivo)
+    if salvar and not refazer:
+        oraculo = LandmarkOracle.load(caminho, arquivo, graph, k, estrategia)
+        if oraculo is not None:
+            return oraculo
+    inicio = time.perf_counter()
+    oraculo = LandmarkOracle.build(graph, k, estrategia)
+    print(f"Landmarks: {len(oraculo.landmarks)} ({estrategia}) em {time.perf_counter() - inicio:.2f} s",
+          file=sys.stderr)
+    if salvar:
+        oraculo.save(caminho, arquivo)
+    return oraculo
+
+def main():
+    opcoes = load_options(sys.argv)
+    extra = opcoes_alt(sys.argv)
+    uso = ("Uso: python landmarks.py <arquivo.net> [s t ...] [--queries ARQ] [--landmarks K] "
+           "[--strategy farthest|degree] [--bounds] [--rebuild]")
+    pares = query_pairs(sys.argv, uso, extra['consultas'])
+    file_path = sys.argv[1]
+
+    g = Graph()
+    load_graph(g, file_path, labels=False, **opcoes)
+    for s, t in pares:
+        for vertex in (s, t):
+            if vertex not in g.ids:
+                print(f"Erro: O vértice {vertex} não existe no grafo.")
+                return
+
+    oraculo = preparar(g, file_path, extra['k'], extra['estrategia'], opcoes.get('snapshot', True), extra['refazer'])
+    for s, t in pares:
+        i, j = g.ids.index(s), g.ids.index(t)
+        if extra['limites']:
+            print(f"{s} {t}: {oraculo.lower_bound(i, j)} <= d <= {oraculo.upper_bound(i, j)}")
+            continue
+        dist, path, settled = astar(g, i, j, oraculo.heuristic(j))
+        if dist == INF:
+            print(f"Não há caminho de {s} até {t}.")
+        else:
+            print(f"{t}: {','.join(map(str, g.ids.to_ids(path)))}; d={format_distance(dist, s == t)}")
+        print(f"Vértices fixados: {settled} de {g.qtdVertices()}")
+
+if __name__ == "__main__":
+    main()
+    # COMANDO PARA TESTAR: python EX1/landmarks.py EX1/fln_pequena.net 1 7 3 9
+    # COMANDO PARA TESTAR: python EX1/landmarks.py EX1/fln_pequena.net 1 7 --bounds --landmarks 2 --strategy degree
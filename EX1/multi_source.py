@@ -0,0 +1,115 @@
+import io
+import os
+import sys
+import time
+from functools import partial
+from graph_utils import Graph, load_options, load_graph, read_ids, run_sources
+from graph_utils import BUFFER_SIZE, write_parents, write_parents_jsonl, write_paths
+from A1_4 import FORMATOS, dijkstra
+
+def resolver(formato, graph, s):
+    """
+    Roda no processo trabalhador: a árvore de caminhos mínimos a partir do
+    índice denso s, já formatada (bytes) para text e jsonl, ou os vetores
+    (distâncias, predecessores) para binary.
+    """
+    distances, predecessors = dijkstra(graph, s)
+    if formato == 'binary':
+        return distances, predecessors
+    saida = io.BytesIO()
+    if formato == 'text':
+        saida.write(b'Origem %d:\n' % graph.ids.id(s))
+        write_paths(saida, graph.ids, distances, predecessors, s)
+    else:
+        write_parents_jsonl(saida, graph.ids, distances, predecessors, s)
+    return saida.getvalue()
+
+def opcoes_multi(argv):
+    """
+    Remove as opções do programa de argv (no lugar) e as retorna:
+        --sources ARQ       lê os ids de origem de ARQ
+        --all               usa todos os vértices como origem
+        --processes N       processos trabalhadores (um por núcleo por padrão)
+        --format NOME       text (padrão), jsonl ou binary
+        --output ARQ        escreve em ARQ; com binary, ARQ é um diretório
+                            que recebe um ARQ/<origem>.spt por origem
+    """
+    opcoes = {'origens': [], 'todas': False, 'processos': None, 'formato': 'text', 'saida': None}
+    for flag, chave in (('--sources', 'origens'), ('--processes', 'processos'),
+                        ('--format', 'formato'), ('--output', 'saida')):
+        if flag in argv:
+            i = argv.index(flag)
+            if i + 1 >= len(argv):
+                print(f"Erro: {flag} espera um valor")
+                sys.exit(2)
+            opcoes[chave] = argv[i + 1]
+            del argv[i:i + 2]
+    if '--all' in argv:
+        argv.remove('--all')
+        opcoes['todas'] = True
+    if opcoes['processos'] is not None:
+        try:
+            opcoes['processos'] = int(opcoes['processos'])
+        except ValueError:
+            print(f"Erro: --processes espera um inteiro, recebeu {opcoes['processos']!r}")
+            sys.exit(2)
+    if opcoes['formato'] not in FORMATOS:
+        print(f"Erro: --format espera um de {', '.join(FORMATOS)}, recebeu {opcoes['formato']!r}")
+        sys.exit(2)
+    if opcoes['formato'] == 'binary' and not opcoes['saida']:
+        print("Erro: --format binary precisa de --output DIR")
+        sys.exit(2)
+    if opcoes['origens']:
+        opcoes['origens'] = read_ids(opcoes['origens'])
+    return opcoes
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python multi_source.py <arquivo.net> [s ...] [--sources ARQ] [--all] [--processes N] "
+              "[--format text|jsonl|binary] [--output ARQ]")
+        sys.exit(2)
+    opcoes = load_options(sys.argv)
+    extra = opcoes_multi(sys.argv)
+    file_path = sys.argv[1]
+    try:
+        origens = [int(v) for v in sys.argv[2:]] + extra['origens']
+    except ValueError as e:
+        print(f"Erro: vértice inválido: {e}")
+        sys.exit(2)
+
+    g = Graph()
+    load_graph(g, file_path, labels=False, **opcoes)
+    if extra['todas']:
+        origens = list(g.ids.ids)
+    for vertex in origens:
+        if vertex not in g.ids:
+            print(f"Erro: O vértice {vertex} não existe no grafo.")
+            return
+    formato, saida = extra['formato'], extra['saida']
+
+    inicio = time.perf_counter()
+    resultados = run_sources(g, g.ids.to_indices(origens), partial(resolver, formato), extra['processos'])
+    if formato == 'binary':
+        os.makedirs(saida, exist_ok=True)
+        for origem, (distances, predecessors) in zip(origens, resultados):
+            if not write_parents(os.path.join(saida, f"{origem}.spt"), g.ids, distances, predecessors,
+                                 g.ids.index(origem)):
+                print(f"Erro: não foi possível gravar a árvore de {origem} em {saida}.")
+                return
+    elif saida is None:
+        sys.stdout.flush()
+        for bloco in resultados:
+            sys.stdout.buffer.write(bloco)
+        sys.stdout.buffer.flush()
+    else:
+        with open(saida, 'wb', buffering=BUFFER_SIZE) as arquivo:
+            for bloco in resultados:
+                arquivo.write(bloco)
+    segundos = time.perf_counter() - inicio
+    print(f"Origens: {len(origens)} em {segundos:.2f} s ({len(origens) / max(segundos, 1e-9):.1f} por segundo)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
+    # COMANDO PARA TESTAR: python EX1/multi_source.py EX1/fln_pequena.net 1 3 7
+    # COMANDO PARA TESTAR: python EX1/multi_source.py EX1/fln_pequena.net --all --processes 2 --format jsonl
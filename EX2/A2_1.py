@@ -1,41 +1,44 @@
-from graph_utils import DirectedGraph
+from graph_utils import DirectedGraph, load_options, load_graph
 import sys
+from array import array
 
 def DFS(G):
     """
     Chamar a DFS para computar os tempos de término para cada vértice.
 
-    Retorna: dicionário F com tempos de término de cada vértice
+    Trabalha sobre os índices densos de G (0..n-1) com vetores planos.
+    Retorna: vetor F com tempos de término de cada vértice
     """
-    vertices = G.get_all_vertices()
+    csr = G.csr
+    n = csr.num_rows
 
-    C = {v: False for v in vertices}
-    A = {v: None for v in vertices}
-    F = {v: float('inf') for v in vertices}
+    C = bytearray(n)
+    A = array('i', [-1]) * n
+    F = array('i', [0]) * n
 
     # Configurando o tempo de início
     tempo = [0]
-    
+
     # Para cada vértice não visitado
-    for u in G.get_all_vertices():
-        if C[u] == False:
-            DFS_Visit(G, u, C, A, F, tempo) # Visita recursivamente os vértices do grafo
-    
+    for u in range(n):
+        if not C[u]:
+            DFS_Visit(csr, u, C, A, F, tempo) # Visita recursivamente os vértices do grafo
+
     return F
 
 
-def DFS_Visit(G, v, C, A, F, tempo):
+def DFS_Visit(csr, v, C, A, F, tempo):
     """
     Visita recursivamente os vértices do grafo.
     """
-    C[v] = True
-    
+    C[v] = 1
+
     # Para cada vizinho de v
-    for u in G.vizinhos(v):
-        if C[u] == False:
+    for u in csr.targets[csr.offsets[v]:csr.offsets[v + 1]]:
+        if not C[u]:
             A[u] = v
-            DFS_Visit(G, u, C, A, F, tempo)
-    
+            DFS_Visit(csr, u, C, A, F, tempo)
+
     tempo[0] = tempo[0] + 1
     F[v] = tempo[0]
 
@@ -44,54 +47,46 @@ def DFS_adaptado(G_T, F):
     """
     DFS alterado para que ele execute o laço da linha 6,
     selecionando vértices em ordem decrescente de F (tempo de término).
-    
-    Retorna: componentes fortemente conexas
+
+    Retorna: componentes fortemente conexas (em índices densos)
     """
-    vertices = G_T.get_all_vertices()
-    
-    C = {v: False for v in vertices}
+    csr = G_T.csr
+    n = csr.num_rows
+
+    C = bytearray(n)
     componentes = []
-    
+
     # Ordena vértices por tempo de término decrescente
-    vertices_ordenados = sorted(G_T.get_all_vertices(), key=lambda v: F[v], reverse=True)
-    
+    vertices_ordenados = sorted(range(n), key=lambda v: F[v], reverse=True)
+
     # Para cada vértice em ordem decrescente de F
     for u in vertices_ordenados:
-        if C[u] == False:
+        if not C[u]:
             componente_atual = []
-            DFS_Visit_SCC(G_T, u, C, componente_atual)
+            DFS_Visit_SCC(csr, u, C, componente_atual)
             componentes.append(sorted(componente_atual))
-    
+
     return componentes
 
 
-def DFS_Visit_SCC(G, v, C, componente):
+def DFS_Visit_SCC(csr, v, C, componente):
     """
     DFS-Visit modificado para coletar vértices da componente fortemente conexa.
     """
-    C[v] = True
+    C[v] = 1
     componente.append(v)  # Adiciona à componente atual
-    
-    for u in G.vizinhos(v):
-        if C[u] == False:
-            DFS_Visit_SCC(G, u, C, componente)
+
+    for u in csr.targets[csr.offsets[v]:csr.offsets[v + 1]]:
+        if not C[u]:
+            DFS_Visit_SCC(csr, u, C, componente)
 
 def criar_grafo_transposto(G):
     """
     Cria o grafo transposto G^T (inverte todas as arestas).
     Corresponde às linhas 2-5 do Algoritmo 17.
+    O G^T reaproveita a CSR reversa do grafo em vez de copiar listas de adjacência.
     """
-    G_T = DirectedGraph()
-    G_T.vertices = G.vertices.copy()
-    G_T.vertex_count = G.vertex_count
-    G_T.edge_count = G.edge_count
-    
-    # Para cada (u, v) -> (v, u)
-    for u in G.get_all_vertices():
-        for v in G.vizinhos(u):
-            G_T.adjacency_list[v].append(u)
-    
-    return G_T
+    return G.transposto()
 
 
 def kosaraju_sharir(G):
@@ -100,7 +95,7 @@ def kosaraju_sharir(G):
     
     Input: um grafo dirigido não ponderado G = (V, A)
     
-    Retorna: lista de componentes fortemente conexas
+    Retorna: lista de componentes fortemente conexas (em índices densos)
     """
     # Chamar a DFS para computar os tempos de término para cada vértice
     F = DFS(G)
@@ -116,8 +111,9 @@ def kosaraju_sharir(G):
 
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 2:
-        print("Uso: python A2_1.py <arquivo_grafo>")
+        print("Uso: python A2_1.py <arquivo_grafo> [--workers N]")
         print("Exemplo: python A2_1.py grafo_dirigido.txt")
         return
     
@@ -125,14 +121,14 @@ def main():
     
     # Carrega o grafo dirigido
     graph = DirectedGraph()
-    graph.ler(arquivo)
+    load_graph(graph, arquivo, labels=False, **opcoes)
     
     # Encontra as componentes fortemente conexas usando Kosaraju-Sharir
     sccs = kosaraju_sharir(graph)
     
     # Imprime as SCCs
     for scc in sccs:
-        print(','.join(map(str, scc)))
+        print(','.join(map(str, graph.ids.to_ids(scc))))
 
 
 if __name__ == "__main__":
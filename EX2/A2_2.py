@@ -1,43 +1,46 @@
-from graph_utils import DirectedGraph
+from graph_utils import DirectedGraph, load_options, load_graph
 import sys
 
 def DFS_OT(G):
     """    
     Input: um grafo dirigido não ponderado G = (V, A)
     
-    Retorna: O - lista com os vértices ordenados topologicamente
+    Retorna: O - lista com os vértices (índices densos) ordenados topologicamente
     """
+    csr = G.csr
+
     # Configurando todos os vértices
-    C = {v: False for v in G.get_all_vertices()}
+    C = bytearray(csr.num_rows)
     O = [] # Lista com os vértices ordenados
     
-    # Para cada vértice não visitado
-    for u in sorted(G.get_all_vertices()):
+    # Para cada vértice não visitado (índices densos já seguem a ordem dos ids)
+    for u in range(csr.num_rows):
         if not C[u]:
-            DFS_Visit_OT(G, u, C, O)
+            DFS_Visit_OT(csr, u, C, O)
     
     # Reverse para obter a ordem topológica correta
     O.reverse()
     return O
 
-def DFS_Visit_OT(G, v, C, O):
+def DFS_Visit_OT(csr, v, C, O):
     """
-    Input: um grafo G = (V, E), um vértice v ∈ V,
-    dicionário C (Visitado), lista O (ordem topológica)
+    Input: a CSR do grafo G = (V, E), um vértice v ∈ V,
+    vetor C (Visitado), lista O (ordem topológica)
     """
-    C[v] = True
+    C[v] = 1
     
     # Ordena vizinhos para resultado determinístico
-    for u in sorted(G.vizinhos(v)):
-        if C[u] == False:
-            DFS_Visit_OT(G, u, C, O)
+    for u in sorted(csr.targets[csr.offsets[v]:csr.offsets[v + 1]]):
+        if not C[u]:
+            DFS_Visit_OT(csr, u, C, O)
 
     # Adiciona o vértice v no final da lista (será revertida depois)
     O.append(v)
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 2:
-        print("Uso: python A2_2.py <arquivo_grafo>")
+        print("Uso: python A2_2.py <arquivo_grafo> [--workers N]")
         print("Exemplo: python A2_2.py grafo_dag.txt")
         return
     
@@ -45,13 +48,13 @@ def main():
     
     # Carrega o grafo dirigido
     graph = DirectedGraph()
-    graph.ler(arquivo)
+    load_graph(graph, arquivo, **opcoes)
     
     # Realiza a ordenação topológica usando DFS-OT
     topo_order = DFS_OT(graph)
     
     # Imprime a ordem topológica usando os rótulos dos vértices
-    labels = [graph.rotulo(v) for v in topo_order]
+    labels = [graph.rotulo(v) for v in graph.ids.to_ids(topo_order)]
     print(' , '.join(labels))
 
 if __name__ == "__main__":
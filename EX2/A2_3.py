@@ -1,19 +1,20 @@
-from graph_utils import UndirectedGraph, UnionFind
+from graph_utils import UndirectedGraph, UnionFind, load_options, load_graph
 import sys
 
 def Kruskal(G):
     """
     Input: um grafo G = (V, E, w)
     
-    Retorna: A - conjunto de arestas da árvore geradora mínima
+    Retorna: A - conjunto de arestas (em índices densos) da árvore geradora mínima
     """
     A = []
     
-    # Inicializa a estrutura Union-Find com todos os vértices do grafo
-    dsu = UnionFind(G.get_all_vertices())
+    # Inicializa a estrutura Union-Find com todos os vértices (índices densos) do grafo
+    dsu = UnionFind(G.qtdVertices())
     
     # lista de arestas ordenadas por ordem crescente de peso
-    E_prime = sorted(G.edges, key=lambda edge: (edge[2], edge[0], edge[1]))
+    # (índices densos seguem a ordem dos ids, então o desempate é o mesmo)
+    E_prime = sorted(zip(*G.edge_arrays), key=lambda edge: (edge[2], edge[0], edge[1]))
     
     # Itera sobre as arestas ordenadas
     for u, v, w in E_prime:
@@ -32,7 +33,7 @@ def calcular_peso_total(A):
     return sum(w for u, v, w in A)
 
 
-def print_mst(A):
+def print_mst(A, ids):
     """
     Imprime a árvore geradora mínima no formato especificado.
     """
@@ -41,6 +42,7 @@ def print_mst(A):
     
     edge_strings = []
     for u, v, weight in A:
+        u, v = ids.id(u), ids.id(v)
         if u < v:
             edge_strings.append(f"{u}-{v}")
         else:
@@ -50,14 +52,15 @@ def print_mst(A):
 
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 2:
-        print("Uso: python A2_3.py <arquivo_grafo>")
+        print("Uso: python A2_3.py <arquivo_grafo> [--workers N]")
         return
     
     arquivo = sys.argv[1]
     
     graph = UndirectedGraph()
-    graph.ler(arquivo)
+    load_graph(graph, arquivo, labels=False, **opcoes)
     
     if graph.qtdVertices() == 0:
         print("Erro: O grafo está vazio.")
@@ -72,7 +75,7 @@ def main():
         print("Erro: O grafo não é conexo. Não é possível encontrar uma MST que cubra todos os vértices.")
         return
     
-    print_mst(A)
+    print_mst(A, graph.ids)
 
 if __name__ == "__main__":
     # TESTE: python .\EX2\A2_3.py .\EX2\test_mst_example.net
@@ -3,30 +3,59 @@ Atividade A3 - Exercício 1: Algoritmo de Edmonds-Karp
 Implementação do algoritmo de Edmonds-Karp para encontrar o fluxo máximo em um grafo dirigido.
 Baseado no algoritmo de Ford-Fulkerson usando BFS para encontrar caminhos aumentantes.
 """
-from graph_utils import DirectedWeightedGraph
+from graph_utils import DirectedWeightedGraph, CSR, load_options, load_graph
 from collections import deque
+from array import array
 import sys
 
 
-def bfs_caminho_aumentante(grafo, origem, destino, pai, fluxo_residual):
+def construir_rede_residual(grafo):
+    """
+    Monta a rede residual sobre os índices densos do grafo, sem alterar o grafo.
+    Cada arco k vira o par de entradas 2k (u -> v, capacidade c) e
+    2k + 1 (v -> u, capacidade 0); o par de uma entrada e é e ^ 1.
+
+    Retorna: (residual, destino_da_entrada, capacidade_residual), em que
+    residual é uma CSR cujas linhas listam os ids das entradas de cada vértice.
+    """
+    # Cópias: os vetores do grafo podem ser visões somente leitura de um snapshot
+    src, dst, cap = grafo.edge_arrays
+    src, dst, cap = array('i', src), array('i', dst), array('d', cap)
+    m = len(src)
+    caudas = array('i', bytes(8 * m))
+    cabecas = array('i', bytes(8 * m))
+    caudas[0::2] = cabecas[1::2] = src
+    cabecas[0::2] = caudas[1::2] = dst
+
+    capacidade_residual = array('d', bytes(16 * m))
+    capacidade_residual[0::2] = cap
+
+    residual = CSR.build(grafo.qtdVertices(), caudas, cabecas, edge_ids=array('i', range(2 * m)))
+    return residual, cabecas, capacidade_residual
+
+
+def bfs_caminho_aumentante(residual, cabecas, capacidade_residual, origem, destino, pai):
     """
     BFS para encontrar um caminho aumentante da origem ao destino.
     Retorna True se existe caminho, False caso contrário.
-    Armazena o caminho no dicionário pai.
+    Armazena no vetor pai a entrada usada para chegar a cada vértice.
     """
-    visitados = set()
+    offsets, entradas = residual.offsets, residual.edge_ids
+    visitados = bytearray(residual.num_rows)
     fila = deque([origem])
-    visitados.add(origem)
+    visitados[origem] = 1
     
     while fila:
         u = fila.popleft()
         
-        # Examina todos os vizinhos
-        for v, _ in grafo.adjacency_list[u]:
+        # Examina todas as entradas residuais de u
+        for pos in range(offsets[u], offsets[u + 1]):
+            e = entradas[pos]
+            v = cabecas[e]
             # Se não foi visitado e há capacidade residual
-            if v not in visitados and fluxo_residual[(u, v)] > 0:
-                visitados.add(v)
-                pai[v] = u
+            if not visitados[v] and capacidade_residual[e] > 0:
+                visitados[v] = 1
+                pai[v] = e
                 
                 if v == destino:
                     return True
@@ -42,67 +71,46 @@ def edmonds_karp(grafo, origem, destino):
     
     Args:
         grafo: DirectedWeightedGraph com capacidades
-        origem: vértice de origem
-        destino: vértice de destino
+        origem: vértice de origem (índice denso)
+        destino: vértice de destino (índice denso)
     
     Returns:
         max_flow: valor do fluxo máximo
     """
     # Inicializa o grafo residual com as capacidades originais
-    fluxo_residual = {}
-    
-    # Para cada aresta no grafo original
-    for u in grafo.get_all_vertices():
-        for v, cap in grafo.adjacency_list[u]:
-            fluxo_residual[(u, v)] = cap
-            # Aresta reversa (inicialmente 0)
-            if (v, u) not in fluxo_residual:
-                fluxo_residual[(v, u)] = 0
-    
-    # Adiciona arestas reversas ao grafo se não existirem
-    for u in grafo.get_all_vertices():
-        for v, _ in list(grafo.adjacency_list[u]):
-            # Verifica se existe aresta reversa
-            existe_reversa = False
-            for vizinho, _ in grafo.adjacency_list[v]:
-                if vizinho == u:
-                    existe_reversa = True
-                    break
-            
-            if not existe_reversa:
-                grafo.adjacency_list[v].append((u, 0))
+    residual, cabecas, capacidade_residual = construir_rede_residual(grafo)
     
-    pai = {}
+    pai = array('i', [-1]) * residual.num_rows
     fluxo_maximo = 0
     
     # Enquanto existe caminho aumentante
-    while bfs_caminho_aumentante(grafo, origem, destino, pai, fluxo_residual):
+    while bfs_caminho_aumentante(residual, cabecas, capacidade_residual, origem, destino, pai):
         # Encontra a capacidade mínima no caminho
         fluxo_caminho = float('inf')
         v = destino
         
         while v != origem:
-            u = pai[v]
-            fluxo_caminho = min(fluxo_caminho, fluxo_residual[(u, v)])
-            v = u
+            e = pai[v]
+            fluxo_caminho = min(fluxo_caminho, capacidade_residual[e])
+            v = cabecas[e ^ 1]
         
         # Atualiza as capacidades residuais
         v = destino
         while v != origem:
-            u = pai[v]
-            fluxo_residual[(u, v)] -= fluxo_caminho
-            fluxo_residual[(v, u)] += fluxo_caminho
-            v = u
+            e = pai[v]
+            capacidade_residual[e] -= fluxo_caminho
+            capacidade_residual[e ^ 1] += fluxo_caminho
+            v = cabecas[e ^ 1]
         
         fluxo_maximo += fluxo_caminho
-        pai.clear()
     
     return fluxo_maximo
 
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 4:
-        print("Uso: python A3_1.py <arquivo_grafo> <origem> <destino>")
+        print("Uso: python A3_1.py <arquivo_grafo> <origem> <destino> [--workers N]")
         print("Exemplo: python A3_1.py grafo_fluxo.txt 1 6")
         return
     
@@ -112,10 +120,14 @@ def main():
     
     # Carrega o grafo dirigido ponderado
     grafo = DirectedWeightedGraph()
-    grafo.ler(arquivo)
+    load_graph(grafo, arquivo, labels=False, **opcoes)
+    
+    if origem not in grafo.ids or destino not in grafo.ids:
+        print("Erro: origem ou destino não existe no grafo.")
+        return
     
     # Calcula o fluxo máximo usando Edmonds-Karp
-    fluxo_maximo = edmonds_karp(grafo, origem, destino)
+    fluxo_maximo = edmonds_karp(grafo, grafo.ids.index(origem), grafo.ids.index(destino))
     
     # Imprime o resultado
     print(fluxo_maximo)
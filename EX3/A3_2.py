@@ -4,16 +4,22 @@ Implementação do algoritmo de Hopcroft-Karp para encontrar o emparelhamento m
 em um grafo bipartido não-dirigido e não-ponderado.
 """
 
-from graph_utils import BipartiteGraph
+from graph_utils import BipartiteGraph, load_options, load_graph
 from collections import deque
+from array import array
 import sys
 
 
+INF = float('inf')
+
+
 def bfs_hopcroft_karp(grafo, pair_U, pair_V, dist, NIL):
     """
     BFS para construir níveis no grafo de emparelhamento.
     Retorna True se existe um caminho aumentante.
     """
+    csr = grafo.csr
+    offsets, targets = csr.offsets, csr.targets
     fila = deque()
     
     # Adiciona todos os vértices livres de U à fila
@@ -22,20 +28,21 @@ def bfs_hopcroft_karp(grafo, pair_U, pair_V, dist, NIL):
             dist[u] = 0
             fila.append(u)
         else:
-            dist[u] = float('inf')
+            dist[u] = INF
     
-    dist[NIL] = float('inf')
+    dist[NIL] = INF
     
     while fila:
         u = fila.popleft()
         
         if dist[u] < dist[NIL]:
-            for v in grafo.vizinhos(u):
-                if dist[pair_V[v]] == float('inf'):
-                    dist[pair_V[v]] = dist[u] + 1
-                    fila.append(pair_V[v])
+            for pos in range(offsets[u], offsets[u + 1]):
+                w = pair_V[targets[pos]]
+                if dist[w] == INF:
+                    dist[w] = dist[u] + 1
+                    fila.append(w)
     
-    return dist[NIL] != float('inf')
+    return dist[NIL] != INF
 
 
 def dfs_hopcroft_karp(grafo, u, pair_U, pair_V, dist, NIL):
@@ -44,14 +51,16 @@ def dfs_hopcroft_karp(grafo, u, pair_U, pair_V, dist, NIL):
     Retorna True se encontrou caminho aumentante.
     """
     if u != NIL:
-        for v in grafo.vizinhos(u):
+        csr = grafo.csr
+        for pos in range(csr.offsets[u], csr.offsets[u + 1]):
+            v = csr.targets[pos]
             if dist[pair_V[v]] == dist[u] + 1:
                 if dfs_hopcroft_karp(grafo, pair_V[v], pair_U, pair_V, dist, NIL):
                     pair_V[v] = u
                     pair_U[u] = v
                     return True
         
-        dist[u] = float('inf')
+        dist[u] = INF
         return False
     
     return True
@@ -62,23 +71,24 @@ def hopcroft_karp(grafo):
     Algoritmo de Hopcroft-Karp para encontrar emparelhamento máximo.
     
     Args:
-        grafo: BipartiteGraph com duas partições definidas
+        grafo: BipartiteGraph com duas partições definidas (índices densos)
     
     Returns:
         matching: número de arestas no emparelhamento máximo
-        pairs: dicionário com os pares do emparelhamento
+        pairs: vetor com o par de cada vértice (NIL = grafo.qtdVertices() se livre)
     """
-    # NIL representa vértice nulo
-    NIL = 0
+    n = grafo.qtdVertices()
+
+    # NIL representa vértice nulo: o índice n, fora do intervalo 0..n-1
+    # dos vértices, então não colide com nenhum vértice real
+    NIL = n
     
-    # Inicializa os emparelhamentos
-    pair_U = {u: NIL for u in grafo.partition1}
-    pair_V = {v: NIL for v in grafo.partition2}
-    pair_U[NIL] = NIL
-    pair_V[NIL] = NIL
+    # Inicializa os emparelhamentos (vetores indexados por vértice, mais a posição NIL)
+    pair_U = array('i', [NIL]) * (n + 1)
+    pair_V = array('i', [NIL]) * (n + 1)
     
     # Inicializa distâncias
-    dist = {}
+    dist = [INF] * (n + 1)
     
     matching = 0
     
@@ -94,17 +104,20 @@ def hopcroft_karp(grafo):
 
 def detectar_biparticao(grafo):
     """
-    Detecta se o grafo é bipartido e retorna as duas partições.
+    Detecta se o grafo é bipartido e retorna as duas partições (em índices densos).
     Usa coloração com BFS.
     """
-    cor = {}
+    csr = grafo.csr
+    offsets, targets = csr.offsets, csr.targets
+    n = csr.num_rows
+
+    SEM_COR = 2
+    cor = bytearray([SEM_COR]) * n
     partition1 = []
     partition2 = []
     
-    vertices = grafo.get_all_vertices()
-    
-    for start in vertices:
-        if start in cor:
+    for start in range(n):
+        if cor[start] != SEM_COR:
             continue
         
         fila = deque([start])
@@ -113,14 +126,15 @@ def detectar_biparticao(grafo):
         while fila:
             u = fila.popleft()
             
-            for v in grafo.vizinhos(u):
-                if v not in cor:
+            for pos in range(offsets[u], offsets[u + 1]):
+                v = targets[pos]
+                if cor[v] == SEM_COR:
                     cor[v] = 1 - cor[u]
                     fila.append(v)
                 elif cor[v] == cor[u]:
                     return None, None  # Não é bipartido
     
-    for v in vertices:
+    for v in range(n):
         if cor[v] == 0:
             partition1.append(v)
         else:
@@ -130,8 +144,9 @@ def detectar_biparticao(grafo):
 
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 2:
-        print("Uso: python A3_2.py <arquivo_grafo>")
+        print("Uso: python A3_2.py <arquivo_grafo> [--workers N]")
         print("Exemplo: python A3_2.py grafo_bipartido.txt")
         return
     
@@ -139,7 +154,7 @@ def main():
     
     # Carrega o grafo
     grafo = BipartiteGraph()
-    grafo.ler(arquivo)
+    load_graph(grafo, arquivo, labels=False, **opcoes)
     
     # Detecta a bipartição
     partition1, partition2 = detectar_biparticao(grafo)
@@ -157,10 +172,12 @@ def main():
     print(max_matching)
     
     # Imprime as arestas do emparelhamento (segunda linha)
+    NIL = grafo.qtdVertices()
     edges = []
     for u in sorted(grafo.partition1):
         v = pairs[u]
-        if v != 0:  # NIL = 0
+        if v != NIL:
+            u, v = grafo.ids.id(u), grafo.ids.id(v)
             # Garante ordem crescente
             if u < v:
                 edges.append(f"{u}-{v}")
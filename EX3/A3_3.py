@@ -4,7 +4,8 @@ Implementação de algoritmo de coloração de vértices usando abordagem gulosa
 Encontra uma coloração válida e imprime o número mínimo de cores e a coloração de cada vértice.
 """
 
-from graph_utils import UndirectedGraph
+from graph_utils import UndirectedGraph, load_options, load_graph
+from array import array
 import sys
 
 
@@ -18,32 +19,37 @@ def coloracao_lawler(grafo):
     
     Returns:
         num_cores: número de cores utilizadas
-        cores: dicionário mapeando vértice -> cor
+        cores: vetor indexado pelos índices densos do grafo (cor 0 = sem cor)
     """
-    # Inicializa o dicionário de cores
-    cores = {}
+    csr = grafo.csr
+    offsets, targets = csr.offsets, csr.targets
+    n = csr.num_rows
+
+    # Inicializa o vetor de cores
+    cores = array('i', [0]) * n
+
+    # marca[c] == v indica que a cor c já é usada por algum vizinho de v
+    marca = array('i', [-1]) * (n + 2)
     
     # Ordena vértices por grau decrescente (heurística gulosa)
-    vertices = sorted(grafo.get_all_vertices(), 
-                     key=lambda v: grafo.grau(v), 
+    vertices = sorted(range(n),
+                     key=lambda v: offsets[v + 1] - offsets[v],
                      reverse=True)
     
     for vertice in vertices:
-        # Encontra as cores usadas pelos vizinhos
-        cores_vizinhos = set()
-        for vizinho in grafo.vizinhos(vertice):
-            if vizinho in cores:
-                cores_vizinhos.add(cores[vizinho])
+        # Marca as cores usadas pelos vizinhos
+        for pos in range(offsets[vertice], offsets[vertice + 1]):
+            marca[cores[targets[pos]]] = vertice
         
         # Atribui a menor cor disponível (começando de 1)
         cor = 1
-        while cor in cores_vizinhos:
+        while marca[cor] == vertice:
             cor += 1
         
         cores[vertice] = cor
     
     # Número de cores usadas
-    num_cores = max(cores.values()) if cores else 0
+    num_cores = max(cores) if n else 0
     
     return num_cores, cores
 
@@ -52,16 +58,18 @@ def verificar_coloracao(grafo, cores):
     """
     Verifica se a coloração é válida (vértices adjacentes têm cores diferentes).
     """
-    for u in grafo.get_all_vertices():
-        for v in grafo.vizinhos(u):
-            if cores[u] == cores[v]:
+    csr = grafo.csr
+    for u in range(csr.num_rows):
+        for pos in range(csr.offsets[u], csr.offsets[u + 1]):
+            if cores[u] == cores[csr.targets[pos]]:
                 return False
     return True
 
 
 def main():
+    opcoes = load_options(sys.argv)
     if len(sys.argv) < 2:
-        print("Uso: python A3_3.py <arquivo_grafo>")
+        print("Uso: python A3_3.py <arquivo_grafo> [--workers N]")
         print("Exemplo: python A3_3.py grafo_coloracao.txt")
         return
     
@@ -69,7 +77,7 @@ def main():
     
     # Carrega o grafo não-dirigido
     grafo = UndirectedGraph()
-    grafo.ler(arquivo)
+    load_graph(grafo, arquivo, labels=False, **opcoes)
     
     # Calcula a coloração usando algoritmo de Lawler
     num_cores, cores = coloracao_lawler(grafo)
@@ -84,8 +92,8 @@ def main():
     
     # Imprime a coloração de cada vértice (segunda linha)
     # Formato: cor1, cor2, cor3, ...
-    vertices_ordenados = sorted(grafo.get_all_vertices())
-    coloracao_str = ", ".join(str(cores[v]) for v in vertices_ordenados)
+    # Índices densos seguem a ordem crescente dos ids
+    coloracao_str = ", ".join(map(str, cores))
     print(coloracao_str)
 
 
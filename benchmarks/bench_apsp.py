@@ -0,0 +1,55 @@
+"""
+Compares the Floyd-Warshall engines of graph_core.apsp: the pure Python
+triple loop (only up to --python-max vertices) and the NumPy matrix in
+float64, float32 and float64 with predecessors, checking that float64
+matches the Python loop.
+
+    python benchmarks/bench_apsp.py [--sizes N ...] [--python-max N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from generators import load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.apsp import floyd_warshall, floyd_warshall_python, np
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 5000])
+    parser.add_argument('--python-max', type=int, default=500)
+    args = parser.parse_args()
+    if np is None:
+        sys.exit("bench_apsp.py needs NumPy")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            g = load(Graph, write_pajek(os.path.join(tmp, f"input{n}.net"), n, power_law_edges(n)))
+            print(f"power-law: {n} vertices, {g.qtdArestas()} edges")
+            expected = None
+            if n <= args.python_max:
+                start = time.perf_counter()
+                expected = floyd_warshall_python(g.csr)
+                python_seconds = time.perf_counter() - start
+                print(f"  python               {python_seconds:7.2f} s")
+            for dtype, predecessors in (('float64', False), ('float32', False), ('float64', True)):
+                start = time.perf_counter()
+                dist, pred = floyd_warshall(g.csr, dtype, predecessors)
+                seconds = time.perf_counter() - start
+                megabytes = (dist.nbytes + (pred.nbytes if pred is not None else 0)) / 2 ** 20
+                if expected is None or dtype != 'float64':
+                    status = ''
+                else:
+                    status = 'ok' if dist.tolist() == expected else 'MISMATCH'
+                speedup = f"x{python_seconds / seconds:7.1f}" if expected is not None else ''
+                label = dtype + (' + pred' if predecessors else '')
+                print(f"  numpy {label:14s} {seconds:7.2f} s  {megabytes:9.1f} MB  {speedup}  {status}")
+                del dist, pred
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares the BFS of EX1/A1_2.py before and after the level-synchronous
+engine on power-law and grid graphs, checking that the levels match.
+
+    python benchmarks/bench_bfs.py [--vertices N] [--sources K]
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import deque, defaultdict
+
+from generators import grid_edges, load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.bfs import bfs_levels, np
+
+
+def queue_bfs(csr, s):
+    """The previous A1_2.bfs: one deque entry per vertex, each row sorted when dequeued"""
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(csr.num_rows)
+    queue = deque([(s, 0)])
+    levels = defaultdict(list)
+    visited[s] = 1
+    while queue:
+        vertex, level = queue.popleft()
+        levels[level].append(vertex)
+        for neighbor in sorted(targets[offsets[vertex]:offsets[vertex + 1]]):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append((neighbor, level + 1))
+    return {level: sorted(vertices) for level, vertices in levels.items()}
+
+
+def timed(run, sources):
+    start = time.perf_counter()
+    results = [run(s) for s in sources]
+    return (time.perf_counter() - start) / len(sources), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--sources', type=int, default=5)
+    args = parser.parse_args()
+
+    side = int(args.vertices ** 0.5)
+    inputs = [
+        ('power-law', args.vertices, power_law_edges(args.vertices)),
+        ('grid', side * side, grid_edges(side, side)),
+    ]
+    engines = [
+        ('queue (before)', lambda csr: lambda s: queue_bfs(csr, s)),
+        ('top-down only', lambda csr: lambda s: dict(bfs_levels(csr, s, direction_optimizing=False, use_numpy=False))),
+        ('direction-optimizing', lambda csr: lambda s: dict(bfs_levels(csr, s, use_numpy=False))),
+    ]
+    if np is not None:
+        engines.append(('direction-optimizing, numpy', lambda csr: lambda s: dict(bfs_levels(csr, s, use_numpy=True))))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, n, edges in inputs:
+            g = load(Graph, write_pajek(os.path.join(tmp, f"{name}.net"), n, edges))
+            csr = g.csr
+            sources = list(range(0, n, max(1, n // args.sources)))[:args.sources]
+            print(f"{name}: {n} vertices, {g.qtdArestas()} edges, {len(sources)} sources")
+            expected = None
+            for label, engine in engines:
+                seconds, results = timed(engine(csr), sources)
+                if expected is None:
+                    expected, baseline = results, seconds
+                status = 'ok' if results == expected else 'MISMATCH'
+                print(f"  {label:30s} {seconds * 1000:9.1f} ms/source  x{baseline / seconds:5.2f}  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Update latency of graph_core.dynamic.DynamicSSSP against recomputing the
+Dijkstra of EX1/A1_4.py from scratch, for each kind of edge change,
+checking the repaired distances against the recomputed ones. The tree is
+kept through shortest_path_tree(), so each repair goes through
+graph.cached(). The recompute timer starts after the graph's arrays are
+compacted, which the first read of graph.csr after a change does in O(m).
+
+    python benchmarks/bench_dynamic.py [--vertices N] [--updates K]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from generators import load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.dynamic import shortest_path_tree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'EX1'))
+from A1_4 import dijkstra  # noqa: E402
+
+
+def random_change(g, tree, kind, rng):
+    """
+    A change of the given kind on a random edge of g, or on a random edge
+    of the shortest-path tree for the '-tree' kinds, as an apply_delta() tuple
+    """
+    src, dst, wt = g.edge_arrays
+    if kind.endswith('-tree'):
+        v = rng.choice([v for v, parent in enumerate(tree.predecessors) if parent >= 0])
+        u = tree.predecessors[v]
+        weight = g.peso(g.ids.id(u), g.ids.id(v))
+        return ('weight', g.ids.id(u), g.ids.id(v), weight * 2 + 100) if kind == 'increase-tree' \
+            else ('remove', g.ids.id(u), g.ids.id(v))
+    k = rng.randrange(len(src))
+    u, v = g.ids.id(src[k]), g.ids.id(dst[k])
+    if kind == 'increase':
+        return ('weight', u, v, wt[k] * 2 + rng.randint(1, 100))
+    if kind == 'decrease':
+        return ('weight', u, v, wt[k] / 2)
+    if kind == 'insert':
+        return ('add', rng.choice(g.ids.ids), rng.choice(g.ids.ids), rng.randint(1, 100))
+    return ('remove', u, v)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--updates', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    n = args.vertices
+    with tempfile.TemporaryDirectory() as tmp:
+        g = load(Graph, write_pajek(os.path.join(tmp, 'input.net'), n, power_law_edges(n)))
+        print(f"power-law: {n} vertices, {g.qtdArestas()} edges, {args.updates} updates per kind")
+        tree = shortest_path_tree(g, 0, dijkstra)
+        for kind in ('increase', 'decrease', 'insert', 'delete', 'increase-tree', 'delete-tree'):
+            repair = full = 0.0
+            mismatches = 0
+            for _ in range(args.updates):
+                g.apply_delta([random_change(g, tree, kind, rng)])
+                start = time.perf_counter()
+                tree = shortest_path_tree(g, 0, dijkstra)
+                repair += time.perf_counter() - start
+                g.csr  # compacts the arrays outside the timer
+                start = time.perf_counter()
+                distances, _ = dijkstra(g, 0)
+                full += time.perf_counter() - start
+                mismatches += tree.distances != distances
+            status = 'ok' if not mismatches else f'{mismatches} MISMATCHES'
+            print(f"  {kind:13s} repair {repair / args.updates * 1000:9.2f} ms  "
+                  f"recompute {full / args.updates * 1000:9.2f} ms  x{full / repair:8.1f}  {status}")
+
+
+if __name__ == '__main__':
+    main()
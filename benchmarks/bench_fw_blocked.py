@@ -0,0 +1,50 @@
+"""
+Speedup of graph_core.apsp.floyd_warshall_blocked over floyd_warshall as
+the process count grows, for each tile size, checking that the distances
+match.
+
+    python benchmarks/bench_fw_blocked.py [--vertices N] [--tiles T ...] [--processes P ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from generators import load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.apsp import floyd_warshall, floyd_warshall_blocked, np
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=2000)
+    parser.add_argument('--tiles', type=int, nargs='+', default=[128, 256, 512])
+    parser.add_argument('--processes', type=int, nargs='+')
+    args = parser.parse_args()
+    if np is None:
+        sys.exit("bench_fw_blocked.py needs NumPy")
+
+    cores = os.cpu_count() or 1
+    counts = args.processes or sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    n = args.vertices
+    with tempfile.TemporaryDirectory() as tmp:
+        g = load(Graph, write_pajek(os.path.join(tmp, 'input.net'), n, power_law_edges(n)))
+        print(f"power-law: {n} vertices, {g.qtdArestas()} edges, {cores} cores")
+        start = time.perf_counter()
+        expected, _ = floyd_warshall(g.csr)
+        baseline = time.perf_counter() - start
+        print(f"  unblocked                  {baseline:8.2f} s")
+        for tile in args.tiles:
+            for processes in counts:
+                start = time.perf_counter()
+                dist, _ = floyd_warshall_blocked(g.csr, tile=tile, processes=processes)
+                seconds = time.perf_counter() - start
+                status = 'ok' if np.array_equal(dist, expected) else 'MISMATCH'
+                print(f"  tile {tile:4d}, {processes:2d} processes  {seconds:8.2f} s  x{baseline / seconds:5.2f}  {status}")
+                del dist
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Throughput of graph_core.multisource.run_sources with the Dijkstra of
+EX1/A1_4.py as the process count grows, checking that the trees match.
+
+    python benchmarks/bench_multisource.py [--vertices N] [--sources K] [--processes P ...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from generators import load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.multisource import run_sources
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'EX1'))
+from A1_4 import dijkstra  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--sources', type=int, default=32)
+    parser.add_argument('--processes', type=int, nargs='+')
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    counts = args.processes or sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    n = args.vertices
+    with tempfile.TemporaryDirectory() as tmp:
+        g = load(Graph, write_pajek(os.path.join(tmp, 'input.net'), n, power_law_edges(n)))
+        sources = list(range(0, n, max(1, n // args.sources)))[:args.sources]
+        print(f"power-law: {n} vertices, {g.qtdArestas()} edges, {len(sources)} sources, {cores} cores")
+        expected = None
+        for processes in counts:
+            start = time.perf_counter()
+            results = list(run_sources(g, sources, dijkstra, processes))
+            seconds = time.perf_counter() - start
+            if expected is None:
+                expected, baseline = results, seconds
+            status = 'ok' if results == expected else 'MISMATCH'
+            print(f"  {processes:3d} processes {seconds:8.2f} s  {len(sources) / seconds:8.2f} sources/s  "
+                  f"x{baseline / seconds:5.2f}  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares the priority queues of graph_core.heaps under the Dijkstra of
+EX1/A1_4.py on integer and float weights, checking that the trees match.
+
+    python benchmarks/bench_queues.py [--vertices N] [--sources K]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from generators import grid_edges, load, power_law_edges, write_pajek
+
+from graph_core import Graph
+from graph_core.heaps import QUEUES, choose_queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'EX1'))
+from A1_4 import dijkstra  # noqa: E402
+
+
+def with_float_weights(edges, seed=1):
+    rng = random.Random(seed)
+    return [(u, v, w + round(rng.random(), 3)) for u, v, w in edges]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--sources', type=int, default=3)
+    args = parser.parse_args()
+
+    n = args.vertices
+    side = int(n ** 0.5)
+    dense = max(2, n // 20)
+    inputs = [
+        ('power-law, weights 1..100', n, power_law_edges(n)),
+        ('power-law, weights 1..10^6', n, power_law_edges(n, max_weight=10 ** 6)),
+        ('grid, weights 1..100', side * side, grid_edges(side, side)),
+        ('power-law, float weights', n, with_float_weights(power_law_edges(n))),
+        ('dense power-law, float weights', dense, with_float_weights(power_law_edges(dense, m=40))),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for k, (name, vertices, edges) in enumerate(inputs):
+            g = load(Graph, write_pajek(os.path.join(tmp, f"input{k}.net"), vertices, edges))
+            sources = list(range(0, vertices, max(1, vertices // args.sources)))[:args.sources]
+            print(f"{name}: {vertices} vertices, {g.qtdArestas()} edges, {len(sources)} sources, "
+                  f"auto -> {choose_queue(g.weight_stats)}")
+            expected = None
+            for queue in QUEUES:
+                stats = {}
+                start = time.perf_counter()
+                try:
+                    results = [dijkstra(g, s, queue, stats) for s in sources]
+                except ValueError:
+                    continue  # the weights do not suit this queue
+                seconds = (time.perf_counter() - start) / len(sources)
+                if expected is None:
+                    expected, baseline = results, seconds
+                status = 'ok' if results == expected else 'MISMATCH'
+                print(f"  {queue:6s} {seconds * 1000:9.1f} ms/source  x{baseline / seconds:5.2f}  "
+                      f"pushes {stats['pushes']:8d}  pops {stats['pops']:8d}  peak {stats['peak']:8d}  {status}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Synthetic Pajek inputs for the benchmarks"""
+import os
+import random
+import sys
+
+# The graph classes live in the shared graph_core package at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+def write_pajek(path, n, edges, section='*edges'):
+    """Writes vertices 1..n and the (u, v, weight) edges to path"""
+    with open(path, 'w') as f:
+        f.write(f"*vertices {n}\n")
+        for v in range(1, n + 1):
+            f.write(f'{v} "{v}"\n')
+        f.write(f"{section}\n")
+        f.writelines(f"{u} {v} {w:g}\n" for u, v, w in edges)
+    return path
+
+
+def power_law_edges(n, m=4, seed=1, max_weight=100):
+    """Preferential attachment (Barabasi-Albert): each new vertex links to m earlier ones"""
+    rng = random.Random(seed)
+    ends = list(range(1, m + 2))  # every edge endpoint so far, sampled for attachment
+    edges = [(u, v, rng.randint(1, max_weight)) for u in range(1, m + 2) for v in range(u + 1, m + 2)]
+    for u in range(m + 2, n + 1):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(rng.choice(ends))
+        for v in sorted(chosen):
+            edges.append((u, v, rng.randint(1, max_weight)))
+            ends += (u, v)
+    return edges
+
+
+def grid_edges(rows, cols, seed=1, max_weight=100):
+    """rows x cols 4-neighbour grid, vertex (r, c) = r * cols + c + 1"""
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c + 1
+            if c + 1 < cols:
+                edges.append((v, v + 1, rng.randint(1, max_weight)))
+            if r + 1 < rows:
+                edges.append((v, v + cols, rng.randint(1, max_weight)))
+    return edges
+
+
+def load(graph_class, path):
+    """Loads path into a new graph without touching snapshots"""
+    g = graph_class()
+    g.ler(path, snapshot=False, labels=False)
+    return g
@@ -0,0 +1,20 @@
+"""
+Shared graph core for the INE5413 activities.
+
+Every graph class keeps its adjacency in compressed sparse row (CSR) form:
+contiguous offset, target and weight arrays instead of per-vertex lists of
+tuples. The EX1, EX2 and EX3 graph_utils modules re-export these classes.
+"""
+from .csr import CSR
+from .idmap import IdMap
+from .labels import LabelTable
+from .graph import (
+    CSRGraph,
+    Graph,
+    DirectedGraph,
+    DirectedWeightedGraph,
+    UndirectedGraph,
+    BipartiteGraph,
+)
+from .errors import GraphError, PajekFormatError
+from .pajek import read_pajek
@@ -0,0 +1,436 @@
+"""
+All-pairs shortest paths over dense distance matrices.
+
+floyd_warshall() keeps the n x n distances in one contiguous NumPy array
+of float64 (or float32, at half the memory, in exchange for 24-bit
+mantissas). Each k step is a single vectorized
+minimum(D, D[:, k] + D[k, :]). The optional predecessor matrix P holds in
+P[i, j] the vertex before j on the shortest path from i, -1 for none.
+It is updated with the same mask as D. In float64, the matrix gets the
+exact sums and comparisons of the pure Python triple loop,
+floyd_warshall_python(), which runs when NumPy is not installed.
+
+The initial matrix holds the lightest entry between each pair, and 0 on
+the diagonal unless a self-loop is negative. This is the graph the
+Dijkstra-based methods of all_pairs() see, so all methods agree on graphs
+with parallel edges.
+
+floyd_warshall_blocked() runs the same recurrence over tiles of tile x
+tile entries, so that each step works on data that fits in cache. For
+each block K of tile pivots it closes the diagonal tile (K, K), then the
+tiles of row K and of column K against it, then every other tile (I, J)
+against (I, K) and (K, J). The tiles of that last phase are independent.
+With several processes they are handed out by row band to a pool whose
+workers map the matrix from a shared memory block. The result is the
+same set of shortest-path lengths, but sums are grouped differently:
+with non-integer weights an entry can differ from floyd_warshall()'s in
+the last bits. The blocked order can also leave a cycle of tight
+predecessors around a zero-weight cycle. So predecessors over a graph
+whose smallest weight is not positive come from the unblocked
+floyd_warshall() instead.
+
+all_pairs() picks the algorithm from the graph. Sparse graphs with
+non-negative weights get one Dijkstra per source. Graphs with negative
+weights get Johnson's reweighting: Bellman-Ford potentials h make every
+weight w(u, v) + h[u] - h[v] non-negative, one Dijkstra runs per source
+over the reweighted graph, and d(u, v) = d'(u, v) - h[u] + h[v]. Dense
+graphs get floyd_warshall_blocked(). The choice is the cheapest of
+estimate_costs(), which prices each algorithm in seconds from its
+operation count: n^3 for Floyd-Warshall and n (n + m) log2 n for the
+Dijkstras. The Bellman-Ford run is charged as one more Dijkstra, since
+its worst case of n passes is rare on real graphs.
+"""
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .csr import CSR
+from .heaps import weight_stats
+from .multisource import SharedGraph, run_sources
+
+DTYPES = ('float64', 'float32')
+DIJKSTRA = 'dijkstra'
+JOHNSON = 'johnson'
+FLOYD_WARSHALL = 'floyd-warshall'
+METHODS = (DIJKSTRA, JOHNSON, FLOYD_WARSHALL)
+# Default tile side of floyd_warshall_blocked(): three float64 tiles fit in a 2 MB cache
+TILE = 256
+# Seconds per unit of work in estimate_costs(), measured on this repo's engines
+FLOYD_WARSHALL_NUMPY_COST = 2.7e-9   # per relaxation of the vectorized matrix
+FLOYD_WARSHALL_PYTHON_COST = 5.2e-8  # per relaxation of the pure Python loop
+DIJKSTRA_COST = 5e-8                 # per (vertex + entry) x log2 n of a Dijkstra
+# Estimated seconds below which all_pairs() runs the Dijkstras in this process unless told otherwise
+POOL_MIN_SECONDS = 1.0
+INF = float('inf')
+
+_matrices = None  # the (dist, pred) views of a worker process
+_blocks = []      # its attached shared memory blocks, kept open for the views
+
+
+def floyd_warshall(csr, dtype='float64', predecessors=False):
+    """
+    Distances between all pairs of dense vertices of csr (weights of 1 when
+    it has none) as an n x n NumPy array of dtype, plus the predecessor
+    matrix (int32) when predecessors is True, else None. Needs NumPy.
+    """
+    if np is None:
+        raise RuntimeError("floyd_warshall() needs NumPy; use floyd_warshall_python()")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+    dist, pred = initial_matrices(csr, dtype, predecessors)
+    n = len(dist)
+    through = np.empty_like(dist)  # D[:, k] + D[k, :], reused by every step
+    better = np.empty((n, n), dtype=bool) if predecessors else None
+    for k in range(n):
+        column = dist[:, k].copy()
+        row = dist[k].copy()
+        np.add(column[:, None], row[None, :], out=through)
+        if predecessors:
+            np.less(through, dist, out=better)
+            np.copyto(pred, pred[k][None, :], where=better)
+        np.minimum(dist, through, out=dist)
+    return dist, pred
+
+
+def floyd_warshall_blocked(csr, dtype='float64', predecessors=False, tile=TILE, processes=None):
+    """
+    floyd_warshall() by tiles (see the module docstring), with the last
+    phase of each pivot block spread over processes workers (one per core
+    by default). Returns (dist, pred) like floyd_warshall().
+    """
+    if np is None:
+        raise RuntimeError("floyd_warshall_blocked() needs NumPy; use floyd_warshall_python()")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+    if tile < 1:
+        raise ValueError(f"tile must be positive, got {tile!r}")
+    if predecessors and csr.weights is not None and len(csr.weights) and min(csr.weights) <= 0:
+        return floyd_warshall(csr, dtype, predecessors)
+    dist, pred = initial_matrices(csr, dtype, predecessors)
+    processes = min(processes or os.cpu_count() or 1, -(-len(dist) // tile) - 1)
+    if processes <= 1:
+        close_pivot_blocks(dist, pred, tile)
+        return dist, pred
+
+    blocks = []
+    try:
+        spec = []
+        shared = []
+        for matrix in (dist, pred):
+            if matrix is None:
+                spec.append(None)
+                continue
+            block = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+            blocks.append(block)
+            view = np.ndarray(matrix.shape, matrix.dtype, buffer=block.buf)
+            view[:] = matrix
+            shared.append(view)
+            spec.append(('shm', block.name, matrix.shape, matrix.dtype.str))
+        dist = pred = None
+        views = shared + [None] * (2 - len(shared))
+        with matrix_pool(spec, processes) as pool:
+            close_pivot_blocks(views[0], views[1], tile, pool)
+        dist = views[0].copy()
+        pred = views[1].copy() if views[1] is not None else None
+    finally:
+        views = shared = view = None  # the arrays must go before their blocks close
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return dist, pred
+
+
+def close_pivot_blocks(dist, pred, tile, pool=None, first=0, done=None):
+    """
+    Runs the three phases of floyd_warshall_blocked() over the matrices
+    dist and pred (or None) for pivot blocks first, first + 1, and so on.
+    Phase three runs on pool when given, a matrix_pool() over the same
+    matrices. done(k), if given, is called after each block k.
+    """
+    bands = -(-len(dist) // tile)
+    for k in range(first, bands):
+        _close_pivots(dist, pred, k, tile)
+        others = [i for i in range(bands) if i != k]
+        if pool is None:
+            for i in others:
+                _close_band(dist, pred, i, k, tile)
+        else:
+            for _ in pool.map(_close_shared_band, others, [k] * len(others), [tile] * len(others)):
+                pass
+        if done is not None:
+            done(k)
+
+
+def matrix_pool(spec, processes):
+    """
+    ProcessPoolExecutor whose workers map the distance and predecessor
+    matrices described by spec, a pair of entries that are each None,
+    ('shm', block name, shape, dtype) or ('file', path, offset, shape, dtype)
+    """
+    return ProcessPoolExecutor(processes, initializer=_attach, initargs=(spec,))
+
+
+def _close_pivots(dist, pred, k, tile):
+    """Phases one and two for pivot block k: the diagonal tile, then the rest of its row and column"""
+    n = len(dist)
+    pivots = slice(k * tile, min((k + 1) * tile, n))
+    _update(dist, pred, pivots, pivots, pivots)
+    for j in range(0, n, tile):
+        if j != pivots.start:
+            others = slice(j, min(j + tile, n))
+            _update(dist, pred, pivots, others, pivots)
+            _update(dist, pred, others, pivots, pivots)
+
+
+def _close_band(dist, pred, i, k, tile):
+    """Phase three for pivot block k over the tiles of row band i outside column k"""
+    n = len(dist)
+    rows = slice(i * tile, min((i + 1) * tile, n))
+    pivots = slice(k * tile, min((k + 1) * tile, n))
+    for j in range(0, n, tile):
+        if j != pivots.start:
+            _update(dist, pred, rows, slice(j, min(j + tile, n)), pivots)
+
+
+def _update(dist, pred, rows, columns, pivots):
+    """Relaxes tile (rows, columns) through each pivot in turn, as floyd_warshall() does the matrix"""
+    target = dist[rows, columns]
+    through = np.empty_like(target)
+    better = np.empty(target.shape, dtype=bool) if pred is not None else None
+    target_pred = pred[rows, columns] if pred is not None else None
+    for k in range(pivots.start, pivots.stop):
+        column = dist[rows, k].copy()
+        row = dist[k, columns].copy()
+        np.add(column[:, None], row[None, :], out=through)
+        if pred is not None:
+            np.less(through, target, out=better)
+            np.copyto(target_pred, pred[k, columns].copy()[None, :], where=better)
+        np.minimum(target, through, out=target)
+
+
+def _attach(spec):
+    """Worker initializer: maps the shared distance (and predecessor) matrix of matrix_pool()"""
+    global _matrices
+    views = []
+    for entry in spec:
+        if entry is None:
+            views.append(None)
+            continue
+        if entry[0] == 'file':
+            _, path, offset, shape, dtype = entry
+            views.append(np.memmap(path, dtype, 'r+', offset, shape))
+            continue
+        _, name, shape, dtype = entry
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        views.append(np.ndarray(shape, dtype, buffer=block.buf))
+    _matrices = tuple(views)
+
+
+def _close_shared_band(i, k, tile):
+    _close_band(_matrices[0], _matrices[1], i, k, tile)
+
+
+def initial_matrices(csr, dtype='float64', predecessors=False):
+    """The edge-weight matrix (see the module docstring) and, if asked, its predecessor matrix"""
+    n = csr.num_rows
+    dist = initial_rows(csr, 0, n, dtype)
+    pred = None
+    if predecessors:
+        offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+        targets = np.frombuffer(csr.targets, dtype=np.int32)
+        rows = np.repeat(np.arange(n), np.diff(offsets))
+        pred = np.full((n, n), -1, dtype=np.int32)
+        pred[rows, targets] = rows
+        np.fill_diagonal(pred, -1)
+    return dist, pred
+
+
+def initial_rows(csr, start, stop, dtype='float64'):
+    """Rows start to stop of the edge-weight matrix of initial_matrices()"""
+    offsets = np.frombuffer(csr.offsets, dtype=np.int64)[start:stop + 1]
+    targets = np.frombuffer(csr.targets, dtype=np.int32)[offsets[0]:offsets[-1]]
+    if csr.weights is not None:
+        weights = np.frombuffer(csr.weights, dtype=np.float64)[offsets[0]:offsets[-1]]
+    else:
+        weights = 1.0
+    rows = np.repeat(np.arange(stop - start), np.diff(offsets))
+    dist = np.full((stop - start, csr.num_rows), INF, dtype=dtype)
+    dist[np.arange(stop - start), np.arange(start, stop)] = 0
+    np.minimum.at(dist, (rows, targets), weights)
+    return dist
+
+
+def floyd_warshall_python(csr):
+    """floyd_warshall() in pure Python: the distance matrix as a list of lists"""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    n = csr.num_rows
+
+    dist = [[INF] * n for _ in range(n)]
+    for u in range(n):
+        row = dist[u]
+        row[u] = 0.0
+        for pos in range(offsets[u], offsets[u + 1]):
+            w = weights[pos] if weights is not None else 1.0
+            if w < row[targets[pos]]:
+                row[targets[pos]] = w
+
+    for k in range(n):
+        row_k = dist[k]
+        for i in range(n):
+            row_i = dist[i]
+            d_ik = row_i[k]
+            if d_ik == INF:
+                continue
+            for j in range(n):
+                if d_ik + row_k[j] < row_i[j]:
+                    row_i[j] = d_ik + row_k[j]
+    return dist
+
+
+def estimate_costs(csr):
+    """Estimated seconds of each method over csr: a dict from method to seconds"""
+    n = csr.num_rows
+    runs = n * (n + len(csr.targets)) * max(math.log2(n), 1.0) * DIJKSTRA_COST if n else 0.0
+    per_step = FLOYD_WARSHALL_NUMPY_COST if np is not None else FLOYD_WARSHALL_PYTHON_COST
+    return {DIJKSTRA: runs, JOHNSON: runs * (n + 1) / n if n else 0.0, FLOYD_WARSHALL: n ** 3 * per_step}
+
+
+def choose_method(csr, weight_summary):
+    """
+    The cheapest method for csr, whose weights have the WeightStats
+    weight_summary, with the estimates of estimate_costs(). Johnson stands
+    in for the Dijkstras when a weight is negative.
+    """
+    costs = estimate_costs(csr)
+    skipped = DIJKSTRA if weight_summary.count and weight_summary.minimum < 0 else JOHNSON
+    return min((m for m in costs if m != skipped), key=costs.get), costs
+
+
+def check_diagonal(dist):
+    """Raises ValueError if the distance matrix dist has a negative diagonal entry, a negative cycle"""
+    if any(dist[i][i] < 0 for i in range(len(dist))):
+        raise ValueError("the graph has a negative cycle")
+
+
+def all_pairs(graph, solve, method=None, dtype='float64', predecessors=False, tile=None,
+              processes=None, stats=None):
+    """
+    Distances between all pairs of dense vertices of graph, as the (dist,
+    pred) of floyd_warshall(), or a list of lists and pred None without
+    NumPy. solve(graph, source) is the Dijkstra to run per source (the
+    dijkstra() of EX1/A1_4.py), returning distances and predecessors.
+    method is one of METHODS, or None to let choose_method() decide. The
+    Dijkstras are spread over processes as by run_sources() (only when
+    estimated at POOL_MIN_SECONDS or more, if processes is None), and
+    Floyd-Warshall runs blocked by tile. If stats is a dict, it receives
+    the method and the estimates of estimate_costs(). Raises ValueError for
+    a negative cycle, or for negative weights with the dijkstra method.
+    """
+    csr = graph.csr
+    chosen, costs = choose_method(csr, graph.weight_stats)
+    if method is None:
+        method = chosen
+    elif method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}, got {method!r}")
+    if stats is not None:
+        stats.update(method=method, estimates=costs)
+
+    if method == FLOYD_WARSHALL:
+        if np is None:
+            if predecessors:
+                raise RuntimeError("the predecessor matrix needs NumPy")
+            dist, pred = floyd_warshall_python(csr), None
+        else:
+            dist, pred = floyd_warshall_blocked(csr, dtype, predecessors, tile or TILE, processes)
+        check_diagonal(dist)
+        return dist, pred
+
+    if processes is None and costs[method] < POOL_MIN_SECONDS:
+        processes = 1
+    n = csr.num_rows
+    if np is not None:
+        dist = np.empty((n, n), dtype=dtype)
+        pred = np.empty((n, n), dtype=np.int32) if predecessors else None
+    else:
+        dist, pred = [], [] if predecessors else None
+    for u, distances, parents in source_rows(graph, solve, method, range(n), processes):
+        if np is not None:
+            dist[u] = distances
+            if predecessors:
+                pred[u] = parents
+        else:
+            dist.append(list(distances))
+            if predecessors:
+                pred.append(list(parents))
+    return dist, pred
+
+
+def source_rows(graph, solve, method, sources, processes=None):
+    """
+    Yields (source, distances, predecessors) for each dense source, in
+    order, from solve() run by run_sources() over graph, or over its
+    Johnson reweighting (with the distances translated back) when method
+    is JOHNSON. Raises ValueError for a negative cycle, or for negative
+    weights with DIJKSTRA.
+    """
+    csr = graph.csr
+    potentials = None
+    if method == JOHNSON:
+        potentials = bellman_ford_potentials(csr)
+        weights = reweight(csr, potentials)
+        graph = SharedGraph(CSR(csr.offsets, csr.targets, weights), graph.ids, graph.directed,
+                            weight_stats(weights))
+    elif graph.weight_stats.count and graph.weight_stats.minimum < 0:
+        raise ValueError("repeated Dijkstra needs non-negative weights; use johnson")
+    sources = list(sources)
+    for u, (distances, parents) in zip(sources, run_sources(graph, sources, solve, processes)):
+        if potentials is not None:
+            hu = potentials[u]
+            distances = [d - hu + hv for d, hv in zip(distances, potentials)]
+        yield u, distances, parents
+
+
+def bellman_ford_potentials(csr):
+    """
+    Distances from a virtual source joined to every vertex by a 0-weight
+    edge, as an array('d'). Processes only the vertices whose potential
+    dropped in the previous pass; raises ValueError on a negative cycle.
+    """
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    n = csr.num_rows
+    potentials = array('d', [0.0]) * n
+    changed = range(n)
+    for _ in range(n):
+        dropped = set()
+        for u in changed:
+            hu = potentials[u]
+            for pos in range(offsets[u], offsets[u + 1]):
+                v = targets[pos]
+                candidate = hu + (weights[pos] if weights is not None else 1.0)
+                if candidate < potentials[v]:
+                    potentials[v] = candidate
+                    dropped.add(v)
+        if not dropped:
+            return potentials
+        changed = sorted(dropped)
+    raise ValueError("the graph has a negative cycle")
+
+
+def reweight(csr, potentials):
+    """Johnson's weights w(u, v) + h[u] - h[v] of csr, as an array('d') clamped at 0 against rounding"""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    result = array('d', bytes(8 * len(targets)))
+    for u in range(csr.num_rows):
+        hu = potentials[u]
+        for pos in range(offsets[u], offsets[u + 1]):
+            w = weights[pos] if weights is not None else 1.0
+            result[pos] = max(w + hu - potentials[targets[pos]], 0.0)
+    return result
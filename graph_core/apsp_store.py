@@ -0,0 +1,200 @@
+"""
+All-pairs shortest paths saved for querying.
+
+An APSPStore holds, for every ordered pair of dense vertices, the distance
+and the next hop: the vertex after u on a shortest path from u to v. Both
+matrices are kept flat in row-major order, so dist(u, v) is one index. A
+path is rebuilt in O(path length) by following the next hops towards v.
+The next hops take the narrowest unsigned width that fits n vertices plus
+a NO_HOP marker (the largest value of the width): one byte up to 255
+vertices, two up to 65535. The distances keep the dtype they were
+computed in.
+
+The store is built from the distances and predecessor matrix of
+apsp.all_pairs(). Each row of predecessors is a shortest-path tree; the
+next hop of v is the ancestor of v whose parent is the root, found for
+all v at once by pointer jumping.
+
+save() writes the matrices and the vertex ids with write_arrays(). The
+header is stamped with the source file's size, mtime and BLAKE2b content
+hash. load() maps the file read-only, so every process that loads the
+same file shares one copy of the pages.
+"""
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .apsp import DIJKSTRA, FLOYD_WARSHALL, JOHNSON, all_pairs, choose_method
+from .idmap import IdMap
+from .snapshot import BYTE_ORDER, map_arrays, source_stamp, stamp_matches, unmap_arrays, write_arrays
+
+MAGIC = b'GCAPST01'
+# magic, byte order, directed, method, distance typecode, next-hop typecode,
+# source size, source mtime_ns, source digest, vertices
+HEADER = struct.Struct('=8sc?16sccqq32sq')
+# The matrices are stored as bytes and cast with the typecodes of the header
+SECTIONS = (('ids', 'q'), ('dist', 'B'), ('next_hop', 'B'))
+# Distance typecodes by dtype
+DIST_TYPECODES = {'float64': b'd', 'float32': b'f'}
+# Unsigned next-hop typecodes, narrowest first
+HOP_TYPECODES = ('B', 'H', 'I', 'Q')
+INF = float('inf')
+
+
+def hop_typecode(n):
+    """The narrowest typecode of HOP_TYPECODES holding n vertex indices and NO_HOP"""
+    for typecode in HOP_TYPECODES:
+        if n < (1 << 8 * struct.calcsize(typecode)) - 1:
+            return typecode
+    raise ValueError(f"too many vertices for a next-hop matrix: {n}")
+
+
+class APSPStore:
+    """
+    Distances (dist[u * n + v]) and next hops (next_hop[u * n + v], no_hop
+    when v is u or unreachable) between the dense vertices of a graph whose
+    external ids are ids
+    """
+    def __init__(self, ids, dist, next_hop, directed, method):
+        self.ids = ids
+        self.n = len(ids)
+        self.dist_matrix = dist
+        self.next_hop = next_hop
+        self.directed = directed
+        self.method = method
+        self.no_hop = (1 << 8 * next_hop.itemsize) - 1
+        self._mapped = None  # the mmap of the matrices, when loaded from disk
+
+    @classmethod
+    def build(cls, graph, solve, method=None, dtype='float64', processes=None):
+        """
+        Runs apsp.all_pairs() with predecessors over graph and keeps its
+        result. Without NumPy, Floyd-Warshall (which then has no predecessor
+        matrix) gives way to the Dijkstra-based methods.
+        """
+        chosen = method or choose_method(graph.csr, graph.weight_stats)[0]
+        if np is None and chosen == FLOYD_WARSHALL:
+            negative = graph.weight_stats.count and graph.weight_stats.minimum < 0
+            chosen = JOHNSON if negative else DIJKSTRA
+        dist, pred = all_pairs(graph, solve, chosen, dtype, predecessors=True, processes=processes)
+        n = graph.csr.num_rows
+        typecode = hop_typecode(n)
+        if np is not None:
+            flat = array('d' if dist.dtype == np.float64 else 'f')
+            flat.frombytes(dist.tobytes())
+            hops = array(typecode)
+            hops.frombytes(_next_hops_numpy(pred, typecode).tobytes())
+        else:
+            flat = array(DIST_TYPECODES[dtype].decode())
+            for row in dist:
+                flat.extend(row)
+            hops = array(typecode)
+            for u, row in enumerate(pred):
+                hops.extend(_next_hops_python(row, u, (1 << 8 * hops.itemsize) - 1))
+        return cls(IdMap(array('q', graph.ids.ids)), flat, hops, graph.directed, chosen)
+
+    def dist(self, u, v):
+        """Shortest distance from dense vertex u to v; infinite if v is unreachable"""
+        return self.dist_matrix[u * self.n + v]
+
+    def path(self, u, v):
+        """Dense vertices of a shortest path from u to v, both included; empty if there is none"""
+        if u == v:
+            return [u]
+        if self.next_hop[u * self.n + v] == self.no_hop:
+            return []
+        path = [u]
+        while u != v:
+            u = self.next_hop[u * self.n + v]
+            path.append(u)
+        return path
+
+    def save(self, path, arquivo):
+        """Writes the store to path, stamped with the source file. Returns False on failure."""
+        try:
+            size, mtime_ns, digest = source_stamp(arquivo)
+        except OSError:
+            return False
+        data = {'ids': self.ids.ids, 'dist': memoryview(self.dist_matrix).cast('B'),
+                'next_hop': memoryview(self.next_hop).cast('B')}
+        header = HEADER.pack(MAGIC, BYTE_ORDER, self.directed, self.method.encode(),
+                             self.dist_matrix.typecode.encode(), self.next_hop.typecode.encode(),
+                             size, mtime_ns, digest, self.n)
+        return write_arrays(path, header, SECTIONS, data)
+
+    @classmethod
+    def load(cls, path, arquivo=None, directed=None, method=None, dtype=None):
+        """
+        Maps the store saved at path, or returns None if there is none, or
+        it was built from another version of arquivo, another direction, by
+        another method or in another dtype (each checked only when given)
+        """
+        def accept(fields):
+            _, _, stored_directed, stored_method, dist_code, hop_code, size, mtime_ns, digest, _ = fields
+            return (dist_code in DIST_TYPECODES.values() and hop_code.decode() in HOP_TYPECODES
+                    and (directed is None or stored_directed == directed)
+                    and (method is None or stored_method.rstrip(b'\0').decode() in _built_by(method))
+                    and (dtype is None or dist_code == DIST_TYPECODES.get(dtype))
+                    and (arquivo is None or stamp_matches(arquivo, size, mtime_ns, digest)))
+
+        loaded = map_arrays(path, HEADER, SECTIONS, MAGIC, accept)
+        if loaded is None:
+            return None
+        (_, _, stored_directed, stored_method, dist_code, hop_code, _, _, _, n), arrays, mapped = loaded
+        dist_code, hop_code = dist_code.decode(), hop_code.decode()
+        # The byte lengths are checked before casting, which fails on a partial item
+        if (len(arrays['ids']) != n or len(arrays['dist']) != n * n * struct.calcsize(dist_code)
+                or len(arrays['next_hop']) != n * n * struct.calcsize(hop_code)):
+            unmap_arrays(arrays, mapped)
+            return None
+        dist = arrays['dist'].cast(dist_code)
+        hops = arrays['next_hop'].cast(hop_code)
+        store = cls(IdMap(arrays['ids']), dist, hops, stored_directed, stored_method.rstrip(b'\0').decode())
+        store._mapped = mapped
+        return store
+
+def store_path(arquivo):
+    """Returns the file the all-pairs store of arquivo is saved to"""
+    return f"{arquivo}.apsp"
+
+
+def _built_by(method):
+    """Methods build() may run for method: without NumPy, Floyd-Warshall gives way to the others"""
+    return (method, DIJKSTRA, JOHNSON) if np is None and method == FLOYD_WARSHALL else (method,)
+
+
+def _next_hops_numpy(pred, typecode):
+    """Next-hop matrix of the predecessor matrix pred, by pointer jumping over all rows at once"""
+    n = len(pred)
+    columns = np.arange(n)
+    # Vertices whose parent is the root are their own next hop; the others point at their parent
+    hop = np.where(pred == columns[:, None], columns[None, :], pred).astype(np.int64)
+    for _ in range(max(n, 1).bit_length() + 1):
+        reached = hop >= 0
+        jumped = np.where(reached, np.take_along_axis(hop, np.maximum(hop, 0), axis=1), -1)
+        if np.array_equal(jumped, hop):
+            break
+        hop = jumped
+    no_hop = (1 << 8 * struct.calcsize(typecode)) - 1
+    return np.where(hop >= 0, hop, no_hop).astype(np.dtype(typecode))
+
+
+def _next_hops_python(parents, root, no_hop):
+    """Next hops from root of the tree given by parents (-1 for none)"""
+    hops = [no_hop] * len(parents)
+    for v in range(len(parents)):
+        chain = []
+        w = v
+        while hops[w] == no_hop and parents[w] >= 0:
+            if parents[w] == root:
+                hops[w] = w
+                break
+            chain.append(w)
+            w = parents[w]
+        for x in chain:
+            hops[x] = hops[w]
+    return hops
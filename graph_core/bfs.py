@@ -0,0 +1,260 @@
+"""
+Level-synchronous breadth-first search over a CSR adjacency.
+
+Each level is produced whole, as the ascending list of its dense vertices,
+so the result does not depend on the order rows are scanned in. Steps are
+direction-optimizing (Beamer, Asanovic and Patterson): top-down steps scan
+the out-entries of the frontier; once those outnumber 1/ALPHA of the
+entries still unexplored (and the frontier holds at least 1/BETA of the
+vertices), bottom-up steps let every unvisited vertex look for a parent
+in the frontier among its in-entries instead, until the frontier shrinks
+below 1/BETA of the vertices. With NumPy installed, large
+graphs run both steps vectorized over the CSR arrays.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ALPHA = 14
+BETA = 24
+# Graphs with fewer vertices run the pure Python steps even when NumPy is available
+NUMPY_MIN_VERTICES = 10000
+
+TOP_DOWN = 'top-down'
+BOTTOM_UP = 'bottom-up'
+
+
+def bfs_levels(csr, source, reverse=None, direction_optimizing=True, use_numpy=None, steps=None,
+               max_depth=None, targets=None):
+    """
+    Yields (level, vertices) for the BFS from dense vertex source, where
+    vertices is the ascending list of the vertices at that distance. Each
+    level is yielded as soon as it is complete, and the next one is only
+    expanded when it is asked for.
+    The search stops after level max_depth, or after the level in which
+    the last of targets (dense vertices) is reached.
+    reverse is the in-entry CSR used by bottom-up steps (the same as csr
+    for undirected graphs, the default). If steps is a list, the direction
+    of each step is appended to it.
+    """
+    if reverse is None:
+        reverse = csr
+    if use_numpy is None:
+        use_numpy = np is not None and csr.num_rows >= NUMPY_MIN_VERTICES
+    if use_numpy:
+        levels = _levels_numpy(csr, source, reverse, direction_optimizing, steps)
+    else:
+        levels = _levels_python(csr, source, reverse, direction_optimizing, steps)
+
+    remaining = set(targets) if targets is not None else None
+    for level, vertices in levels:
+        yield level, vertices
+        if remaining is not None:
+            remaining.difference_update(vertices)
+            if not remaining:
+                return
+        if max_depth is not None and level >= max_depth:
+            return
+
+
+def _levels_python(csr, source, reverse, direction_optimizing, steps):
+    offsets, targets = csr.offsets, csr.targets
+    ends = None  # offsets[1:], copied when the first large frontier needs its entry count
+    n = csr.num_rows
+    visited = bytearray(n)
+    visited[source] = 1
+    frontier = [source]
+    unexplored = len(targets)  # entries of the unvisited vertices
+    uncounted = []  # visited levels not yet subtracted from unexplored
+    unvisited = None  # ascending unvisited vertices, kept while stepping bottom-up
+    bottom_up = False
+    level = 0
+
+    def entries(vertices):
+        return sum(map(ends.__getitem__, vertices)) - sum(map(offsets.__getitem__, vertices))
+
+    while frontier:
+        yield level, frontier
+        level += 1
+        if direction_optimizing:
+            uncounted.append(frontier)
+            if bottom_up:
+                bottom_up = len(frontier) >= n / BETA
+            elif len(frontier) >= n / BETA:
+                # Only a large frontier can switch, so small levels are summed lazily here
+                if ends is None:
+                    ends = offsets[1:]
+                unexplored -= sum(map(entries, uncounted))
+                uncounted.clear()
+                bottom_up = entries(frontier) > unexplored / ALPHA
+        if steps is not None:
+            steps.append(BOTTOM_UP if bottom_up else TOP_DOWN)
+
+        if bottom_up:
+            if unvisited is None:
+                unvisited = [v for v in range(n) if not visited[v]]
+            frontier, unvisited = _bottom_up_step(reverse, frontier, unvisited, visited, n)
+        else:
+            unvisited = None
+            frontier = _top_down_step(offsets, targets, frontier, visited)
+
+
+def _top_down_step(offsets, targets, frontier, visited):
+    found = []
+    for u in frontier:
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if not visited[v]:
+                visited[v] = 1
+                found.append(v)
+    found.sort()
+    return found
+
+
+def _bottom_up_step(reverse, frontier, unvisited, visited, n):
+    offsets, sources = reverse.offsets, reverse.targets
+    in_frontier = bytearray(n)
+    for u in frontier:
+        in_frontier[u] = 1
+    is_parent = in_frontier.__getitem__
+    found, rest = [], []
+    for v in unvisited:
+        if any(map(is_parent, sources[offsets[v]:offsets[v + 1]])):
+            visited[v] = 1
+            found.append(v)
+        else:
+            rest.append(v)
+    return found, rest
+
+
+def _levels_numpy(csr, source, reverse, direction_optimizing, steps):
+    offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+    targets = np.frombuffer(csr.targets, dtype=np.int32)
+    degrees = np.diff(offsets)
+    n = csr.num_rows
+    visited = np.zeros(n, dtype=bool)
+    visited[source] = True
+    frontier = np.array([source], dtype=np.int64)
+    frontier_edges = int(degrees[source])
+    unexplored = len(targets) - frontier_edges
+    bottom_up = False
+    level = 0
+
+    while len(frontier):
+        yield level, frontier.tolist()
+        level += 1
+        if direction_optimizing:
+            if not bottom_up and frontier_edges > unexplored / ALPHA and len(frontier) >= n / BETA:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / BETA:
+                bottom_up = False
+        if steps is not None:
+            steps.append(BOTTOM_UP if bottom_up else TOP_DOWN)
+
+        if bottom_up:
+            in_frontier = np.zeros(n, dtype=bool)
+            in_frontier[frontier] = True
+            unvisited = np.flatnonzero(~visited)
+            rows, entries = _gather(np.frombuffer(reverse.offsets, dtype=np.int64),
+                                    np.frombuffer(reverse.targets, dtype=np.int32), unvisited)
+            has_parent = np.zeros(len(unvisited), dtype=bool)
+            has_parent[rows[in_frontier[entries]]] = True
+            frontier = unvisited[has_parent]
+        else:
+            _, entries = _gather(offsets, targets, frontier)
+            frontier = np.unique(entries[~visited[entries]]).astype(np.int64)
+        visited[frontier] = True
+        frontier_edges = int(degrees[frontier].sum())
+        unexplored -= frontier_edges
+
+
+def _gather(offsets, targets, rows):
+    """Concatenated entries of the given rows, with the position in rows each one came from"""
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+    # Position of every entry: its row start plus its rank inside the row
+    first = np.cumsum(counts) - counts
+    positions = np.arange(total) + np.repeat(starts - first, counts)
+    return np.repeat(np.arange(len(rows)), counts), targets[positions]
+
+
+def multi_source_levels(csr, sources, batch=64, max_depth=None, targets=None):
+    """
+    Bit-parallel BFS from many sources (MS-BFS, Then et al.): up to batch
+    sources share one traversal, each vertex carrying an integer bitmask
+    of the sources whose frontier it is in, so an entry is scanned once per
+    batch rather than once per source. Yields (source, levels) in the order
+    of sources, a batch at a time, where levels[d] is the ascending list of
+    the vertices at distance d from source.
+    Each source stops as bfs_levels() does for max_depth and targets (dense
+    vertices): its bit leaves the frontier after level max_depth, or after
+    the level in which the last of targets is reached, and a batch ends
+    when no source is left searching.
+    """
+    sources = list(sources)
+    for first in range(0, len(sources), batch):
+        chunk = sources[first:first + batch]
+        yield from zip(chunk, _multi_source_batch(csr, chunk, max_depth, targets))
+
+
+def _multi_source_batch(csr, sources, max_depth=None, targets=None):
+    offsets, columns = csr.offsets, csr.targets
+    n = csr.num_rows
+    seen = [0] * n  # seen[v]: bit b is set once source b has reached v
+    frontier = {}  # vertex -> sources whose frontier holds it
+    levels = []
+    for b, s in enumerate(sources):
+        seen[s] |= 1 << b
+        frontier[s] = frontier.get(s, 0) | 1 << b
+        levels.append([[s]])
+    active = (1 << len(sources)) - 1  # sources still searching
+    remaining = None  # remaining[b]: targets source b has not reached yet
+    if targets is not None:
+        remaining = [set(targets) - {s} for s in sources]
+        for b, left in enumerate(remaining):
+            if not left:
+                active &= ~(1 << b)
+    depth = 0
+
+    while frontier:
+        if max_depth is not None and depth >= max_depth:
+            break
+        frontier = {u: bits & active for u, bits in frontier.items() if bits & active}
+        if len(frontier) >= n // 32:
+            # Large frontier: a flat list beats a dict, and is scanned in vertex order
+            reached = [0] * n
+            for u, bits in frontier.items():
+                for v in columns[offsets[u]:offsets[u + 1]]:
+                    reached[v] |= bits
+            reached = ((v, bits) for v, bits in enumerate(reached) if bits)
+        else:
+            touched = {}
+            for u, bits in frontier.items():
+                for v in columns[offsets[u]:offsets[u + 1]]:
+                    touched[v] = touched.get(v, 0) | bits
+            reached = sorted(touched.items())
+
+        frontier = {}
+        found = [[] for _ in sources]  # next level of each source
+        for v, bits in reached:
+            new = bits & ~seen[v]
+            if not new:
+                continue
+            seen[v] |= new
+            frontier[v] = new
+            while new:
+                low = new & -new
+                found[low.bit_length() - 1].append(v)
+                new ^= low
+        for b, (source_levels, vertices) in enumerate(zip(levels, found)):
+            if vertices:
+                source_levels.append(vertices)
+                if remaining is not None and active >> b & 1:
+                    remaining[b].difference_update(vertices)
+                    if not remaining[b]:
+                        active &= ~(1 << b)
+        depth += 1
+    return levels
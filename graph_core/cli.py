@@ -0,0 +1,94 @@
+"""Command line helpers shared by the activity scripts"""
+import sys
+
+from .errors import PajekFormatError
+
+
+def load_options(argv):
+    """
+    Removes the loader options from argv (in place) and returns them as
+    keyword arguments for ler():
+        --workers N     parse the edge section with N processes
+        --no-snapshot   do not read or write the binary snapshot
+    """
+    options = {}
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '--workers' or arg.startswith('--workers='):
+            if '=' in arg:
+                value = arg.split('=', 1)[1]
+                del argv[i]
+            else:
+                value = argv[i + 1] if i + 1 < len(argv) else ''
+                del argv[i:i + 2]
+            try:
+                options['workers'] = int(value)
+            except ValueError:
+                print(f"Erro: --workers espera um inteiro, recebeu {value!r}")
+                sys.exit(2)
+        elif arg == '--no-snapshot':
+            options['snapshot'] = False
+            del argv[i]
+        else:
+            i += 1
+    return options
+
+
+def load_graph(graph, arquivo, **options):
+    """Calls graph.ler(arquivo), exiting with an error message if the file cannot be read"""
+    try:
+        graph.ler(arquivo, **options)
+    except FileNotFoundError:
+        print(f"Erro: arquivo {arquivo} não encontrado.")
+        sys.exit(1)
+    except PajekFormatError as e:
+        print(f"Erro: {e}")
+        sys.exit(1)
+    return graph
+
+
+def read_ids(path):
+    """Reads the vertex ids of a file (separated by whitespace, commas or lines), exiting on an error"""
+    try:
+        with open(path) as f:
+            return [int(token) for token in f.read().replace(',', ' ').split()]
+    except FileNotFoundError:
+        print(f"Erro: arquivo {path} não encontrado.")
+    except ValueError as e:
+        print(f"Erro: vértice inválido em {path}: {e}")
+    sys.exit(1)
+
+
+def ler_pares(caminho):
+    """Reads source-target pairs from a file of ids (see read_ids())"""
+    valores = read_ids(caminho)
+    if len(valores) % 2:
+        print(f"Erro: {caminho} tem um número ímpar de vértices; esperava pares origem destino.")
+        sys.exit(1)
+    return list(zip(valores[::2], valores[1::2]))
+
+
+def query_pairs(argv, usage, queries=None):
+    """
+    Returns the source-target pairs of a query script's command line: the
+    ids after the graph file in argv (s t s t ..., with the options already
+    removed), then the pairs read from the file queries, if given. Prints
+    usage and exits if the graph file is missing, or an error message if
+    the ids are not integers or do not come in pairs.
+    """
+    if len(argv) < 2:
+        print(usage)
+        sys.exit(2)
+    try:
+        valores = [int(v) for v in argv[2:]]
+    except ValueError as e:
+        print(f"Erro: vértice inválido: {e}")
+        sys.exit(2)
+    if len(valores) % 2:
+        print("Erro: os vértices devem vir em pares origem destino.")
+        sys.exit(2)
+    pares = list(zip(valores[::2], valores[1::2]))
+    if queries is not None:
+        pares += ler_pares(queries)
+    return pares
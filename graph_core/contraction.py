@@ -0,0 +1,305 @@
+"""
+Contraction hierarchies (Geisberger et al.) for repeated shortest-path
+queries on a static graph.
+
+Preprocessing contracts the vertices one at a time, cheapest first by
+edge difference: the shortcuts the contraction would add minus the arcs
+it removes, plus the number of neighbours already contracted, which
+spreads the contractions over the graph. Priorities are updated lazily:
+the vertex on top of the queue is re-evaluated and contracted only if it
+is still the cheapest. Contracting v adds a shortcut u -> w for each pair
+of arcs u -> v -> w unless a witness search from u finds a path to w that
+avoids v and is no longer (the search is bounded by the shortcut length
+and WITNESS_SETTLE_LIMIT settled vertices; a bounded search only costs
+extra shortcuts, never correctness).
+
+Every arc ends up stored once, at its lower-ranked end: up[v] holds the
+arcs v -> w and down[v] the arcs u -> v whose other end was contracted
+after v, each with the vertex it bypasses (-1 for an arc of the graph). A
+query runs Dijkstra upward from s over up and upward from t over down;
+the shortest path meets at the vertex of least dist_s + dist_t, and its
+shortcuts are unpacked through the stored middle vertices.
+"""
+import heapq
+import struct
+from array import array
+
+from .csr import CSR
+from .snapshot import BYTE_ORDER, map_arrays, source_stamp, stamp_matches, write_arrays
+
+# Witness searches stop after settling this many vertices
+WITNESS_SETTLE_LIMIT = 100
+
+MAGIC = b'GCCH0001'
+# magic, byte order, directed, source size, source mtime_ns, source digest, vertices
+HEADER = struct.Struct('=8sc?qq32sq')
+SECTIONS = (
+    ('rank', 'i'),
+    ('up_offsets', 'q'), ('up_targets', 'i'), ('up_weights', 'd'), ('up_middle', 'i'),
+    ('down_offsets', 'q'), ('down_targets', 'i'), ('down_weights', 'd'), ('down_middle', 'i'),
+)
+INF = float('inf')
+
+
+class ContractionHierarchy:
+    """
+    rank[v] is the contraction order of dense vertex v; up and down are
+    CSR adjacencies of the upward arcs (see the module docstring), with
+    up_middle and down_middle the bypassed vertex of each entry.
+    """
+    def __init__(self, directed, rank, up, up_middle, down, down_middle):
+        self.directed = directed
+        self.rank = rank
+        self.up = up
+        self.up_middle = up_middle
+        self.down = down
+        self.down_middle = down_middle
+        self._mapped = None  # memory map backing the arrays when loaded from a file
+
+    @property
+    def shortcuts(self):
+        """Number of shortcut arcs added by the preprocessing"""
+        return sum(m >= 0 for m in self.up_middle) + sum(m >= 0 for m in self.down_middle)
+
+    @classmethod
+    def build(cls, csr, directed, witness_limit=WITNESS_SETTLE_LIMIT):
+        """Contracts the graph with adjacency csr (out-entries for directed graphs)"""
+        n = csr.num_rows
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        # Remaining graph: out[u][w] and into[w][u] hold the lightest arc u -> w
+        out = [{} for _ in range(n)]
+        into = [{} for _ in range(n)]
+        for u in range(n):
+            row = out[u]
+            for pos in range(offsets[u], offsets[u + 1]):
+                w, weight = targets[pos], weights[pos] if weights is not None else 1.0
+                if w != u and weight < row.get(w, INF):
+                    row[w] = weight
+                    into[w][u] = weight
+        middle = {}  # (u, w) -> vertex bypassed by the shortcut u -> w
+
+        contracted_neighbours = [0] * n
+
+        def shortcuts_for(v):
+            """The (u, w, weight) shortcuts that contracting v needs"""
+            needed = []
+            outgoing = out[v]
+            if not outgoing:
+                return needed
+            longest = max(outgoing.values())
+            for u, to_v in into[v].items():
+                reach = _witness(out, u, v, to_v + longest, outgoing, witness_limit)
+                for w, from_v in outgoing.items():
+                    if w != u and reach.get(w, INF) > to_v + from_v:
+                        needed.append((u, w, to_v + from_v))
+            return needed
+
+        def priority(v, needed):
+            return len(needed) - len(out[v]) - len(into[v]) + contracted_neighbours[v]
+
+        queue = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+        heapq.heapify(queue)
+        rank = array('i', bytes(4 * n))
+        up_rows, down_rows = [None] * n, [None] * n
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            # Lazy update: contract v only if it is still no worse than the next one
+            needed = shortcuts_for(v)
+            current = priority(v, needed)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, v))
+                continue
+
+            for u, w, weight in needed:
+                if weight < out[u].get(w, INF):
+                    out[u][w] = weight
+                    into[w][u] = weight
+                    middle[u, w] = v
+            up_rows[v] = [(w, weight, middle.get((v, w), -1)) for w, weight in sorted(out[v].items())]
+            down_rows[v] = [(u, weight, middle.get((u, v), -1)) for u, weight in sorted(into[v].items())]
+            for w in out[v]:
+                del into[w][v]
+                contracted_neighbours[w] += 1
+            for u in into[v]:
+                del out[u][v]
+                contracted_neighbours[u] += 1
+            out[v] = into[v] = None
+            rank[v] = order
+            order += 1
+
+        up, up_middle = _rows_to_csr(up_rows)
+        down, down_middle = _rows_to_csr(down_rows)
+        return cls(directed, rank, up, up_middle, down, down_middle)
+
+    def query(self, source, target):
+        """
+        Shortest path between dense vertices source and target. Returns
+        (distance, path, settled): the distance is the sum of the graph's
+        arc weights along the unpacked path, added from the source as
+        Dijkstra does; (inf, [], settled) when target is unreachable.
+        """
+        if source == target:
+            return 0.0, [source], 1
+        sides = (self.up, self.down)
+        distances = ({source: 0.0}, {target: 0.0})
+        parents = ({}, {})  # vertex -> (vertex it was reached from, CSR slot of that arc)
+        queues = ([(0.0, source)], [(0.0, target)])
+        settled = (set(), set())
+        best, meet = INF, -1
+        while queues[0] or queues[1]:
+            # Advance the side with the smaller key; a side is done once its key reaches best
+            side = 0 if queues[0] and (not queues[1] or queues[0][0][0] <= queues[1][0][0]) else 1
+            queue = queues[side]
+            d, u = heapq.heappop(queue)
+            if d >= best:
+                queue.clear()
+                continue
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            other = distances[1 - side].get(u)
+            if other is not None and d + other < best:
+                best, meet = d + other, u
+            csr, mine, parent = sides[side], distances[side], parents[side]
+            for pos in range(csr.offsets[u], csr.offsets[u + 1]):
+                v = csr.targets[pos]
+                nd = d + csr.weights[pos]
+                if nd < mine.get(v, INF):
+                    mine[v] = nd
+                    parent[v] = (u, pos)
+                    heapq.heappush(queue, (nd, v))
+        searched = len(settled[0]) + len(settled[1])
+        if meet < 0:
+            return INF, [], searched
+
+        # Upward arcs s -> ... -> meet, then meet -> ... -> t, as (tail, head, slot, side)
+        arcs = []
+        v = meet
+        while v != source:
+            u, pos = parents[0][v]
+            arcs.append((u, v, pos, 0))
+            v = u
+        arcs.reverse()
+        v = meet
+        while v != target:
+            u, pos = parents[1][v]
+            arcs.append((v, u, pos, 1))
+            v = u
+
+        path, distance = [source], 0
+        for u, w, weight in self._unpack(arcs):
+            path.append(w)
+            distance += weight
+        return distance, path, searched
+
+    def _unpack(self, arcs):
+        """Yields the (u, w, weight) arcs of the graph that the given upward arcs stand for"""
+        stack = list(reversed(arcs))
+        while stack:
+            u, w, pos, side = stack.pop()
+            bypassed = (self.up_middle, self.down_middle)[side][pos]
+            if bypassed < 0:
+                yield u, w, (self.up, self.down)[side].weights[pos]
+                continue
+            # u -> m is a down arc of m (u ranks higher) and m -> w an up arc of m
+            stack.append((bypassed, w, _slot(self.up, bypassed, w), 0))
+            stack.append((u, bypassed, _slot(self.down, bypassed, u), 1))
+
+    def save(self, path, arquivo):
+        """Writes the hierarchy to path, stamped with the source file. Returns False on failure."""
+        try:
+            size, mtime_ns, digest = source_stamp(arquivo)
+        except OSError:
+            return False
+        data = {
+            'rank': self.rank,
+            'up_offsets': self.up.offsets, 'up_targets': self.up.targets,
+            'up_weights': self.up.weights, 'up_middle': self.up_middle,
+            'down_offsets': self.down.offsets, 'down_targets': self.down.targets,
+            'down_weights': self.down.weights, 'down_middle': self.down_middle,
+        }
+        header = HEADER.pack(MAGIC, BYTE_ORDER, self.directed, size, mtime_ns, digest, len(self.rank))
+        return write_arrays(path, header, SECTIONS, data)
+
+    @classmethod
+    def load(cls, path, arquivo, directed):
+        """
+        Maps the hierarchy saved at path, or returns None if there is none
+        or it was built from another version of arquivo (by size and mtime,
+        or content hash when only the mtime changed) or direction.
+        """
+        def accept(fields):
+            _, _, stored_directed, size, mtime_ns, digest, _ = fields
+            return stored_directed == directed and stamp_matches(arquivo, size, mtime_ns, digest)
+
+        loaded = map_arrays(path, HEADER, SECTIONS, MAGIC, accept)
+        if loaded is None:
+            return None
+        _, arrays, mapped = loaded
+        hierarchy = cls(directed, arrays['rank'],
+                        CSR(arrays['up_offsets'], arrays['up_targets'], arrays['up_weights']),
+                        arrays['up_middle'],
+                        CSR(arrays['down_offsets'], arrays['down_targets'], arrays['down_weights']),
+                        arrays['down_middle'])
+        hierarchy._mapped = mapped
+        return hierarchy
+
+
+def hierarchy_path(arquivo):
+    """Returns the file the hierarchy of arquivo is saved to"""
+    return f"{arquivo}.ch"
+
+
+def _witness(out, source, skipped, limit, targets, settle_limit):
+    """
+    Distances from source in the remaining graph without skipped, as far
+    as limit, settle_limit settled vertices or all of targets settled
+    """
+    distances = {source: 0.0}
+    queue = [(0.0, source)]
+    remaining = len(targets)
+    settled = 0
+    while queue and remaining and settled < settle_limit:
+        d, u = heapq.heappop(queue)
+        if d > distances[u]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        if u in targets:
+            remaining -= 1
+        for v, weight in out[u].items():
+            if v == skipped:
+                continue
+            nd = d + weight
+            if nd < distances.get(v, INF):
+                distances[v] = nd
+                heapq.heappush(queue, (nd, v))
+    return distances
+
+
+def _rows_to_csr(rows):
+    """CSR of the given (target, weight, middle) rows, plus the middle array"""
+    offsets = array('q', [0])
+    targets, weights, middles = array('i'), array('d'), array('i')
+    for row in rows:
+        for target, weight, middle in row:
+            targets.append(target)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return CSR(offsets, targets, weights), middles
+
+
+def _slot(csr, row, target):
+    """Slot of target in the (target-sorted) row of csr"""
+    lo, hi = csr.offsets[row], csr.offsets[row + 1]
+    targets = csr.targets
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if targets[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -0,0 +1,131 @@
+from array import array
+
+
+class CSR:
+    """
+    Compressed sparse row adjacency.
+
+    Row u occupies targets[offsets[u]:offsets[u + 1]]; weights and edge_ids,
+    when present, are parallel to targets.
+    """
+    __slots__ = ('offsets', 'targets', 'weights', 'edge_ids')
+
+    def __init__(self, offsets, targets, weights=None, edge_ids=None):
+        self.offsets = offsets      # array('q'), length rows + 1
+        self.targets = targets      # array('i')
+        self.weights = weights      # array('d') or None
+        self.edge_ids = edge_ids    # array('i') or None
+
+    @classmethod
+    def build(cls, num_rows, sources, targets, weights=None, edge_ids=None):
+        """
+        Counting sort of the (source, target) entries into rows.
+        Entries keep their input order inside each row.
+        """
+        offsets = array('q', bytes(8 * (num_rows + 1)))
+        for u in sources:
+            offsets[u + 1] += 1
+        for u in range(num_rows):
+            offsets[u + 1] += offsets[u]
+
+        m = len(sources)
+        out_targets = array('i', bytes(4 * m))
+        out_weights = array('d', bytes(8 * m)) if weights is not None else None
+        out_ids = array('i', bytes(4 * m)) if edge_ids is not None else None
+
+        cursor = offsets[:-1]
+        for k in range(m):
+            u = sources[k]
+            pos = cursor[u]
+            cursor[u] = pos + 1
+            out_targets[pos] = targets[k]
+            if out_weights is not None:
+                out_weights[pos] = weights[k]
+            if out_ids is not None:
+                out_ids[pos] = edge_ids[k]
+
+        return cls(offsets, out_targets, out_weights, out_ids)
+
+    @classmethod
+    def from_edges(cls, num_rows, src, dst, weights=None, undirected=False, edge_ids=False):
+        """
+        Builds the CSR straight from an edge list (src[k], dst[k], weights[k]).
+        Undirected edges k become the entries src[k] -> dst[k] and dst[k] -> src[k],
+        both tagged with edge id k. No intermediate entry list is allocated.
+        Directed entries are tagged with their edge id only when edge_ids is True.
+        """
+        if not undirected:
+            return cls.build(num_rows, src, dst, weights, range(len(src)) if edge_ids else None)
+
+        offsets = array('q', bytes(8 * (num_rows + 1)))
+        for u in src:
+            offsets[u + 1] += 1
+        for v in dst:
+            offsets[v + 1] += 1
+        for u in range(num_rows):
+            offsets[u + 1] += offsets[u]
+
+        total = offsets[num_rows]
+        out_targets = array('i', bytes(4 * total))
+        out_weights = array('d', bytes(8 * total)) if weights is not None else None
+        out_ids = array('i', bytes(4 * total))
+
+        cursor = offsets[:-1]
+        for k in range(len(src)):
+            u = src[k]
+            v = dst[k]
+            pos = cursor[u]
+            cursor[u] = pos + 1
+            out_targets[pos] = v
+            out_ids[pos] = k
+            if out_weights is not None:
+                out_weights[pos] = weights[k]
+            pos = cursor[v]
+            cursor[v] = pos + 1
+            out_targets[pos] = u
+            out_ids[pos] = k
+            if out_weights is not None:
+                out_weights[pos] = weights[k]
+
+        return cls(offsets, out_targets, out_weights, out_ids)
+
+    @property
+    def num_rows(self):
+        return len(self.offsets) - 1
+
+    def bounds(self, u):
+        """Returns the slice [start, end) of row u, or (0, 0) if u is out of range"""
+        if 0 <= u < len(self.offsets) - 1:
+            return self.offsets[u], self.offsets[u + 1]
+        return 0, 0
+
+    def degree(self, u):
+        start, end = self.bounds(u)
+        return end - start
+
+    def row(self, u):
+        """Returns the targets of row u as a list"""
+        start, end = self.bounds(u)
+        return self.targets[start:end].tolist()
+
+    def weighted_row(self, u):
+        """Returns row u as a list of (target, weight) tuples"""
+        start, end = self.bounds(u)
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def transpose(self):
+        """Returns the reverse CSR (row v lists the sources of the entries pointing to v)"""
+        sources = array('i', bytes(4 * len(self.targets)))
+        offsets = self.offsets
+        for u in range(len(offsets) - 1):
+            for pos in range(offsets[u], offsets[u + 1]):
+                sources[pos] = u
+        return CSR.build(self.num_rows, self.targets, sources, self.weights, self.edge_ids)
+
+    def nbytes(self):
+        """Returns the memory held by the arrays, in bytes"""
+        total = 0
+        for arr in (self.offsets, self.targets, self.weights, self.edge_ids):
+            if arr is not None:
+                total += arr.itemsize * len(arr)
+        return total
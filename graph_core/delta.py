@@ -0,0 +1,289 @@
+"""
+Delta-stepping single-source shortest paths (Meyer and Sanders).
+
+Tentative distances are grouped in buckets of width delta, and the lowest
+non-empty bucket is emptied in phases. Each phase relaxes the light
+entries (weight <= delta) of every vertex taken out of the bucket, which
+may put vertices back into it. Once the bucket stays empty its vertices
+are final, and their heavy entries are relaxed once. Each phase is one
+batch of independent relaxations. With NumPy installed, large graphs run
+every phase vectorized over the CSR arrays, keeping the smallest candidate
+per target. Without NumPy the phases run in a pure Python loop.
+
+The distances are the ones dijkstra() finds: both converge to the least
+solution of dist[v] = min over entries u -> v of dist[u] + weight, with
+the same floating-point sums. Predecessors are assigned afterwards. Each
+vertex gets the in-neighbour of smallest (distance, index) among those
+whose entry is tight. With positive weights, that is the vertex Dijkstra
+settles first among them, so the trees match too. Zero-weight entries
+between vertices at equal distance are resolved by a settle-order pass.
+
+choose_delta() aims at LIGHT_ENTRIES light entries per vertex. With
+weights spread evenly up to the largest one, that is a delta of
+LIGHT_ENTRIES * largest weight / average degree, kept between the
+smallest and the largest weight. A smaller delta means more and emptier
+buckets. A larger one means more re-relaxations inside each bucket.
+"""
+import heapq
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .heaps import weight_stats
+
+# Graphs with fewer vertices run the pure Python phases even when NumPy is available
+NUMPY_MIN_VERTICES = 10000
+# Light entries per vertex that choose_delta() aims at
+LIGHT_ENTRIES = 2
+INF = float('inf')
+
+
+def choose_delta(csr, stats):
+    """Bucket width for a graph with adjacency csr and edge WeightStats stats"""
+    if not stats.count or stats.maximum <= 0:
+        return 1.0
+    degree = max(len(csr.targets) / max(csr.num_rows, 1), 1.0)
+    return min(max(LIGHT_ENTRIES * stats.maximum / degree, stats.minimum), stats.maximum)
+
+
+def delta_stepping(csr, source, delta=None, weight_summary=None, use_numpy=None, stats=None):
+    """
+    Shortest paths from dense vertex source over csr (weights of 1 when it
+    has none). Returns (distances, predecessors) like dijkstra(): array('d')
+    and array('i') over dense indices, with -1 as the null predecessor.
+    delta defaults to choose_delta() for the WeightStats weight_summary
+    (computed when not given). If stats is a dict, it receives the delta,
+    the buckets emptied and the light phases run. Raises ValueError for
+    negative weights or a delta that is not positive.
+    """
+    if weight_summary is None:
+        weight_summary = weight_stats(csr.weights if csr.weights is not None else array('d'))
+    if weight_summary.count and weight_summary.minimum < 0:
+        raise ValueError("delta-stepping needs non-negative weights")
+    if delta is None:
+        delta = choose_delta(csr, weight_summary)
+    if not delta > 0 or delta == INF:
+        raise ValueError(f"delta must be positive and finite, got {delta!r}")
+    if use_numpy is None:
+        use_numpy = np is not None and csr.num_rows >= NUMPY_MIN_VERTICES
+    counters = {'delta': delta, 'buckets': 0, 'phases': 0}
+    if use_numpy:
+        distances, predecessors = _delta_numpy(csr, source, delta, counters)
+    else:
+        distances, predecessors = _delta_python(csr, source, delta, counters)
+    if stats is not None:
+        stats.update(counters)
+    return distances, predecessors
+
+
+def _delta_python(csr, source, delta, counters):
+    n = csr.num_rows
+    light, heavy = _split_python(csr, delta)
+    distances = array('d', [INF]) * n
+    distances[source] = 0.0
+    buckets = {0: {source}}  # bucket index -> vertices with that tentative bucket
+
+    def relax(vertices, entries):
+        offsets, targets, weights = entries
+        for u in vertices:
+            du = distances[u]
+            for pos in range(offsets[u], offsets[u + 1]):
+                v = targets[pos]
+                nd = du + weights[pos]
+                if nd < distances[v]:
+                    old = distances[v]
+                    if old != INF:
+                        buckets[math.floor(old / delta)].discard(v)
+                    distances[v] = nd
+                    bucket = math.floor(nd / delta)
+                    if bucket in buckets:
+                        buckets[bucket].add(v)
+                    else:
+                        buckets[bucket] = {v}
+
+    while buckets:
+        i = min(buckets)
+        removed = set()
+        while buckets[i]:
+            frontier = buckets[i]
+            buckets[i] = set()
+            removed |= frontier
+            counters['phases'] += 1
+            relax(frontier, light)
+        del buckets[i]
+        counters['buckets'] += 1
+        relax(removed, heavy)
+        for k in [k for k, bucket in buckets.items() if not bucket]:
+            del buckets[k]
+    return distances, _predecessors_python(csr, source, distances)
+
+
+def _split_python(csr, delta):
+    """The light and heavy entries of csr as two (offsets, targets, weights) CSRs"""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    parts = []
+    for light in (True, False):
+        part_offsets, part_targets, part_weights = array('q', [0]), array('i'), array('d')
+        for u in range(csr.num_rows):
+            for pos in range(offsets[u], offsets[u + 1]):
+                w = weights[pos] if weights is not None else 1.0
+                if (w <= delta) == light:
+                    part_targets.append(targets[pos])
+                    part_weights.append(w)
+            part_offsets.append(len(part_targets))
+        parts.append((part_offsets, part_targets, part_weights))
+    return parts
+
+
+def _predecessors_python(csr, source, distances):
+    """The tight in-neighbour of smallest (distance, index) of each vertex (see the module docstring)"""
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    n = csr.num_rows
+    predecessors = array('i', [-1]) * n
+    best = [None] * n
+    zero = []  # tight entries between vertices at the same distance
+    for u in range(n):
+        du = distances[u]
+        if du == INF:
+            continue
+        for pos in range(offsets[u], offsets[u + 1]):
+            v = targets[pos]
+            if v == u or v == source or du + (weights[pos] if weights is not None else 1.0) != distances[v]:
+                continue
+            if du == distances[v]:
+                zero.append((u, v))
+            elif best[v] is None or (du, u) < best[v]:
+                best[v] = (du, u)
+                predecessors[v] = u
+    if zero:
+        _resolve_zero(source, distances, predecessors, zero)
+    return predecessors
+
+
+def _resolve_zero(source, distances, predecessors, zero):
+    """
+    Gives a predecessor to the vertices reached only through tight entries
+    from vertices at the same distance, in settle order: smallest
+    (distance, index) first, starting from the vertices already in the tree.
+    """
+    following = {}
+    for u, v in zero:
+        following.setdefault(u, []).append(v)
+    queue = [(distances[u], u) for u in following if u == source or predecessors[u] >= 0]
+    heapq.heapify(queue)
+    while queue:
+        _, u = heapq.heappop(queue)
+        for v in following.get(u, ()):
+            if v != source and predecessors[v] < 0:
+                predecessors[v] = u
+                heapq.heappush(queue, (distances[v], v))
+
+
+def _split(offsets, targets, weights, mask):
+    """CSR (offsets, targets, weights) of the entries selected by mask"""
+    kept = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    return kept[offsets], targets[mask], weights[mask]
+
+
+def _gather(offsets, rows):
+    """Position of every entry of the given rows, with the index in rows each one came from"""
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    positions = np.arange(total) + np.repeat(starts - first, counts)
+    return np.repeat(np.arange(len(rows)), counts), positions
+
+
+def _delta_numpy(csr, source, delta, counters):
+    n = csr.num_rows
+    offsets = np.frombuffer(csr.offsets, dtype=np.int64)
+    targets = np.frombuffer(csr.targets, dtype=np.int32)
+    if csr.weights is not None:
+        weights = np.frombuffer(csr.weights, dtype=np.float64)
+    else:
+        weights = np.ones(len(targets))
+    light = _split(offsets, targets, weights, weights <= delta)
+    heavy = _split(offsets, targets, weights, weights > delta)
+    distances = np.full(n, INF)
+    distances[source] = 0.0
+    done = np.zeros(n, dtype=bool)
+
+    def relax(frontier, entries):
+        """Relaxes the entries of frontier at once; returns the vertices whose distance dropped"""
+        entry_offsets, entry_targets, entry_weights = entries
+        rows, positions = _gather(entry_offsets, frontier)
+        if not len(positions):
+            return positions
+        heads = entry_targets[positions]
+        candidates = distances[frontier][rows] + entry_weights[positions]
+        better = candidates < distances[heads]
+        heads, candidates = heads[better], candidates[better]
+        if not len(heads):
+            return heads
+        order = np.lexsort((candidates, heads))
+        heads, candidates = heads[order], candidates[order]
+        first = np.ones(len(heads), dtype=bool)
+        first[1:] = heads[1:] != heads[:-1]
+        heads = heads[first]
+        distances[heads] = candidates[first]
+        return heads
+
+    fringe = np.array([source], dtype=np.int64)
+    while True:
+        fringe = fringe[~done[fringe]]
+        if not len(fringe):
+            break
+        fringe = np.unique(fringe)
+        buckets = np.floor(distances[fringe] / delta)
+        i = buckets.min()
+        frontier = fringe[buckets == i]
+        removed = []
+        later = [fringe]
+        while len(frontier):
+            removed.append(frontier)
+            counters['phases'] += 1
+            updated = relax(frontier, light)
+            in_bucket = np.floor(distances[updated] / delta) == i
+            later.append(updated[~in_bucket])
+            frontier = updated[in_bucket]
+        settled = np.unique(np.concatenate(removed))
+        done[settled] = True
+        counters['buckets'] += 1
+        later.append(relax(settled, heavy))
+        fringe = np.concatenate(later).astype(np.int64)
+
+    result = array('d')
+    result.frombytes(distances.tobytes())
+    return result, _predecessors_numpy(offsets, targets, weights, source, distances)
+
+
+def _predecessors_numpy(offsets, targets, weights, source, distances):
+    """_predecessors_python() over the whole entry arrays at once"""
+    n = len(distances)
+    tails = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+    heads = targets.astype(np.int64)
+    at_tail = distances[tails]
+    tight = ((at_tail + weights == distances[heads]) & (at_tail != INF)
+             & (heads != tails) & (heads != source))
+    zero = tight & (at_tail == distances[heads])
+    tight &= ~zero
+    tails_t, heads_t = tails[tight], heads[tight]
+    order = np.lexsort((tails_t, distances[tails_t], heads_t))
+    tails_t, heads_t = tails_t[order], heads_t[order]
+    first = np.ones(len(heads_t), dtype=bool)
+    first[1:] = heads_t[1:] != heads_t[:-1]
+    parents = np.full(n, -1, dtype=np.int32)
+    parents[heads_t[first]] = tails_t[first]
+    predecessors = array('i')
+    predecessors.frombytes(parents.tobytes())
+    if zero.any():
+        _resolve_zero(source, distances.tolist(), predecessors,
+                      list(zip(tails[zero].tolist(), heads[zero].tolist())))
+    return predecessors
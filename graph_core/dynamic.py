@@ -0,0 +1,213 @@
+"""
+Shortest-path tree from one source kept up to date as the graph changes.
+
+A DynamicSSSP starts from the distances and predecessors of a full run
+(dijkstra() of EX1/A1_4.py) and repairs them from the graph's change
+records, in the manner of Ramalingam and Reps:
+
+- An edge that got heavier or was removed only matters if it is a tree
+  edge. The subtree below it is cut off, and each of its vertices gets
+  the best distance through an in-neighbour outside the subtree.
+- An edge that got lighter or was added seeds its head when it gives a
+  shorter distance.
+- A Dijkstra restricted to the seeded vertices then settles everything
+  whose distance changed, and nothing else.
+
+A batch of changes is repaired in one pass. The distances end up equal to
+a fresh run's, bit for bit. Predecessors can differ between paths of equal
+length.
+
+The adjacency is read from a copy of the CSR taken when the tree was
+seeded, plus the rows touched by changes since, which are materialized as
+lists. This leaves the graph's own arrays alone: reading graph.csr after
+an edge is added or removed would compact the whole graph, costing O(m).
+When the change log no longer covers the changes (the log was trimmed or
+the vertices were re-indexed), the tree has to be seeded again.
+shortest_path_tree() does that through graph.cached().
+"""
+import heapq
+from array import array
+
+from .graph import ADD_EDGE, REMOVE_EDGE
+
+INF = float('inf')
+
+
+class DynamicSSSP:
+    """
+    distances and predecessors (array('d') and array('i') over dense
+    indices, -1 for none) of the tree from source, valid for graph.version
+    as of version
+    """
+    def __init__(self, graph, source, distances, predecessors):
+        self.graph = graph
+        self.source = source
+        self.distances = array('d', distances)
+        self.predecessors = array('i', predecessors)
+        self.version = graph.version
+        self.directed = graph.directed
+        csr = graph.csr
+        # Private copies: set_weight() patches the graph's CSR weights in place
+        self._out = (array('q', csr.offsets), array('i', csr.targets),
+                     array('d', csr.weights) if csr.weights is not None else None)
+        if self.directed:
+            reverse = graph.reverse_csr
+            self._in = (reverse.offsets, reverse.targets, reverse.weights)
+        else:
+            self._in = self._out
+        self._out_rows = {}  # vertex -> [(target, weight), ...] once a change touched its row
+        self._in_rows = {} if self.directed else self._out_rows
+        self._children = [[] for _ in range(len(self.distances))]
+        for v, parent in enumerate(self.predecessors):
+            if parent >= 0:
+                self._children[parent].append(v)
+
+    def update(self):
+        """
+        Repairs the tree with the changes made to the graph since version.
+        Returns False, leaving the tree as it was, if the graph no longer
+        knows them; the tree must then be seeded again.
+        """
+        changes = self.graph.changes_since(self.version)
+        if changes is None:
+            return False
+        self.apply(changes)
+        return True
+
+    def apply(self, changes):
+        """Repairs the tree with the given (kind, u, v, old_weight, new_weight) records; returns self"""
+        self._grow(len(self.graph.ids))
+        heavier, lighter = [], set()
+        for kind, i, j, old, new in changes:
+            arcs = ((i, j),) if self.directed else ((i, j), (j, i))
+            for u, v in arcs:
+                if kind != ADD_EDGE:
+                    self._drop(u, v, old)
+                    heavier.append((u, v, old))
+                if kind != REMOVE_EDGE:
+                    self._put(u, v, new)
+                    lighter.add((u, v))
+        self.version = self.graph.version
+        self._repair(heavier, lighter)
+        return self
+
+    def _repair(self, heavier, lighter):
+        distances, predecessors = self.distances, self.predecessors
+        queue = []
+
+        # Subtrees hanging from a tree edge that got heavier or went away
+        roots = [v for u, v, old in heavier
+                 if predecessors[v] == u and distances[u] + old == distances[v]]
+        affected = set()
+        stack = roots
+        while stack:
+            v = stack.pop()
+            if v not in affected:
+                affected.add(v)
+                stack.extend(self._children[v])
+        for v in affected:
+            distances[v] = INF
+            self._set_parent(v, -1)
+        for v in affected:
+            best, parent = INF, -1
+            for u, w in self._entries_in(v):
+                candidate = distances[u] + w
+                if candidate < best or (candidate == best and u < parent):
+                    best, parent = candidate, u
+            if parent >= 0:
+                distances[v] = best
+                self._set_parent(v, parent)
+                heapq.heappush(queue, (best, v))
+
+        # Heads of edges that got lighter or were added, at their weight after the whole batch
+        for u, v in lighter:
+            for head, w in self._entries_out(u):
+                candidate = distances[u] + w
+                if head == v and candidate < distances[v]:
+                    distances[v] = candidate
+                    self._set_parent(v, u)
+                    heapq.heappush(queue, (candidate, v))
+
+        while queue:
+            d, u = heapq.heappop(queue)
+            if d > distances[u]:
+                continue
+            for v, w in self._entries_out(u):
+                candidate = d + w
+                if candidate < distances[v]:
+                    distances[v] = candidate
+                    self._set_parent(v, u)
+                    heapq.heappush(queue, (candidate, v))
+
+    def _set_parent(self, v, parent):
+        old = self.predecessors[v]
+        if old == parent:
+            return
+        if old >= 0:
+            self._children[old].remove(v)
+        if parent >= 0:
+            self._children[parent].append(v)
+        self.predecessors[v] = parent
+
+    def _grow(self, n):
+        """Makes room for vertices appended to the graph since the tree was seeded"""
+        added = n - len(self.distances)
+        if added > 0:
+            self.distances.extend(array('d', [INF]) * added)
+            self.predecessors.extend(array('i', [-1]) * added)
+            self._children.extend([] for _ in range(added))
+
+    def _entries_out(self, u):
+        return self._row(self._out, self._out_rows, u)
+
+    def _entries_in(self, v):
+        return self._row(self._in, self._in_rows, v)
+
+    @staticmethod
+    def _row(csr, rows, v):
+        """(neighbour, weight) entries of v, from the changed rows or the seeded CSR"""
+        row = rows.get(v)
+        if row is not None:
+            return row
+        offsets, targets, weights = csr
+        if v + 1 >= len(offsets):
+            return []
+        start, end = offsets[v], offsets[v + 1]
+        if weights is None:
+            return [(t, 1.0) for t in targets[start:end]]
+        return list(zip(targets[start:end], weights[start:end]))
+
+    def _materialize(self, rows, csr, v):
+        row = rows.get(v)
+        if row is None:
+            row = rows[v] = self._row(csr, rows, v)
+        return row
+
+    def _drop(self, u, v, weight):
+        """Removes one entry u -> v of the given weight from the rows"""
+        row = self._materialize(self._out_rows, self._out, u)
+        if (v, weight) in row:
+            row.remove((v, weight))
+        if self.directed:
+            row = self._materialize(self._in_rows, self._in, v)
+            if (u, weight) in row:
+                row.remove((u, weight))
+
+    def _put(self, u, v, weight):
+        """Adds an entry u -> v of the given weight to the rows"""
+        self._materialize(self._out_rows, self._out, u).append((v, weight))
+        if self.directed:
+            self._materialize(self._in_rows, self._in, v).append((u, weight))
+
+
+def shortest_path_tree(graph, source, solve):
+    """
+    DynamicSSSP of graph from dense vertex source, cached on the graph.
+    It is seeded with solve(graph, source) (a dijkstra() that returns
+    distances and predecessors) and repaired on later calls after changes.
+    """
+    def build():
+        distances, predecessors = solve(graph, source)
+        return DynamicSSSP(graph, source, distances, predecessors)
+
+    return graph.cached(('sssp', source), build, lambda tree, changes: tree.apply(changes))
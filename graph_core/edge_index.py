@@ -0,0 +1,139 @@
+"""
+Edge lookup structures for haAresta() and peso().
+
+After loading, the graph picks one of them from its density:
+    'dense-matrix'  n x n matrix of the first CSR slot of each entry (-1
+                    for none); O(1) lookups, used for small dense graphs
+    'sorted-csr'    per-row permutation of the CSR slots sorted by target;
+                    O(log deg) lookups by binary search, used otherwise
+The CSR itself keeps its file order, which the traversals depend on.
+Both structures are built on the first lookup and hold CSR slots rather
+than weights, so weight updates made in the CSR show through.
+"""
+from array import array
+
+# The slot matrix (4 bytes per cell) is used only up to this many vertices
+DENSE_MAX_VERTICES = 4096
+# ... and only when at least this fraction of the n^2 cells holds an entry
+DENSE_MIN_DENSITY = 0.25
+
+DENSE_MATRIX = 'dense-matrix'
+SORTED_CSR = 'sorted-csr'
+
+
+def choose_representation(csr):
+    """Returns DENSE_MATRIX or SORTED_CSR for the given adjacency"""
+    n = csr.num_rows
+    if 0 < n <= DENSE_MAX_VERTICES and len(csr.targets) >= DENSE_MIN_DENSITY * n * n:
+        return DENSE_MATRIX
+    return SORTED_CSR
+
+
+def build_edge_index(representation, csr):
+    if representation == DENSE_MATRIX:
+        return SlotMatrixIndex(csr)
+    return SortedRowIndex(csr)
+
+
+class SlotMatrixIndex:
+    """Dense n x n matrix of the first CSR slot of each entry, -1 where there is none"""
+    def __init__(self, csr):
+        n = csr.num_rows
+        self.csr = csr
+        self.n = n
+        self.first = array('i', [-1]) * (n * n)
+
+        offsets, targets = csr.offsets, csr.targets
+        first = self.first
+        for u in range(n):
+            row = u * n
+            # Filled backwards so that, of parallel edges, the first in file order wins
+            for pos in range(offsets[u + 1] - 1, offsets[u] - 1, -1):
+                first[row + targets[pos]] = pos
+
+    def find(self, u, v):
+        """Returns the first CSR slot (in file order) of entry u -> v, or -1"""
+        if not (0 <= u < self.n and 0 <= v < self.n):
+            return -1
+        return self.first[u * self.n + v]
+
+    def has(self, u, v):
+        return self.find(u, v) >= 0
+
+    def slots(self, u, v):
+        """Yields every CSR slot of entry u -> v, in file order"""
+        pos = self.find(u, v)
+        if pos < 0:
+            return
+        targets, end = self.csr.targets, self.csr.offsets[u + 1]
+        for pos in range(pos, end):
+            if targets[pos] == v:
+                yield pos
+
+    def weight(self, u, v):
+        """Returns the weight of entry u -> v, or None if there is none"""
+        pos = self.find(u, v)
+        if pos < 0:
+            return None
+        return self.csr.weights[pos] if self.csr.weights is not None else 1.0
+
+    def nbytes(self):
+        return self.first.itemsize * len(self.first)
+
+
+class SortedRowIndex:
+    """For each CSR row, its slots ordered by (target, slot); binary search per lookup"""
+    def __init__(self, csr):
+        self.csr = csr
+        offsets, targets = csr.offsets, csr.targets
+        order = array('i', range(len(targets)))
+        for u in range(csr.num_rows):
+            start, end = offsets[u], offsets[u + 1]
+            if end - start > 1:
+                order[start:end] = array('i', sorted(range(start, end), key=targets.__getitem__))
+        self.order = order  # CSR slots, sorted by target inside each row
+
+    def find(self, u, v):
+        """Returns the first CSR slot (in file order) of entry u -> v, or -1"""
+        lo = self._lower(u, v)
+        return self.order[lo] if lo >= 0 else -1
+
+    def _lower(self, u, v):
+        """Position in order of the first entry u -> v, or -1"""
+        csr = self.csr
+        if not 0 <= u < csr.num_rows:
+            return -1
+        targets, order = csr.targets, self.order
+        lo, hi = csr.offsets[u], csr.offsets[u + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if targets[order[mid]] < v:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < csr.offsets[u + 1] and targets[order[lo]] == v:
+            return lo
+        return -1
+
+    def slots(self, u, v):
+        """Yields every CSR slot of entry u -> v, in file order"""
+        lo = self._lower(u, v)
+        if lo < 0:
+            return
+        targets, order, end = self.csr.targets, self.order, self.csr.offsets[u + 1]
+        while lo < end and targets[order[lo]] == v:
+            yield order[lo]
+            lo += 1
+
+    def has(self, u, v):
+        return self.find(u, v) >= 0
+
+    def weight(self, u, v):
+        """Returns the weight of entry u -> v, or None if there is none"""
+        pos = self.find(u, v)
+        if pos < 0:
+            return None
+        return self.csr.weights[pos] if self.csr.weights is not None else 1.0
+
+    def nbytes(self):
+        return self.order.itemsize * len(self.order)
@@ -0,0 +1,12 @@
+class GraphError(Exception):
+    """Base class for the errors raised by graph_core"""
+
+
+class PajekFormatError(GraphError, ValueError):
+    """Raised when a Pajek .net file is malformed or has an unexpected section"""
+    def __init__(self, arquivo, lineno, message):
+        self.arquivo = arquivo
+        self.lineno = lineno
+        self.message = message
+        where = f"{arquivo}:{lineno}" if lineno else str(arquivo)
+        super().__init__(f"{where}: {message}")
@@ -0,0 +1,145 @@
+"""
+Eulerian circuits and paths by Hierholzer's algorithm, in O(n + m).
+
+Every vertex keeps a cursor into its CSR row and every edge a used count
+(by edge id for undirected graphs, by CSR slot for directed ones, where
+each arc has exactly one), so no entry is looked at twice. The tour is
+built like the recursive formulation: a walk that closes at its start,
+then, position by position, every vertex that still has unused edges is
+replaced by its own closed walk, recursively. Here the pending walks are
+frames on an explicit stack and the vertices are yielded as soon as they
+are final, so neither recursion depth nor a spliced list limits the size.
+"""
+from array import array
+
+
+def eulerian_start(csr, reverse, directed, path=False):
+    """
+    Checks for an Eulerian circuit (or, with path=True, an Eulerian path,
+    which may also be a circuit). Returns (start, closed): the dense vertex
+    the tour starts from (-1 if the graph has no edges) and whether it is a
+    circuit; None if there is no such tour. reverse is the in-entry CSR
+    (csr for undirected graphs).
+    """
+    n = csr.num_rows
+    offsets, in_offsets = csr.offsets, reverse.offsets
+    start = end = None
+    first = -1  # first vertex with an edge
+    for v in range(n):
+        out_degree = offsets[v + 1] - offsets[v]
+        if first < 0 and (out_degree or in_offsets[v + 1] - in_offsets[v]):
+            first = v
+        if directed:
+            balance = out_degree - (in_offsets[v + 1] - in_offsets[v])
+            if balance == 0:
+                continue
+            if not path or abs(balance) > 1:
+                return None
+            if balance == 1:
+                if start is not None:
+                    return None
+                start = v
+            else:
+                if end is not None:
+                    return None
+                end = v
+        elif out_degree % 2:
+            if not path or end is not None:
+                return None
+            if start is None:
+                start = v
+            else:
+                end = v
+    if first < 0:
+        return -1, True
+    if start is None:
+        return (first, True) if _connected(csr, reverse, first) else None
+    return (start, False) if _connected(csr, reverse, start) else None
+
+
+def _connected(csr, reverse, start):
+    """True if every vertex with an edge is reachable from start, ignoring directions"""
+    n = csr.num_rows
+    seen = bytearray(n)
+    seen[start] = 1
+    stack = [start]
+    while stack:
+        u = stack.pop()
+        for adjacency in (csr,) if reverse is csr else (csr, reverse):
+            for v in adjacency.targets[adjacency.offsets[u]:adjacency.offsets[u + 1]]:
+                if not seen[v]:
+                    seen[v] = 1
+                    stack.append(v)
+    return all(seen[v] or (csr.degree(v) == 0 and reverse.degree(v) == 0) for v in range(n))
+
+
+def euler_tour(csr, start, directed, closed=True):
+    """
+    Yields the dense vertices of the Eulerian tour from start, as returned
+    by eulerian_start(): a circuit if closed, otherwise a path ending at the
+    other odd (unbalanced) vertex. Unused edges are taken in CSR row order.
+    """
+    offsets, targets = csr.offsets, csr.targets
+    n = csr.num_rows
+    # Edge id of every entry: the CSR slot itself for arcs
+    edge_ids = csr.edge_ids if not directed else range(len(targets))
+    copies, unused = _parallel_classes(offsets, targets, edge_ids, n)
+    taken = 1 if directed else 2  # entries of one edge
+    cursor = array('q', offsets[:-1])  # first entry of each row not known to be used
+
+    def next_entry(u):
+        """Advances the cursor of u past used edges; returns the entry or -1"""
+        pos, end = cursor[u], offsets[u + 1]
+        while pos < end and not unused[copies[edge_ids[pos]]]:
+            pos += 1
+        cursor[u] = pos
+        return pos if pos < end else -1
+
+    def walk(u, closed):
+        """Takes unused edges from u until it returns to u (closed) or gets stuck"""
+        vertices = array('i', [u])
+        v = u
+        while True:
+            pos = next_entry(v)
+            if pos < 0:
+                return vertices
+            unused[copies[edge_ids[pos]]] -= taken
+            v = targets[pos]
+            vertices.append(v)
+            if closed and v == u:
+                return vertices
+
+    stack = [[walk(start, closed), 0]]  # pending walks and their next position
+    while stack:
+        frame = stack[-1]
+        vertices, i = frame
+        if i == len(vertices):
+            stack.pop()
+            if stack:
+                stack[-1][1] += 1  # the finished walk replaced that position
+            continue
+        v = vertices[i]
+        if next_entry(v) >= 0:
+            stack.append([walk(v, True), 0])
+        else:
+            yield v
+            frame[1] = i + 1
+
+
+def _parallel_classes(offsets, targets, edge_ids, n):
+    """
+    Groups parallel edges: copies[e] is the id of the first copy of edge e
+    (the first entry with that target in both rows, as rows follow edge id
+    order), and unused[c] counts the entries of class c not yet taken.
+    The tour takes any copy of a class: a row entry stays usable while its
+    class has one left. Without parallel edges this is a used-edge map.
+    """
+    copies = array('i', bytes(4 * len(targets)))
+    unused = array('i', bytes(4 * len(targets)))
+    for u in range(n):
+        first = {}
+        for pos in range(offsets[u], offsets[u + 1]):
+            e = edge_ids[pos]
+            c = copies[e] = first.setdefault(targets[pos], e)
+            unused[c] += 1
+    return copies, unused
@@ -0,0 +1,708 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from itertools import compress
+from operator import itemgetter
+
+from .csr import CSR
+from .edge_index import build_edge_index, choose_representation
+from .errors import GraphError, PajekFormatError
+from .heaps import WeightStats, weight_stats
+from .idmap import IdMap
+from .labels import LabelTable, LabelTableBuilder
+from .pajek import read_pajek, EDGE, VERTEX, VERTICES
+from .parallel import read_pajek_parallel
+from .snapshot import load_snapshot, save_snapshot
+
+# Kinds of the (kind, u, v, old_weight, new_weight) records of the change log,
+# and of the edge operations accepted by apply_delta()
+ADD_EDGE = 'add'
+REMOVE_EDGE = 'remove'
+SET_WEIGHT = 'weight'
+# Vertex operations accepted by apply_delta()
+ADD_VERTEX = 'add_vertex'
+REMOVE_VERTEX = 'remove_vertex'
+
+# Oldest half of the change log is dropped when it grows past this many records
+CHANGE_LOG_LIMIT = 1 << 16
+
+
+class AdjacencyView(Mapping):
+    """
+    Read-mostly dict-like view of the CSR rows, in external vertex ids:
+    vertex -> [(neighbor, weight), ...] for weighted graphs or vertex -> [neighbors].
+    Appending to a returned row adds the edge to the graph (add_edge).
+    """
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __getitem__(self, v):
+        return _Row(self._graph, v, self._graph._entries(v))
+
+    def get(self, v, default=None):
+        if self._graph.grau(v) == 0:
+            return default
+        return self[v]
+
+    def __contains__(self, v):
+        return self._graph.grau(v) > 0
+
+    def __iter__(self):
+        graph = self._graph
+        for i in range(len(graph.ids)):
+            if graph._degree(i) > 0:
+                yield graph.ids.id(i)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _Row(list):
+    """Row returned by AdjacencyView; append() adds the edge to the graph (add_edge)"""
+    def __init__(self, graph, v, entries):
+        super().__init__(entries)
+        self._graph = graph
+        self._v = v
+
+    def append(self, entry):
+        if self._graph.weighted:
+            self._graph.add_edge(self._v, entry[0], entry[1])
+        else:
+            self._graph.add_edge(self._v, entry)
+        super().append(entry)
+
+
+class EdgeView(Sequence):
+    """Edges in file order as (u, v, weight) tuples, or (u, v) for unweighted graphs"""
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __len__(self):
+        return self._graph.edge_count
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        g = self._graph
+        src, dst, wt = g.edge_arrays
+        u, v = g.ids.id(src[k]), g.ids.id(dst[k])
+        if g.weighted:
+            return u, v, wt[k]
+        return u, v
+
+    def __iter__(self):
+        g = self._graph
+        ids = g.ids.ids
+        src, dst, wt = g.edge_arrays
+        if g.weighted:
+            return ((ids[u], ids[v], w) for u, v, w in zip(src, dst, wt))
+        return ((ids[u], ids[v]) for u, v in zip(src, dst))
+
+
+def _patch_weight_stats(stats, changes):
+    count, minimum, maximum, integral = stats
+    for kind, _, _, _, weight in changes:
+        if kind == REMOVE_EDGE:
+            count -= 1
+            continue
+        if kind == ADD_EDGE:
+            if not count:
+                minimum = maximum = weight
+            count += 1
+        elif kind != SET_WEIGHT:
+            continue
+        minimum, maximum = min(minimum, weight), max(maximum, weight)
+        integral = integral and float(weight).is_integer()
+    return WeightStats(count, minimum, maximum, integral)
+
+
+class CSRGraph:
+    """
+    Graph stored as an edge list in file order plus a CSR adjacency.
+    Subclasses choose the direction, whether weights are kept and the
+    Pajek section they read (*edges or *arcs).
+
+    Vertices are compacted to dense indices 0..n-1 (ascending external id)
+    when the graph is loaded; the arrays (csr, reverse_csr and the edge list)
+    are indexed by them and ids translates back. The methods below take and
+    return external ids, as before.
+
+    The graph can also be changed in place (add_edge, remove_edge,
+    set_weight, add_vertex, remove_vertex, apply_delta). Every change bumps
+    version and is recorded in a change log. Edge changes are O(1) or
+    O(deg): removed edges are marked dead, added ones are appended to the
+    edge list and kept in a per-row overlay, and the methods above read
+    through both. The dense arrays are compacted once per version, when
+    csr, reverse_csr or edge_arrays is next read; edge ids are positions
+    in that compacted edge list. Removing a vertex, or adding one below
+    the largest id, re-indexes the dense arrays in O(n + m).
+    """
+    directed = False
+    weighted = True
+    section = '*edges'
+
+    def __init__(self):
+        self.vertices = LabelTable.empty()  # vertex id -> label
+        self.vertex_count = 0
+        self.edge_count = 0
+        self.ids = IdMap(array('q'))  # external id <-> dense index
+        self.version = 0  # bumped by every change made through the mutation methods
+        self._src = array('i')  # edge k = (_src[k], _dst[k], _wt[k]), dense indices
+        self._dst = array('i')
+        self._wt = array('d')
+        self._out = CSR(array('q', [0]), array('i'), array('d') if self.weighted else None)
+        self._in = None  # reverse CSR, built on demand for directed graphs
+        self._snapshot = None  # memory map backing the arrays when loaded from a snapshot
+        self._edge_index = None  # haAresta/peso structure, built on the first lookup
+        self._edge_index_csr = None  # the CSR that _edge_index was built from
+        # Mutation state, set up by the first change (_own_arrays)
+        self._owned = False  # arrays are private copies that can be changed in place
+        self._alive = None  # bytearray: alive[k] is 0 once edge k is removed
+        self._removed = 0  # dead edges not yet compacted away
+        self._extra = {}  # dense index -> ids of the edges added to its row since the last compaction
+        self._log = []  # (version, (kind, u, v, old_weight, new_weight)) in dense indices
+        self._log_start = 0  # the log holds every change made after this version
+        self._cache = {}  # key -> (version, value), see cached()
+
+    def qtdVertices(self):
+        """Returns the number of vertices"""
+        return self.vertex_count
+
+    def qtdArestas(self):
+        """Returns the number of edges"""
+        return self.edge_count
+
+    def grau(self, v):
+        """Returns the degree (out-degree for directed graphs) of vertex v"""
+        i = self.ids.get(v)
+        return self._degree(i) if i >= 0 else 0
+
+    def rotulo(self, v):
+        """Returns the label of vertex v (GraphError if loaded with labels=False)"""
+        return self.vertices.get(v, "No Key Found")
+
+    def vizinhos(self, v):
+        """Returns the neighbors (out-neighbors for directed graphs) of vertex v"""
+        i = self.ids.get(v)
+        if i < 0:
+            return []
+        return self.ids.to_ids(self._targets(i))
+
+    def haAresta(self, u, v):
+        """Returns True if edge {u, v} (arc (u, v) for directed graphs) exists"""
+        return self._lookup(u, v) is not None
+
+    def peso(self, u, v):
+        """Returns the weight of edge {u, v} if it exists, otherwise infinity"""
+        weight = self._lookup(u, v)
+        return float('inf') if weight is None else weight
+
+    @property
+    def representation(self):
+        """
+        Edge lookup structure chosen from the density after loading:
+        'dense-matrix' (O(1) haAresta/peso) or 'sorted-csr' (O(log deg))
+        """
+        return choose_representation(self._out)
+
+    @property
+    def weight_stats(self):
+        """
+        WeightStats (count, minimum, maximum, integral) of the edge weights,
+        from which the shortest-path queue is chosen. Gathered once after
+        loading; later weight changes and added edges are folded in, while
+        removed edges only leave the bounds looser.
+        """
+        return self.cached('weight_stats', self._weight_stats, _patch_weight_stats)
+
+    @property
+    def adjacency_list(self):
+        """Dict-like view: vertex -> [(neighbor, weight), ...] or vertex -> [neighbors]"""
+        return AdjacencyView(self)
+
+    @property
+    def edges(self):
+        """Edges in file order"""
+        return EdgeView(self)
+
+    @property
+    def edge_arrays(self):
+        """Edge list over dense indices as parallel arrays (src, dst, weights)"""
+        self._compact()
+        return self._src, self._dst, self._wt
+
+    @property
+    def csr(self):
+        """CSR adjacency over dense indices (out-edges for directed graphs)"""
+        self._compact()
+        return self._out
+
+    @property
+    def reverse_csr(self):
+        """CSR of the in-edges over dense indices (the same as csr for undirected graphs)"""
+        if not self.directed:
+            return self.csr
+        return self._reverse()
+
+    def predecessores(self, v):
+        """Returns the in-neighbors of vertex v (same as vizinhos for undirected graphs)"""
+        if not self.directed:
+            return self.vizinhos(v)
+        i = self.ids.get(v)
+        if i < 0:
+            return []
+        return self.ids.to_ids(self._reverse().row(i))
+
+    def grauEntrada(self, v):
+        """Returns the in-degree of vertex v"""
+        if not self.directed:
+            return self.grau(v)
+        i = self.ids.get(v)
+        return self._reverse().degree(i) if i >= 0 else 0
+
+    def transposto(self):
+        """Returns the graph with every arc reversed, sharing the vertex labels"""
+        g = self.__class__()
+        g.vertices = self.vertices
+        g.vertex_count = self.vertex_count
+        g.edge_count = self.edge_count
+        g.ids = self.ids
+        src, dst, wt = self.edge_arrays
+        g._src, g._dst, g._wt = dst, src, wt
+        if self.directed:
+            g._out = self._reverse()
+            g._in = self.csr
+        else:
+            g._out = self.csr
+        self._owned = False  # the arrays are shared now: copy them before the next change
+        return g
+
+    def add_edge(self, u, v, weight=1.0):
+        """Adds edge {u, v} (arc (u, v) for directed graphs); both vertices must exist"""
+        self._add_edge(u, v, weight)
+        return self._bump()
+
+    def remove_edge(self, u, v):
+        """Removes the first edge {u, v} in file order; GraphError if there is none"""
+        self._remove_edge(u, v)
+        return self._bump()
+
+    def set_weight(self, u, v, weight):
+        """Changes the weight of the first edge {u, v} in file order; GraphError if there is none"""
+        self._set_weight(u, v, weight)
+        return self._bump()
+
+    def add_vertex(self, v, label=None):
+        """Adds vertex v without edges (label defaults to the id)"""
+        self._add_vertex(v, label)
+        return self._bump()
+
+    def remove_vertex(self, v):
+        """Removes vertex v and its edges"""
+        self._remove_vertex(v)
+        return self._bump()
+
+    def apply_delta(self, changes):
+        """
+        Applies a batch of changes as a single new version. Each change is a tuple:
+            ('add', u, v[, weight])    ('remove', u, v)    ('weight', u, v, weight)
+            ('add_vertex', v[, label]) ('remove_vertex', v)
+        Returns the new version. Raises GraphError on an unknown change; the
+        changes before it stay applied.
+        """
+        operations = {
+            ADD_EDGE: self._add_edge, REMOVE_EDGE: self._remove_edge, SET_WEIGHT: self._set_weight,
+            ADD_VERTEX: self._add_vertex, REMOVE_VERTEX: self._remove_vertex,
+        }
+        try:
+            for change in changes:
+                operation = operations.get(change[0])
+                if operation is None:
+                    raise GraphError(f"unknown change {change!r}")
+                operation(*change[1:])
+        finally:
+            version = self._bump()
+        return version
+
+    def changes_since(self, version):
+        """
+        Returns the (kind, u, v, old_weight, new_weight) records, in dense
+        indices, of the edge changes made after version, or None if they are
+        no longer known (the log was trimmed or the vertices were re-indexed)
+        """
+        if version < self._log_start:
+            return None
+        start = bisect_right(self._log, version, key=itemgetter(0))
+        return [change for _, change in self._log[start:]]
+
+    def cached(self, key, build, patch=None):
+        """
+        Returns a result derived from the graph (an SSSP tree, a degree
+        ordering, ...), cached under key for the current version.
+        build() computes it from scratch. When the graph changed since it was
+        cached, patch(value, changes) is tried first with the changes made
+        since; it returns the updated value, or None to rebuild.
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            version, value = entry
+            if version == self.version:
+                return value
+            changes = self.changes_since(version) if patch is not None else None
+            value = patch(value, changes) if changes is not None else None
+        else:
+            value = None
+        if value is None:
+            value = build()
+        self._cache[key] = (self.version, value)
+        return value
+
+    def ler(self, arquivo, snapshot=True, workers=1, labels=True):
+        """
+        Load graph from a Pajek file, streaming it record by record.
+        With snapshot=True a binary snapshot next to the file is reused when
+        it is up to date, and written after parsing otherwise.
+        With workers > 1 a large edge section is parsed by a process pool.
+        With labels=False the vertex labels are not stored (rotulo() then
+        raises GraphError), for algorithms that never print them.
+        Raises FileNotFoundError or PajekFormatError.
+        """
+        if self.vertices or self._src:
+            raise GraphError("ler() must be called on an empty graph")
+        if snapshot and load_snapshot(self, arquivo, labels):
+            return
+
+        builder = LabelTableBuilder(keep_labels=labels)
+        edges = read_pajek_parallel(self, arquivo, workers, builder) if workers > 1 else None
+        if edges is None:
+            builder = LabelTableBuilder(keep_labels=labels)
+            edges = self._read_records(arquivo, builder)
+        src, dst, wt = edges
+
+        # Compact the external ids to dense indices once, here
+        self.ids = IdMap.from_ids(builder.vertex_ids)
+        n = self.vertex_count
+        if len(self.ids) < n and all(1 <= v <= n for v in self.ids.ids):
+            # Pajek allows omitting vertex lines: the vertices are still 1..n
+            self.ids = IdMap(array('q', range(1, n + 1)))
+        self.vertex_count = len(self.ids)
+        self.vertices = builder.build(self.ids)
+        try:
+            self._src = self.ids.to_indices(src)
+            self._dst = self.ids.to_indices(dst)
+        except KeyError as e:
+            raise PajekFormatError(arquivo, None, f"edge endpoint {e.args[0]} is not a declared vertex") from None
+        if self.weighted:
+            self._wt = wt
+        self._build()
+        if snapshot:
+            save_snapshot(self, arquivo)
+
+    def _read_records(self, arquivo, builder):
+        """
+        Sequential single-pass load of the vertex lines into builder.
+        Returns the edge arrays (src, dst, weights) in external ids.
+        """
+        src, dst, wt = array('q'), array('q'), array('d')
+        weighted = self.weighted
+
+        for record in read_pajek(arquivo, self.section):
+            kind = record[0]
+            if kind == EDGE:
+                src.append(record[1])
+                dst.append(record[2])
+                if weighted:
+                    wt.append(record[3])
+            elif kind == VERTEX:
+                builder.add(record[1], record[2])
+            elif kind == VERTICES:
+                self.vertex_count = record[1]
+        return src, dst, wt
+
+    def get_all_vertices(self):
+        """Helper method to get all vertex ids, in ascending order"""
+        return self.ids.ids.tolist()
+
+    def _build(self):
+        """Builds the CSR adjacency from the dense edge list"""
+        weights = self._wt if self.weighted else None
+        self._out = CSR.from_edges(len(self.ids), self._src, self._dst, weights,
+                                   undirected=not self.directed, edge_ids=self._owned)
+        self._in = None
+        self.edge_count = len(self._src)
+
+    def _weight_stats(self):
+        if not self.weighted:
+            return WeightStats(self.edge_count, 1.0, 1.0, True)
+        return weight_stats(self.edge_arrays[2])
+
+    def _bump(self):
+        """Starts a new version after a change"""
+        self.version += 1
+        if len(self._log) > CHANGE_LOG_LIMIT:
+            del self._log[:len(self._log) // 2]
+            self._log_start = self._log[0][0]
+        return self.version
+
+    def _record(self, kind, i, j, old_weight, new_weight):
+        self._log.append((self.version + 1, (kind, i, j, old_weight, new_weight)))
+        self._in = None
+
+    def _own_arrays(self):
+        """
+        Before the first change: copies the arrays (which may be mapped from a
+        snapshot or shared with a transposed graph) and tags the CSR entries
+        with their edge ids
+        """
+        if self._owned:
+            return
+        self._owned = True
+        self._src, self._dst = array('i', self._src), array('i', self._dst)
+        self._wt = array('d', self._wt)
+        self.ids = IdMap(array('q', self.ids.ids))
+        self.vertices = self.vertices.mutable_copy(self.ids)
+        self._alive = bytearray(b'\x01') * len(self._src)
+        self._build()
+
+    def _vertex(self, v):
+        i = self.ids.get(v)
+        if i < 0:
+            raise GraphError(f"vertex {v} does not exist")
+        return i
+
+    def _add_edge(self, u, v, weight=1.0):
+        i, j = self._vertex(u), self._vertex(v)
+        self._own_arrays()
+        k = len(self._src)
+        self._src.append(i)
+        self._dst.append(j)
+        if self.weighted:
+            self._wt.append(weight)
+        self._alive.append(1)
+        self._extra.setdefault(i, []).append(k)
+        if not self.directed:
+            self._extra.setdefault(j, []).append(k)
+        self.edge_count += 1
+        self._record(ADD_EDGE, i, j, None, weight if self.weighted else 1.0)
+
+    def _remove_edge(self, u, v):
+        i, j = self._vertex(u), self._vertex(v)
+        self._own_arrays()
+        k = self._find(i, j)
+        if k < 0:
+            raise GraphError(f"edge ({u}, {v}) does not exist")
+        self._alive[k] = 0
+        self._removed += 1
+        self.edge_count -= 1
+        self._record(REMOVE_EDGE, i, j, self._wt[k] if self.weighted else 1.0, None)
+
+    def _set_weight(self, u, v, weight):
+        if not self.weighted:
+            raise GraphError("set_weight() on an unweighted graph")
+        i, j = self._vertex(u), self._vertex(v)
+        self._own_arrays()
+        k = self._find(i, j)
+        if k < 0:
+            raise GraphError(f"edge ({u}, {v}) does not exist")
+        old = self._wt[k]
+        self._wt[k] = weight
+        # Patch the CSR entries of a compacted edge in place
+        out = self._out
+        for row in ((i,) if self.directed else (i, j)):
+            for pos in range(out.offsets[row], out.offsets[row + 1]):
+                if out.edge_ids[pos] == k:
+                    out.weights[pos] = weight
+        self._record(SET_WEIGHT, i, j, old, weight)
+
+    def _add_vertex(self, v, label=None):
+        if v in self.ids:
+            raise GraphError(f"vertex {v} already exists")
+        self._own_arrays()
+        ids = self.ids.ids
+        if len(ids) == 0 or v > ids[-1]:
+            # Appended: no dense index moves
+            self.ids.append(v)
+            self.vertices.append(label)
+            self._out.offsets.append(self._out.offsets[-1])
+            self.vertex_count += 1
+            self._in = None
+        else:
+            position = bisect_right(ids, v)
+            old_indices = list(range(position)) + [-1] + list(range(position, len(ids)))
+            self._reindex(array('q', [*ids[:position], v, *ids[position:]]), old_indices)
+            self.vertices.set_label(position, label)
+
+    def _remove_vertex(self, v):
+        i = self._vertex(v)
+        self._own_arrays()
+        for k in range(len(self._src)):
+            if self._alive[k] and (self._src[k] == i or self._dst[k] == i):
+                self._alive[k] = 0
+                self._removed += 1
+                self.edge_count -= 1
+                self._record(REMOVE_EDGE, self._src[k], self._dst[k],
+                             self._wt[k] if self.weighted else 1.0, None)
+        ids = self.ids.ids
+        old_indices = [*range(i), *range(i + 1, len(ids))]
+        self._reindex(array('q', [ids[k] for k in old_indices]), old_indices)
+
+    def _reindex(self, ids, old_indices):
+        """Moves the graph to new dense indices; old_indices[i] is the old index of new vertex i, or -1"""
+        self._compact()
+        new_index = array('i', [-1]) * len(self.ids)
+        for i, k in enumerate(old_indices):
+            if k >= 0:
+                new_index[k] = i
+        self._src = array('i', [new_index[u] for u in self._src])
+        self._dst = array('i', [new_index[v] for v in self._dst])
+        self.ids = IdMap(ids)
+        self.vertices = self.vertices.reindexed(self.ids, old_indices).mutable_copy(self.ids)
+        self.vertex_count = len(ids)
+        self._build()
+        # Changes recorded so far refer to the old indices
+        self._log.clear()
+        self._log_start = self.version + 1
+
+    def _compact(self):
+        """Drops the dead edges and folds the added ones into the CSR"""
+        if not self._extra and not self._removed:
+            return
+        alive = self._alive
+        if self._removed:
+            self._src = array('i', compress(self._src, alive))
+            self._dst = array('i', compress(self._dst, alive))
+            if self.weighted:
+                self._wt = array('d', compress(self._wt, alive))
+        self._alive = bytearray(b'\x01') * len(self._src)
+        self._removed = 0
+        self._extra = {}
+        self._build()
+
+    def _dirty(self):
+        return bool(self._extra) or self._removed > 0
+
+    def _live(self, i):
+        """Yields (target, weight, edge id) for the live entries of row i, in file order"""
+        out, alive, wt = self._out, self._alive, self._wt
+        weighted = self.weighted
+        for pos in range(out.offsets[i], out.offsets[i + 1]):
+            k = out.edge_ids[pos]
+            if alive[k]:
+                yield out.targets[pos], wt[k] if weighted else 1.0, k
+        for k in self._extra.get(i, ()):
+            if alive[k]:
+                yield self._other(k, i), wt[k] if weighted else 1.0, k
+
+    def _other(self, k, i):
+        """The endpoint of edge k seen from row i"""
+        return self._dst[k] if self._src[k] == i else self._src[k]
+
+    def _degree(self, i):
+        if not self._dirty():
+            return self._out.degree(i)
+        return sum(1 for _ in self._live(i))
+
+    def _index(self):
+        if self._edge_index is None or self._edge_index_csr is not self._out:
+            self._edge_index = build_edge_index(self.representation, self._out)
+            self._edge_index_csr = self._out
+        return self._edge_index
+
+    def _find(self, i, j):
+        """Edge id of the first live entry i -> j in file order, or -1 (after _own_arrays)"""
+        alive, edge_ids = self._alive, self._out.edge_ids
+        for pos in self._index().slots(i, j):
+            if alive[edge_ids[pos]]:
+                return edge_ids[pos]
+        for k in self._extra.get(i, ()):
+            if alive[k] and self._other(k, i) == j:
+                return k
+        return -1
+
+    def _lookup(self, u, v):
+        """Weight of the first entry u -> v (1.0 on unweighted graphs), or None"""
+        i, j = self.ids.get(u), self.ids.get(v)
+        if i < 0 or j < 0:
+            return None
+        if not self._dirty():
+            return self._index().weight(i, j)
+        k = self._find(i, j)
+        if k < 0:
+            return None
+        return self._wt[k] if self.weighted else 1.0
+
+    def _targets(self, i):
+        """Dense targets of row i"""
+        if not self._dirty():
+            return self._out.row(i)
+        return [t for t, _, _ in self._live(i)]
+
+    def _entries(self, v):
+        """Row of vertex v in external ids: (neighbor, weight) tuples for weighted graphs, neighbors otherwise"""
+        i = self.ids.get(v)
+        if i < 0:
+            return []
+        if not self.weighted:
+            return self.ids.to_ids(self._targets(i))
+        if self._dirty():
+            return [(self.ids.id(t), w) for t, w, _ in self._live(i)]
+        start, end = self._out.bounds(i)
+        return list(zip(self.ids.to_ids(self._out.targets[start:end]), self._out.weights[start:end]))
+
+    def _reverse(self):
+        if self._in is None or self._dirty():
+            self._in = self.csr.transpose()
+        return self._in
+
+    def nbytes(self):
+        """Returns the memory held by the edge and CSR arrays, in bytes"""
+        total = self._out.nbytes()
+        if self._in is not None:
+            total += self._in.nbytes()
+        for arr in (self._src, self._dst, self._wt, self.ids.ids):
+            total += arr.itemsize * len(arr)
+        if self._alive is not None:
+            total += len(self._alive)
+        if self._edge_index is not None:
+            total += self._edge_index.nbytes()
+        return total + self.vertices.nbytes()
+
+
+class Graph(CSRGraph):
+    """Class to represent an undirected weighted graph"""
+
+
+class DirectedGraph(CSRGraph):
+    """Class to represent a directed graph (for SCC and Topological Sort)"""
+    directed = True
+    weighted = False
+    section = '*arcs'
+
+
+class DirectedWeightedGraph(CSRGraph):
+    """Class to represent a directed weighted graph (for flow algorithms)"""
+    directed = True
+    section = '*arcs'
+
+    def capacidade(self, u, v):
+        """Returns the capacity of edge (u, v)"""
+        weight = self.peso(u, v)
+        return 0 if weight == float('inf') else weight
+
+
+class UndirectedGraph(CSRGraph):
+    """Class to represent an undirected unweighted graph (for coloring)"""
+    weighted = False
+
+
+class BipartiteGraph(UndirectedGraph):
+    """Class to represent a bipartite graph (for Hopcroft-Karp)"""
+    def __init__(self):
+        super().__init__()
+        self.partition1 = []  # First partition
+        self.partition2 = []  # Second partition
+
+    def set_bipartition(self, partition1, partition2):
+        """Set the two partitions of the bipartite graph"""
+        self.partition1 = partition1
+        self.partition2 = partition2
@@ -0,0 +1,303 @@
+"""
+Priority queues over dense vertices for Dijkstra-style searches.
+
+A queue orders the vertices by a key array owned by the caller (the
+tentative distances): push(v) inserts v, or moves it after the caller
+lowered keys[v], and pop() removes and returns the vertex with the
+smallest key, or -1 once no vertex is left. Ties go to the smallest
+vertex, as with heapq over (distance, vertex) tuples, so every queue
+settles vertices in the same order and the trees are identical. Keys must
+never drop below the last key popped, which Dijkstra guarantees with
+non-negative weights; only 'heapq' also lets a popped vertex come back
+with a smaller key, as negative weights need.
+
+    'heapq'  binary heap of (key, vertex) tuples with lazy deletion: a
+             decrease-key pushes a new tuple and the stale one is skipped
+             when popped, so the heap can hold O(m) entries
+    'dial'   Dial's buckets: a circular array of max_weight + 1 buckets
+             indexed by the integer key; for integer weights up to
+             DIAL_MAX_WEIGHT, where scanning empty buckets is cheap
+    'radix'  radix heap: bucket i holds the keys that differ from the last
+             key popped in bit i - 1 at the highest; for any non-negative
+             integer weights, O(log C) amortized per vertex
+    'dary'   indexed 4-ary heap with a position per vertex and a true
+             decrease-key, so it never holds more than n entries
+
+choose_queue() picks one from the WeightStats of the graph: Dial's buckets
+for integer weights up to DIAL_MAX_WEIGHT, heapq otherwise. The radix and
+4-ary heaps do their bucket and sift work in Python, which loses to the C
+heapq even where their bounds are better (benchmarks/bench_queues.py), so
+they are only used when asked for: the 4-ary heap to keep the queue within
+n entries, the radix heap for integer weights too wide for Dial. Every
+queue counts pushes (decrease-keys included), pops and the peak number of
+entries it held, which stats() returns.
+"""
+from array import array
+from collections import namedtuple
+from heapq import heappop, heappush
+
+HEAPQ = 'heapq'
+DIAL = 'dial'
+RADIX = 'radix'
+DARY = 'dary'
+QUEUES = (HEAPQ, DIAL, RADIX, DARY)
+
+# Dial's buckets are used for integer weights up to this value: a pop may
+# scan up to max_weight empty buckets, which grows with the range on graphs
+# of long diameter such as grids
+DIAL_MAX_WEIGHT = 1 << 10
+
+WeightStats = namedtuple('WeightStats', 'count minimum maximum integral')
+WeightStats.__doc__ = """Edge weight summary: count, smallest and largest weight, and whether all are integers"""
+
+
+def weight_stats(weights):
+    """WeightStats of a weight array"""
+    if not weights:
+        return WeightStats(0, 0.0, 0.0, True)
+    return WeightStats(len(weights), min(weights), max(weights), all(map(float.is_integer, weights)))
+
+
+def _integer_keys(stats):
+    """True if all weights are non-negative integers, so distances are exact integers"""
+    return stats.minimum >= 0 and stats.integral and stats.maximum < 1 << 53
+
+
+def choose_queue(stats):
+    """Returns the queue kind for a graph with the given WeightStats"""
+    if stats.count and _integer_keys(stats) and stats.maximum <= DIAL_MAX_WEIGHT:
+        return DIAL
+    return HEAPQ
+
+
+def make_queue(kind, keys, stats=None):
+    """
+    Builds an empty queue of the given kind over keys, for weights with the
+    given WeightStats. Raises ValueError for an unknown kind, or for 'dial'
+    and 'radix' when the weights are not integers they can hold.
+    """
+    if kind in (DIAL, RADIX) and stats is not None and not _integer_keys(stats):
+        raise ValueError(f"queue {kind!r} needs non-negative integer weights")
+    if kind == DIAL and stats is not None and stats.maximum > DIAL_MAX_WEIGHT:
+        raise ValueError(f"queue {kind!r} needs weights up to {DIAL_MAX_WEIGHT}, the largest is {stats.maximum:g}")
+    if kind == HEAPQ:
+        return HeapQueue(keys)
+    if kind == DIAL:
+        return DialQueue(keys, int(stats.maximum) if stats is not None else DIAL_MAX_WEIGHT)
+    if kind == RADIX:
+        return RadixHeap(keys)
+    if kind == DARY:
+        return IndexedDaryHeap(keys)
+    raise ValueError(f"unknown queue {kind!r}, expected one of {', '.join(QUEUES)}")
+
+
+class _Counted:
+    """Push/pop counters and the peak number of entries held"""
+    def __init__(self, keys):
+        self.keys = keys
+        self.pushes = 0
+        self.pops = 0
+        self.peak = 0
+
+    def stats(self):
+        return {'queue': self.kind, 'pushes': self.pushes, 'pops': self.pops, 'peak': self.peak}
+
+
+class HeapQueue(_Counted):
+    """
+    Entries whose key is above the vertex's current key are stale. The
+    counters are kept by pop() alone (the heap only grows between pops),
+    which keeps push() as cheap as a bare heappush.
+    """
+    kind = HEAPQ
+
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.heap = []
+        self.removed = 0  # entries popped, stale ones included
+
+    def stats(self):
+        self.pushes = self.removed + len(self.heap)
+        return super().stats()
+
+    def push(self, v):
+        heappush(self.heap, (self.keys[v], v))
+
+    def pop(self):
+        heap, keys = self.heap, self.keys
+        if len(heap) > self.peak:
+            self.peak = len(heap)
+        while heap:
+            k, v = heappop(heap)
+            self.removed += 1
+            if k <= keys[v]:
+                self.pops += 1
+                return v
+        return -1
+
+
+class DialQueue(_Counted):
+    """
+    Buckets of vertices by integer key, each a heap for the smallest-vertex
+    tie rule. An entry is stale once keys[v] no longer matches its bucket.
+    """
+    kind = DIAL
+
+    def __init__(self, keys, max_weight):
+        super().__init__(keys)
+        self.width = max_weight + 1  # keys in the queue span at most max_weight
+        self.buckets = [[] for _ in range(self.width)]
+        self.current = 0  # key of the bucket being emptied
+        self.size = 0  # entries held, stale ones included
+
+    def push(self, v):
+        heappush(self.buckets[int(self.keys[v]) % self.width], v)
+        self.pushes += 1
+        self.size += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        buckets, keys, width = self.buckets, self.keys, self.width
+        current = self.current
+        while self.size:
+            bucket = buckets[current % width]
+            while bucket:
+                v = heappop(bucket)
+                self.size -= 1
+                if keys[v] == current:
+                    self.current = current
+                    self.pops += 1
+                    return v
+            current += 1
+        self.current = current
+        return -1
+
+
+class RadixHeap(_Counted):
+    """
+    Bucket 0 holds the vertices whose key equals the last key popped (a
+    heap of vertices); bucket i > 0 holds (key, v) entries whose key first
+    differs from it in bit i - 1. Popping an empty bucket 0 moves the
+    smallest key of the first non-empty bucket into it and spreads that
+    bucket over the lower ones. An entry is stale once keys[v] differs.
+    """
+    kind = RADIX
+
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+
+    def push(self, v):
+        key = int(self.keys[v])
+        i = (key ^ self.last).bit_length()
+        if i:
+            buckets = self.buckets
+            while len(buckets) <= i:
+                buckets.append([])
+            buckets[i].append((key, v))
+        else:
+            heappush(self.buckets[0], v)
+        self.pushes += 1
+        self.size += 1
+        if self.size > self.peak:
+            self.peak = self.size
+
+    def pop(self):
+        buckets, keys = self.buckets, self.keys
+        first = buckets[0]
+        while self.size:
+            while first:
+                v = heappop(first)
+                self.size -= 1
+                if keys[v] == self.last:
+                    self.pops += 1
+                    return v
+            i = 1
+            while not buckets[i]:
+                i += 1
+            entries = buckets[i]
+            buckets[i] = []
+            live = [entry for entry in entries if keys[entry[1]] == entry[0]]
+            self.size -= len(entries) - len(live)
+            if live:
+                # Every live entry moves to a lower bucket, those at the new minimum to bucket 0
+                last = self.last = min(live)[0]
+                for key, v in live:
+                    j = (key ^ last).bit_length()
+                    if j:
+                        buckets[j].append((key, v))
+                    else:
+                        first.append(v)
+                first.sort()
+        return -1
+
+
+class IndexedDaryHeap(_Counted):
+    """4-ary heap of vertices ordered by (keys[v], v), with pos[v] its slot (-1 if absent)"""
+    kind = DARY
+
+    def __init__(self, keys):
+        super().__init__(keys)
+        self.heap = array('i')
+        self.pos = array('i', [-1]) * len(keys)
+
+    def push(self, v):
+        i = self.pos[v]
+        if i < 0:
+            i = len(self.heap)
+            self.heap.append(v)
+            if i + 1 > self.peak:
+                self.peak = i + 1
+        self.pushes += 1
+        self._sift_up(i, v)
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        if not heap:
+            return -1
+        top = heap[0]
+        last = heap.pop()
+        if heap:
+            self._sift_down(0, last)
+        pos[top] = -1
+        self.pops += 1
+        return top
+
+    def _sift_up(self, i, v):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        entry = (keys[v], v)
+        while i:
+            parent = (i - 1) >> 2
+            u = heap[parent]
+            if (keys[u], u) <= entry:
+                break
+            heap[i] = u
+            pos[u] = i
+            i = parent
+        heap[i] = v
+        pos[v] = i
+
+    def _sift_down(self, i, v):
+        heap, pos, keys = self.heap, self.pos, self.keys
+        n = len(heap)
+        entry = (keys[v], v)
+        while True:
+            child = 4 * i + 1
+            if child >= n:
+                break
+            best = heap[child]
+            best_entry = (keys[best], best)
+            for c in range(child + 1, min(child + 4, n)):
+                u = heap[c]
+                if (keys[u], u) < best_entry:
+                    best, best_entry, child = u, (keys[u], u), c
+            if entry <= best_entry:
+                break
+            heap[i] = best
+            pos[best] = i
+            i = child
+        heap[i] = v
+        pos[v] = i
@@ -0,0 +1,87 @@
+from array import array
+from bisect import bisect_left
+
+
+class IdMap:
+    """
+    Bidirectional map between external (Pajek) vertex ids and dense indices 0..n-1.
+
+    Dense indices follow ascending external id, so comparing or sorting
+    indices gives the same order as the ids. When the ids form a contiguous
+    range (the usual 1..n) both directions are a subtraction or addition;
+    otherwise index() is a binary search over the sorted id array.
+    """
+    __slots__ = ('ids', 'base', 'contiguous')
+
+    def __init__(self, ids):
+        self.ids = ids  # array('q') of sorted, unique external ids
+        n = len(ids)
+        self.base = ids[0] if n else 0
+        self.contiguous = n == 0 or ids[n - 1] - ids[0] == n - 1
+
+    @classmethod
+    def from_ids(cls, ids):
+        """Builds the map from any iterable of external ids"""
+        return cls(array('q', sorted(set(ids))))
+
+    def append(self, vertex_id):
+        """Adds a vertex id greater than every current one; its dense index is the last"""
+        ids = self.ids
+        n = len(ids)
+        if n and vertex_id <= ids[n - 1]:
+            raise ValueError(f"{vertex_id} is not greater than the last id {ids[n - 1]}")
+        if n == 0:
+            self.base = vertex_id
+        self.contiguous = self.contiguous and (n == 0 or vertex_id == ids[n - 1] + 1)
+        ids.append(vertex_id)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, vertex_id):
+        return self.get(vertex_id) >= 0
+
+    def get(self, vertex_id, default=-1):
+        """Returns the dense index of vertex_id, or default if it is not a vertex"""
+        if self.contiguous:
+            i = vertex_id - self.base
+            return i if 0 <= i < len(self.ids) else default
+        i = bisect_left(self.ids, vertex_id)
+        if i < len(self.ids) and self.ids[i] == vertex_id:
+            return i
+        return default
+
+    def index(self, vertex_id):
+        """Returns the dense index of vertex_id; raises KeyError if it is not a vertex"""
+        i = self.get(vertex_id)
+        if i < 0:
+            raise KeyError(vertex_id)
+        return i
+
+    def id(self, i):
+        """Returns the external id of dense index i"""
+        return self.ids[i]
+
+    def to_ids(self, indices):
+        """Translates a sequence of dense indices to a list of external ids"""
+        if self.contiguous:
+            base = self.base
+            if base == 0:
+                return list(indices)
+            return [i + base for i in indices]
+        ids = self.ids
+        return [ids[i] for i in indices]
+
+    def to_indices(self, values):
+        """
+        Translates a sequence of external ids to an array('i') of dense indices.
+        Raises KeyError on the first id that is not a vertex.
+        """
+        if self.contiguous:
+            n, base = len(self.ids), self.base
+            out = [v - base for v in values]
+            if out and (min(out) < 0 or max(out) >= n):
+                raise KeyError(next(i + base for i in out if not 0 <= i < n))
+            return array('i', out)
+        lookup = {vertex_id: i for i, vertex_id in enumerate(self.ids)}
+        return array('i', [lookup[v] for v in values])
@@ -0,0 +1,145 @@
+from array import array
+from collections.abc import Mapping
+
+from .errors import GraphError
+from .idmap import IdMap
+
+NO_LABEL = -1  # the vertex has no label of its own: its label is its id
+
+
+class LabelTable(Mapping):
+    """
+    Read-only mapping vertex id -> label.
+
+    Distinct labels are stored once, back to back, in a single UTF-8 buffer
+    (blob) with an offsets array; each vertex keeps only the number of its
+    label. Labels are decoded when they are looked up, so a table mapped
+    from a snapshot costs nothing until rotulo() is called. A table built
+    with labels=False keeps the ids only and raises GraphError on lookup.
+    Tables are shared read-only; a graph being changed works on its own
+    mutable_copy().
+    """
+    def __init__(self, ids, index=None, offsets=None, blob=b''):
+        self.ids = ids          # IdMap of the vertices
+        self.index = index      # array('i'): dense index -> label number, or None if not loaded
+        self.offsets = offsets  # array('q'): label k is blob[offsets[k]:offsets[k + 1]]
+        self.blob = blob
+
+    @classmethod
+    def empty(cls):
+        return cls(IdMap(array('q')), array('i'), array('q', [0]))
+
+    @property
+    def loaded(self):
+        """False when the graph was loaded with labels=False"""
+        return self.index is not None
+
+    def label(self, i):
+        """Returns the label of dense index i"""
+        if self.index is None:
+            raise GraphError("vertex labels were not loaded (labels=False)")
+        k = self.index[i]
+        if k == NO_LABEL:
+            return str(self.ids.id(i))
+        return bytes(self.blob[self.offsets[k]:self.offsets[k + 1]]).decode('utf-8')
+
+    def __getitem__(self, vertex_id):
+        i = self.ids.get(vertex_id)
+        if i < 0:
+            raise KeyError(vertex_id)
+        return self.label(i)
+
+    def __contains__(self, vertex_id):
+        return vertex_id in self.ids
+
+    def __iter__(self):
+        return iter(self.ids.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def mutable_copy(self, ids):
+        """Returns a copy over ids with its own arrays, which append() can extend"""
+        if self.index is None:
+            return LabelTable(ids)
+        return LabelTable(ids, array('i', self.index), array('q', self.offsets), bytearray(self.blob))
+
+    def append(self, label=None):
+        """Records the label of the vertex just appended to ids (None: the id)"""
+        if self.index is not None:
+            self.index.append(NO_LABEL)
+            self.set_label(len(self.index) - 1, label)
+
+    def set_label(self, i, label):
+        """
+        Sets the label of dense index i (None: the id).
+        Only tables returned by mutable_copy() can be changed.
+        """
+        if self.index is None:
+            return
+        if label is None or label == str(self.ids.id(i)):
+            self.index[i] = NO_LABEL
+            return
+        self.blob += label.encode('utf-8')
+        self.offsets.append(len(self.blob))
+        self.index[i] = len(self.offsets) - 2
+
+    def reindexed(self, ids, old_indices):
+        """
+        Returns the table over new ids, where old_indices[i] is the old dense
+        index of new vertex i (-1 for a vertex without a label of its own)
+        """
+        if self.index is None:
+            return LabelTable(ids)
+        index = array('i', [self.index[k] if k >= 0 else NO_LABEL for k in old_indices])
+        return LabelTable(ids, index, self.offsets, self.blob)
+
+    def copy(self):
+        """The table is immutable, so copies can share it"""
+        return self
+
+    def nbytes(self):
+        """Returns the memory held by the table, in bytes"""
+        total = len(self.blob)
+        for arr in (self.index, self.offsets):
+            if arr is not None:
+                total += arr.itemsize * len(arr)
+        return total
+
+
+class LabelTableBuilder:
+    """Collects the vertex lines of a file, interning the labels as they arrive"""
+    def __init__(self, keep_labels=True):
+        self.keep_labels = keep_labels
+        self.vertex_ids = array('q')  # in file order
+        self.numbers = array('i')     # label number of each vertex line
+        self.offsets = array('q', [0])
+        self.blob = bytearray()
+        self._interned = {}
+
+    def __len__(self):
+        return len(self.vertex_ids)
+
+    def add(self, vertex_id, label):
+        self.vertex_ids.append(vertex_id)
+        if not self.keep_labels:
+            return
+        if label == str(vertex_id):
+            self.numbers.append(NO_LABEL)
+            return
+        k = self._interned.get(label)
+        if k is None:
+            k = self._interned[label] = len(self._interned)
+            self.blob += label.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        self.numbers.append(k)
+
+    def build(self, ids):
+        """Returns the LabelTable for the vertices of ids (later vertex lines win)"""
+        self._interned = {}
+        if not self.keep_labels:
+            return LabelTable(ids)
+        index = array('i', [NO_LABEL]) * len(ids)
+        for vertex_id, k in zip(self.vertex_ids, self.numbers):
+            index[ids.index(vertex_id)] = k
+        return LabelTable(ids, index, self.offsets, self.blob)
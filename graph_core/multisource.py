@@ -0,0 +1,94 @@
+"""
+Single-source computations from many sources on a process pool.
+
+The graph's CSR arrays and vertex ids are copied once into
+multiprocessing.shared_memory blocks; each worker attaches to them when it
+starts and sees a SharedGraph, a read-only stand-in with the csr, ids,
+directed and weight_stats attributes that the shortest-path code reads.
+Sources are then fanned out to the pool and the results streamed back in
+source order, so nothing is parsed or copied per source.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .csr import CSR
+from .idmap import IdMap
+
+# Sources handed to a worker per task
+CHUNKSIZE = 1
+
+_graph = None  # the SharedGraph of a worker process
+_blocks = []   # its attached shared memory blocks, kept open for the views
+
+
+class SharedGraph:
+    """Read-only graph over arrays in shared memory, as seen by the workers"""
+    __slots__ = ('csr', 'ids', 'directed', 'weight_stats')
+
+    def __init__(self, csr, ids, directed, weight_stats):
+        self.csr = csr
+        self.ids = ids
+        self.directed = directed
+        self.weight_stats = weight_stats
+
+    def qtdVertices(self):
+        return self.csr.num_rows
+
+
+def run_sources(graph, sources, solve, processes=None):
+    """
+    Yields solve(g, source) for each dense source index, in order, where g
+    is graph itself or its SharedGraph in a worker. solve must be a
+    module-level function, so that it can be sent to the workers. With one
+    process (or one source) everything runs in this process.
+    """
+    sources = list(sources)
+    processes = min(processes or os.cpu_count() or 1, len(sources))
+    if processes <= 1:
+        for source in sources:
+            yield solve(graph, source)
+        return
+
+    csr = graph.csr
+    arrays = {'offsets': csr.offsets, 'targets': csr.targets, 'ids': graph.ids.ids}
+    if csr.weights is not None:
+        arrays['weights'] = csr.weights
+    blocks = []
+    try:
+        spec = {}
+        for name, data in arrays.items():
+            view = memoryview(data)
+            block = shared_memory.SharedMemory(create=True, size=max(view.nbytes, 1))
+            blocks.append(block)
+            block.buf[:view.nbytes] = view.cast('B')
+            spec[name] = (block.name, view.format, len(view))
+        pool = ProcessPoolExecutor(processes, initializer=_attach,
+                                   initargs=(spec, graph.directed, graph.weight_stats))
+        try:
+            yield from pool.map(_solve, [solve] * len(sources), sources, chunksize=CHUNKSIZE)
+        finally:
+            # A consumer that stops early leaves the remaining sources unstarted
+            pool.shutdown(cancel_futures=True)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _attach(spec, directed, weight_stats):
+    """Worker initializer: maps the shared arrays and builds the SharedGraph"""
+    global _graph
+    views = {}
+    for name, (block_name, typecode, length) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _blocks.append(block)
+        itemsize = array(typecode).itemsize
+        views[name] = block.buf[:length * itemsize].cast(typecode) if length else array(typecode)
+    csr = CSR(views['offsets'], views['targets'], views.get('weights'))
+    _graph = SharedGraph(csr, IdMap(views['ids']), directed, weight_stats)
+
+
+def _solve(solve, source):
+    return solve(_graph, source)
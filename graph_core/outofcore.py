@@ -0,0 +1,186 @@
+"""
+All-pairs distances computed into a matrix file on disk.
+
+When the n x n matrix does not fit in memory, matrix_file() computes it
+into a file holding a header and then the matrix rows, mapped with
+numpy.memmap. The work goes in blocks of tile rows:
+
+- With the Dijkstra-based methods of graph_core.apsp, a row is one
+  source's distances, written as soon as its Dijkstra returns. Only the
+  current block of rows is mapped, so memory stays at tile rows.
+- With Floyd-Warshall, a block is a pivot block of
+  floyd_warshall_blocked() run over the whole mapped matrix, whose pages
+  the OS can drop once written back. Phase three goes to workers that map
+  the same file.
+
+After each block the matrix is flushed to disk, and only then is the
+count of completed rows (or pivots) written into the header. An
+interrupted run therefore resumes after the last completed block when
+called again. This needs the same source file, unchanged, and the same
+method and dtype; with Floyd-Warshall the tile must match too. Redoing a
+pivot block that was cut short is safe: its entries only ever held
+lengths of real paths.
+
+read_rows() streams a finished matrix back tile rows at a time.
+"""
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .apsp import DTYPES, FLOYD_WARSHALL, METHODS, TILE, check_diagonal, choose_method
+from .apsp import close_pivot_blocks, initial_rows, matrix_pool, source_rows
+from .snapshot import BYTE_ORDER, source_stamp, stamp_matches
+
+MAGIC = b'GCAPSP01'
+# magic, byte order, method, dtype, source size, source mtime_ns, source digest,
+# vertices, tile, completed rows (or pivots with Floyd-Warshall)
+HEADER = struct.Struct('=8sc16s8sqq32sqqq')
+# Offset of the matrix rows in the file
+DATA_OFFSET = 4096
+
+
+def matrix_file(graph, path, arquivo, solve, method=None, dtype='float64', tile=TILE, processes=None,
+                progress=None):
+    """
+    Computes the distances between all pairs of dense vertices of graph,
+    loaded from arquivo, into the matrix file at path, resuming the work
+    already done there (see the module docstring). solve and processes are
+    as for apsp.all_pairs(), and method None lets choose_method() decide.
+    progress(done, n), if given, is called at the start and after each
+    block. Returns the finished matrix as a read-only numpy.memmap. Raises
+    ValueError for a negative cycle, and OSError if the files cannot be
+    used.
+    """
+    if np is None:
+        raise RuntimeError("matrix_file() needs NumPy")
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+    if tile < 1:
+        raise ValueError(f"tile must be positive, got {tile!r}")
+    csr = graph.csr
+    n = csr.num_rows
+    if method is None:
+        method = choose_method(csr, graph.weight_stats)[0]
+    elif method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}, got {method!r}")
+    # Floyd-Warshall resumes by pivot block, so the tile is part of what must match
+    stored_tile = tile if method == FLOYD_WARSHALL else 0
+
+    done = completed(path, arquivo, method, dtype, n, stored_tile)
+    if done is None:
+        _create(path, arquivo, method, dtype, n, stored_tile)
+        done = 0
+    if progress is not None:
+        progress(done, n)
+    if done < n and method == FLOYD_WARSHALL:
+        matrix = np.memmap(path, dtype, 'r+', DATA_OFFSET, (n, n))
+        try:
+            _floyd_warshall(csr, matrix, path, done, tile, processes, progress)
+        finally:
+            matrix.flush()
+            del matrix
+    elif done < n:
+        _source_rows(graph, path, dtype, solve, method, done, tile, processes, progress)
+    result = np.memmap(path, dtype, 'r', DATA_OFFSET, (n, n))
+    if method == FLOYD_WARSHALL:
+        check_diagonal(result)
+    return result
+
+
+def completed(path, arquivo, method, dtype, n, tile):
+    """
+    Rows (or pivots) completed in the matrix file at path, if it was made
+    for arquivo as it is now with the same method, dtype, vertex count and
+    tile (0 except for Floyd-Warshall); None otherwise
+    """
+    try:
+        with open(path, 'rb') as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+            size = f.seek(0, os.SEEK_END)
+    except (OSError, struct.error):
+        return None
+    magic, order, stored_method, stored_dtype, source_size, mtime_ns, digest, vertices, stored_tile, done = fields
+    itemsize = np.dtype(dtype).itemsize
+    if (magic != MAGIC or order != BYTE_ORDER or stored_method.rstrip(b'\0') != method.encode()
+            or stored_dtype.rstrip(b'\0') != dtype.encode() or vertices != n or stored_tile != tile
+            or size < DATA_OFFSET + n * n * itemsize or not 0 <= done <= n):
+        return None
+    if not stamp_matches(arquivo, source_size, mtime_ns, digest):
+        return None
+    return done
+
+
+def _create(path, arquivo, method, dtype, n, tile):
+    """Creates the matrix file with no row completed; the rows stay sparse until written"""
+    size, mtime_ns, digest = source_stamp(arquivo)
+    header = HEADER.pack(MAGIC, BYTE_ORDER, method.encode(), dtype.encode(), size, mtime_ns, digest,
+                         n, tile, 0)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.truncate(DATA_OFFSET + n * n * np.dtype(dtype).itemsize)
+
+
+def _mark(matrix, path, done):
+    """Flushes the rows, then records done in the header"""
+    matrix.flush()
+    with open(path, 'r+b') as f:
+        f.seek(HEADER.size - 8)
+        f.write(struct.pack('=q', done))
+
+
+def read_rows(path, n, dtype='float64', tile=TILE):
+    """Yields the rows of the n x n matrix file at path in order, reading tile rows at a time"""
+    itemsize = np.dtype(dtype).itemsize
+    with open(path, 'rb') as f:
+        f.seek(DATA_OFFSET)
+        for start in range(0, n, tile):
+            rows = min(tile, n - start)
+            block = np.fromfile(f, dtype, rows * n).reshape(rows, n)
+            if len(block) < rows:
+                raise OSError(f"{path}: matrix file is truncated")
+            yield from block
+
+
+def _source_rows(graph, path, dtype, solve, method, done, tile, processes, progress):
+    n = graph.csr.num_rows
+    row_bytes = n * np.dtype(dtype).itemsize
+    window = start = None  # the mapped rows of the current block, from row start
+    for u, distances, _ in source_rows(graph, solve, method, range(done, n), processes):
+        if window is None:
+            start = u
+            rows = min(tile - u % tile, n - u)
+            window = np.memmap(path, dtype, 'r+', DATA_OFFSET + u * row_bytes, (rows, n))
+        window[u - start] = distances
+        if (u + 1) % tile == 0 or u + 1 == n:
+            _mark(window, path, u + 1)
+            window = None
+            if progress is not None:
+                progress(u + 1, n)
+
+
+def _floyd_warshall(csr, matrix, path, done, tile, processes, progress):
+    n = len(matrix)
+    if done == 0:
+        for start in range(0, n, tile):
+            matrix[start:start + tile] = initial_rows(csr, start, min(start + tile, n), matrix.dtype)
+
+    def finished(k):
+        pivots = min((k + 1) * tile, n)
+        _mark(matrix, path, pivots)
+        if progress is not None:
+            progress(pivots, n)
+
+    first = done // tile
+    processes = min(processes or os.cpu_count() or 1, -(-n // tile) - 1)
+    if processes <= 1:
+        close_pivot_blocks(matrix, None, tile, first=first, done=finished)
+        return
+    # The workers map the file themselves; the initial rows must be there before they start
+    matrix.flush()
+    spec = (('file', path, DATA_OFFSET, (n, n), matrix.dtype.str), None)
+    with matrix_pool(spec, processes) as pool:
+        close_pivot_blocks(matrix, None, tile, pool, first, finished)
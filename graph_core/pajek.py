@@ -0,0 +1,104 @@
+from .errors import PajekFormatError
+
+# Record kinds yielded by read_pajek
+VERTICES = 'vertices'  # ('vertices', n)
+VERTEX = 'vertex'      # ('vertex', id, label)
+SECTION = 'section'    # ('section', '*edges' | '*arcs')
+EDGE = 'edge'          # ('edge', u, v, weight)
+
+EDGE_SECTIONS = ('*edges', '*arcs')
+BUFFER_SIZE = 1 << 20
+
+
+def read_pajek(arquivo, section=None):
+    """
+    Streams a Pajek .net file line by line, yielding one record per vertex
+    and per edge, so the text is never held in memory as a whole.
+
+    If section is given ('*edges' or '*arcs'), any other edge section is an error.
+    Raises FileNotFoundError or PajekFormatError.
+    """
+    with open(arquivo, 'r', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        current = None
+        declared = seen = 0
+
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line[0] == '%':
+                continue
+
+            if line[0] == '*':
+                parts = line.split()
+                keyword = parts[0].lower()
+                if current == '*vertices' and seen > declared:
+                    raise PajekFormatError(arquivo, lineno, f"{seen} vertex lines for *vertices {declared}")
+
+                if keyword == '*vertices':
+                    if current is not None:
+                        raise PajekFormatError(arquivo, lineno, "*vertices must be the first section")
+                    try:
+                        declared = int(parts[1])
+                    except (IndexError, ValueError):
+                        raise PajekFormatError(arquivo, lineno, f"invalid vertex count: {line!r}") from None
+                    yield (VERTICES, declared)
+                elif keyword in EDGE_SECTIONS:
+                    if section is not None and keyword != section:
+                        raise PajekFormatError(arquivo, lineno, f"expected a {section} section, found {keyword}")
+                    yield (SECTION, keyword)
+                else:
+                    raise PajekFormatError(arquivo, lineno, f"unsupported section {parts[0]}")
+                current = keyword
+                continue
+
+            if current == '*vertices':
+                parts = line.split(None, 1)
+                vertex_id = _parse_id(arquivo, lineno, parts[0])
+                seen += 1
+                yield (VERTEX, vertex_id, parts[1] if len(parts) > 1 else str(vertex_id))
+            elif current is not None:
+                parts = line.split()
+                if len(parts) < 2:
+                    raise PajekFormatError(arquivo, lineno, f"expected 'u v [weight]', found {line!r}")
+                u = _parse_id(arquivo, lineno, parts[0])
+                v = _parse_id(arquivo, lineno, parts[1])
+                weight = 1.0
+                if len(parts) > 2:
+                    try:
+                        weight = float(parts[2])
+                    except ValueError:
+                        raise PajekFormatError(arquivo, lineno, f"invalid weight {parts[2]!r}") from None
+                yield (EDGE, u, v, weight)
+            else:
+                raise PajekFormatError(arquivo, lineno, "data before the *vertices section")
+
+        if current == '*vertices' and seen > declared:
+            raise PajekFormatError(arquivo, None, f"{seen} vertex lines for *vertices {declared}")
+        if current is None:
+            raise PajekFormatError(arquivo, None, "missing *vertices section")
+
+
+def parse_coordinates(label):
+    """
+    Returns the (x, y) coordinates that follow the label on a Pajek vertex
+    line ('"Name" 0.25 0.75'), or None if there are none
+    """
+    label = label.strip()
+    if label.startswith('"'):
+        end = label.find('"', 1)
+        rest = label[end + 1:].split() if end > 0 else []
+    else:
+        rest = label.split()[1:]
+    try:
+        return float(rest[0]), float(rest[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _parse_id(arquivo, lineno, token):
+    try:
+        vertex_id = int(token)
+    except ValueError:
+        raise PajekFormatError(arquivo, lineno, f"invalid vertex id {token!r}") from None
+    if vertex_id < 0:
+        raise PajekFormatError(arquivo, lineno, f"negative vertex id {vertex_id}")
+    return vertex_id
@@ -0,0 +1,128 @@
+"""
+Parallel parsing of the edge section of Pajek files.
+
+The *vertices section is read sequentially to find where the edge section
+starts. The rest of the file is split into byte ranges aligned on newlines,
+parsed by a process pool into flat numeric arrays and concatenated in file
+order. Files with any other layout, or with malformed edge lines, fall back
+to the sequential reader, which reports the exact line of the error.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many bytes of edges the process start-up costs more than it saves
+MIN_PARALLEL_BYTES = 1 << 20
+CHUNKS_PER_WORKER = 4
+
+
+def read_pajek_parallel(graph, arquivo, workers, builder):
+    """
+    Feeds the vertex lines to builder (a LabelTableBuilder) and returns the
+    edge arrays (src, dst, weights) in external ids, parsed by workers
+    processes. Returns None when the file must be read sequentially; builder
+    may then hold part of the vertices and should be discarded.
+    """
+    header = _scan_header(arquivo, graph.section, builder)
+    if header is None:
+        return None
+    vertex_count, start = header
+
+    end = os.path.getsize(arquivo)
+    if end - start < MIN_PARALLEL_BYTES:
+        return None
+
+    ranges = _chunk_ranges(arquivo, start, end, workers * CHUNKS_PER_WORKER)
+    src, dst, wt = array('q'), array('q'), array('d')
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(_parse_chunk, arquivo, a, b, graph.weighted) for a, b in ranges]
+        for job in jobs:
+            result = job.result()
+            if result is None:
+                return None
+            src.frombytes(result[0])
+            dst.frombytes(result[1])
+            wt.frombytes(result[2])
+
+    graph.vertex_count = vertex_count
+    return src, dst, wt
+
+
+def _scan_header(arquivo, section, builder):
+    """
+    Reads the *vertices section into builder and returns (vertex_count, offset
+    of the first edge line), or None if the file is not laid out as *vertices
+    followed by a single section of the expected kind.
+    """
+    vertex_count = None
+    with open(arquivo, 'rb') as f:
+        for raw in iter(f.readline, b''):
+            line = raw.strip()
+            if not line or line[:1] == b'%':
+                continue
+            if line[:1] == b'*':
+                keyword = line.split()[0].lower().decode('ascii', 'replace')
+                if keyword == '*vertices' and vertex_count is None:
+                    try:
+                        vertex_count = int(line.split()[1])
+                    except (IndexError, ValueError):
+                        return None
+                    continue
+                if keyword == section and vertex_count is not None and len(builder) <= vertex_count:
+                    return vertex_count, f.tell()
+                return None
+            if vertex_count is None:
+                return None
+            parts = line.decode('utf-8').split(None, 1)
+            try:
+                vertex_id = int(parts[0])
+            except ValueError:
+                return None
+            builder.add(vertex_id, parts[1] if len(parts) > 1 else str(vertex_id))
+    return None
+
+
+def _chunk_ranges(arquivo, start, end, count):
+    """Splits [start, end) into at most count byte ranges that begin at line starts"""
+    step = max((end - start) // count, 1)
+    bounds = [start]
+    with open(arquivo, 'rb') as f:
+        position = start + step
+        while position < end:
+            f.seek(position)
+            f.readline()  # move to the start of the next line
+            position = f.tell()
+            if position >= end:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+            position += step
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_chunk(arquivo, start, end, weighted):
+    """
+    Worker: parses the edge lines in bytes [start, end) of arquivo.
+    Returns the raw bytes of the src, dst and weight arrays, or None if the
+    chunk holds something other than well-formed edge lines.
+    """
+    with open(arquivo, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    src, dst, wt = array('q'), array('q'), array('d')
+    try:
+        for line in data.split(b'\n'):
+            parts = line.split()
+            if not parts or parts[0][:1] == b'%':
+                continue
+            u = int(parts[0])
+            v = int(parts[1])
+            src.append(u)
+            dst.append(v)
+            if weighted:
+                wt.append(float(parts[2]) if len(parts) > 2 else 1.0)
+    except (ValueError, IndexError):
+        return None
+    return src.tobytes(), dst.tobytes(), wt.tobytes()
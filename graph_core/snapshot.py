@@ -0,0 +1,258 @@
+"""
+Binary snapshots of loaded graphs.
+
+After a .net file is parsed, its edge list, CSR arrays and interned label
+table (when labels were loaded) are written next to it
+(arquivo.<section>[-weighted].snap). Later loads memory-map the snapshot
+instead of parsing the text. A snapshot is reused when the source size and
+mtime match; if only the mtime changed, the content hash decides.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .csr import CSR
+from .idmap import IdMap
+from .labels import LabelTable
+
+MAGIC = b'GCSNAP03'
+# magic, byte order, directed, weighted, has labels, section, source size,
+# source mtime_ns, source digest, vertex_count, CSR rows (dense vertex indices)
+HEADER = struct.Struct('=8sc???8sqq32sqq')
+# Arrays stored after the header, in this order, with their typecodes
+SECTIONS = (
+    ('src', 'i'), ('dst', 'i'), ('wt', 'd'),
+    ('offsets', 'q'), ('targets', 'i'), ('weights', 'd'), ('edge_ids', 'i'),
+    ('vertex_ids', 'q'), ('label_index', 'i'), ('label_offsets', 'q'), ('label_blob', 'B'),
+)
+ALIGN = 8
+BYTE_ORDER = b'L' if sys.byteorder == 'little' else b'B'
+
+
+def snapshot_path(graph, arquivo):
+    """Returns the snapshot file used for this graph type and source file"""
+    kind = graph.section.lstrip('*') + ('-weighted' if graph.weighted else '')
+    return f"{arquivo}.{kind}.snap"
+
+
+def file_digest(arquivo):
+    """Returns the BLAKE2b digest of the file contents"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(arquivo, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def load_snapshot(graph, arquivo, labels=True):
+    """
+    Fills graph from the snapshot of arquivo if there is a valid one
+    (one that holds the vertex labels, when labels is True).
+    Returns True on success, False if the text must be parsed.
+    """
+    path = snapshot_path(graph, arquivo)
+    try:
+        source = os.stat(arquivo)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+
+    try:
+        header = HEADER.unpack_from(mapped, 0)
+    except struct.error:
+        mapped.close()
+        return False
+    magic, order, directed, weighted, has_labels, section, size, mtime_ns, digest, vertex_count, num_rows = header
+    if (magic != MAGIC or order != BYTE_ORDER or directed != graph.directed
+            or weighted != graph.weighted or section.rstrip(b'\0') != graph.section.encode()
+            or size != source.st_size or (labels and not has_labels)):
+        mapped.close()
+        return False
+    if mtime_ns != source.st_mtime_ns and file_digest(arquivo) != digest:
+        mapped.close()
+        return False
+
+    # A snapshot cut short or otherwise damaged is parsed again, never loaded
+    arrays = _map_sections(mapped, HEADER.size, SECTIONS)
+    if arrays is None:
+        mapped.close()
+        return False
+    if (len(arrays['src']) != len(arrays['dst']) or len(arrays['offsets']) != num_rows + 1
+            or len(arrays['vertex_ids']) != num_rows):
+        unmap_arrays(arrays, mapped)
+        return False
+    if mtime_ns != source.st_mtime_ns:
+        _restamp(path, source, digest)
+
+    graph._src, graph._dst = arrays['src'], arrays['dst']
+    graph._wt = arrays['wt'] if weighted else array('d')
+    graph._out = CSR(arrays['offsets'], arrays['targets'],
+                     arrays['weights'] if weighted else None,
+                     arrays['edge_ids'] if not directed else None)
+    graph._in = None
+    graph.vertex_count = vertex_count
+    graph.edge_count = len(graph._src)
+
+    # Labels stay in the mapped buffer and are decoded only when looked up
+    graph.ids = IdMap(arrays['vertex_ids'])
+    if has_labels:
+        graph.vertices = LabelTable(graph.ids, arrays['label_index'], arrays['label_offsets'], arrays['label_blob'])
+    else:
+        graph.vertices = LabelTable(graph.ids)
+
+    # Keeps the mapping alive for as long as the graph uses its arrays
+    graph._snapshot = mapped
+    return True
+
+
+def save_snapshot(graph, arquivo):
+    """Writes the snapshot of a freshly parsed graph. Returns False if it could not be written."""
+    path = snapshot_path(graph, arquivo)
+    try:
+        source = os.stat(arquivo)
+        digest = file_digest(arquivo)
+    except OSError:
+        return False
+
+    table = graph.vertices
+    csr = graph._out
+    data = {
+        'src': graph._src, 'dst': graph._dst, 'wt': graph._wt,
+        'offsets': csr.offsets, 'targets': csr.targets,
+        'weights': csr.weights if csr.weights is not None else array('d'),
+        'edge_ids': csr.edge_ids if csr.edge_ids is not None else array('i'),
+        'vertex_ids': graph.ids.ids,
+        'label_index': table.index if table.loaded else array('i'),
+        'label_offsets': table.offsets if table.loaded else array('q'),
+        'label_blob': memoryview(table.blob).cast('B') if table.loaded else array('B'),
+    }
+
+    header = HEADER.pack(MAGIC, BYTE_ORDER, graph.directed, graph.weighted, table.loaded,
+                         graph.section.encode(), source.st_size, source.st_mtime_ns,
+                         digest, graph.vertex_count, csr.num_rows)
+    return write_arrays(path, header, SECTIONS, data)
+
+
+def source_stamp(arquivo):
+    """(size, mtime_ns, digest) of a source file, for files derived from it; raises OSError"""
+    source = os.stat(arquivo)
+    return source.st_size, source.st_mtime_ns, file_digest(arquivo)
+
+
+def stamp_matches(arquivo, size, mtime_ns, digest):
+    """True if arquivo still has that size and mtime, or the same content when only the mtime changed"""
+    try:
+        source = os.stat(arquivo)
+        return size == source.st_size and (mtime_ns == source.st_mtime_ns or file_digest(arquivo) == digest)
+    except OSError:
+        return False
+
+
+def write_arrays(path, header, sections, data):
+    """
+    Writes header (bytes), then a directory and the arrays of data in the
+    order of sections ((name, typecode) pairs), each aligned, replacing
+    path atomically. Returns False if it could not be written.
+    """
+    directory_struct = struct.Struct('=' + 'qq' * len(sections))
+    directory = []
+    position = _aligned(len(header) + directory_struct.size)
+    for name, typecode in sections:
+        directory += [position, len(data[name])]
+        position = _aligned(position + len(data[name]) * struct.calcsize(typecode))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(directory_struct.pack(*directory))
+            for k, (name, _) in enumerate(sections):
+                f.write(b'\0' * (directory[2 * k] - f.tell()))
+                f.write(memoryview(data[name]).cast('B'))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def map_arrays(path, header, sections, magic, accept=None):
+    """
+    Memory-maps a file written by write_arrays() whose header struct starts
+    with magic and the byte order. Returns (fields, arrays, mapping): the
+    unpacked header, a dict of memoryviews by section name and the mmap
+    that keeps them alive; None if the file is missing, of another kind,
+    cut short, or accept(fields) is false.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        fields = header.unpack_from(mapped, 0)
+    except struct.error:
+        mapped.close()
+        return None
+    if fields[0] != magic or fields[1] != BYTE_ORDER or (accept is not None and not accept(fields)):
+        mapped.close()
+        return None
+    arrays = _map_sections(mapped, header.size, sections)
+    if arrays is None:
+        mapped.close()
+        return None
+    return fields, arrays, mapped
+
+
+def unmap_arrays(arrays, mapped):
+    """Releases the views of arrays from map_arrays(), then closes mapped, for a file found unusable"""
+    for view in arrays.values():
+        view.release()
+    mapped.close()
+
+
+def _map_sections(mapped, position, sections):
+    """
+    Memoryviews by name over the arrays of sections ((name, typecode)
+    pairs) in mapped, whose directory starts at position; None if the
+    directory is cut short, or any array is misaligned or runs past the end
+    of the mapping
+    """
+    directory_struct = struct.Struct('=' + 'qq' * len(sections))
+    try:
+        directory = directory_struct.unpack_from(mapped, position)
+    except struct.error:
+        return None
+    start = position + directory_struct.size
+    extents = []
+    for k, (name, typecode) in enumerate(sections):
+        offset, count = directory[2 * k], directory[2 * k + 1]
+        end = offset + count * struct.calcsize(typecode)
+        if offset < start or offset % ALIGN or count < 0 or end > len(mapped):
+            return None
+        extents.append((name, typecode, offset, end))
+    # Views are only taken once every extent is valid, so a failure leaves mapped closable
+    view = memoryview(mapped)
+    return {name: view[offset:end].cast(typecode) for name, typecode, offset, end in extents}
+
+
+def _restamp(path, source, digest):
+    """Updates the source mtime stored in a snapshot whose content hash still matches"""
+    try:
+        with open(path, 'r+b') as f:
+            header = list(HEADER.unpack(f.read(HEADER.size)))
+            header[7] = source.st_mtime_ns
+            f.seek(0)
+            f.write(HEADER.pack(*header))
+    except OSError:
+        pass
+
+
+def _aligned(position):
+    return (position + ALIGN - 1) // ALIGN * ALIGN
@@ -0,0 +1,129 @@
+"""
+Output of shortest-path trees given as distance and predecessor arrays
+over dense indices (-1 for no predecessor).
+
+write_paths() prints one "id: path; d=distance" line per reachable vertex,
+in ascending id order. Rebuilding each path from its predecessors costs
+O(depth) Python steps per vertex, O(n^2) on long chains; instead the tree
+is walked once, depth first, keeping the path of the current vertex in a
+single buffer that children extend and siblings truncate, and the lines
+are spooled to a temporary file in that order and copied out by id.
+write_parents_jsonl() and write_parents() emit the parent array itself,
+as JSON Lines or as a binary file in the layout of graph_core.snapshot.
+"""
+import mmap
+import struct
+import tempfile
+from array import array
+
+from .snapshot import BYTE_ORDER, map_arrays, write_arrays
+
+# Buffer size for the files the writers open
+BUFFER_SIZE = 1 << 20
+
+MAGIC = b'GCSPT001'
+# magic, byte order, source id, vertices
+HEADER = struct.Struct('=8scqq')
+SECTIONS = (('vertex', 'q'), ('parent', 'q'), ('distance', 'd'))
+INF = float('inf')
+
+
+def tree_children(predecessors):
+    """(offsets, children): the children of each vertex of the tree in CSR form, ascending"""
+    n = len(predecessors)
+    offsets = array('q', bytes(8 * (n + 1)))
+    for parent in predecessors:
+        if parent >= 0:
+            offsets[parent + 1] += 1
+    for v in range(n):
+        offsets[v + 1] += offsets[v]
+    children = array('i', bytes(4 * offsets[n]))
+    fill = offsets[:n]
+    for v, parent in enumerate(predecessors):
+        if parent >= 0:
+            children[fill[parent]] = v
+            fill[parent] += 1
+    return offsets, children
+
+
+def write_paths(out, ids, distances, predecessors, source):
+    """
+    Writes "id: path; d=distance" (the path as comma-separated ids from
+    the source) for each vertex reachable from source to the binary
+    stream out, in ascending id order. The source's distance prints as 0.
+    """
+    n = len(predecessors)
+    if not 0 <= source < n:
+        return
+    offsets, children = tree_children(predecessors)
+    external = ids.ids
+    starts = array('q', [-1]) * n
+    lengths = array('q', bytes(8 * n))
+    prefix = bytearray()
+    stack = [(source, 0)]  # (vertex, length of its parent's path in prefix)
+    position = 0
+    with tempfile.TemporaryFile(buffering=BUFFER_SIZE) as spool:
+        write = spool.write
+        while stack:
+            v, length = stack.pop()
+            del prefix[length:]
+            token = b'%d' % external[v]
+            if length:
+                prefix += b','
+            prefix += token
+            line = b'%s: %s; d=%s\n' % (token, prefix, b'0' if v == source else repr(distances[v]).encode())
+            write(line)
+            starts[v], lengths[v] = position, len(line)
+            position += len(line)
+            end = len(prefix)
+            for pos in range(offsets[v + 1] - 1, offsets[v] - 1, -1):
+                stack.append((children[pos], end))
+        spool.flush()
+        with mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for v in range(n):
+                start = starts[v]
+                if start >= 0:
+                    out.write(mapped[start:start + lengths[v]])
+
+
+def write_parents_jsonl(out, ids, distances, predecessors, source=None):
+    """
+    Writes {"vertex": id, "parent": id or null, "distance": d} for each
+    reachable vertex to the binary stream out, in ascending id order. With
+    a source (dense index), each object starts with "source": its id.
+    """
+    external = ids.ids
+    lead = b'{' if source is None else b'{"source": %d, ' % external[source]
+    for v, dist in enumerate(distances):
+        if dist != INF:
+            parent = predecessors[v]
+            out.write(b'%s"vertex": %d, "parent": %s, "distance": %s}\n'
+                      % (lead, external[v], b'null' if parent < 0 else b'%d' % external[parent], repr(dist).encode()))
+
+
+def write_parents(path, ids, distances, predecessors, source):
+    """
+    Writes the vertex ids, the parent id of each vertex (-1 for the source
+    and unreachable vertices) and the distances (inf when unreachable) as
+    int64, int64 and float64 arrays. Returns False if it could not be written.
+    """
+    external = ids.ids
+    parents = array('q', [-1]) * len(predecessors)
+    for v, parent in enumerate(predecessors):
+        if parent >= 0:
+            parents[v] = external[parent]
+    data = {'vertex': external, 'parent': parents, 'distance': distances}
+    header = HEADER.pack(MAGIC, BYTE_ORDER, external[source], len(external))
+    return write_arrays(path, header, SECTIONS, data)
+
+
+def read_parents(path):
+    """
+    Maps a file written by write_parents(). Returns (source id, vertex ids,
+    parent ids, distances) as memoryviews, or None if it is not such a file.
+    """
+    loaded = map_arrays(path, HEADER, SECTIONS, MAGIC)
+    if loaded is None:
+        return None
+    (_, _, source, _), arrays, _ = loaded
+    return source, arrays['vertex'], arrays['parent'], arrays['distance']